@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+
+class LocalCache:
+    """
+    Thread-safe in-process LRU of byte strings, bounded by total size.
+
+    Entries also carry an expiry time, so nothing outlives the timeout it
+    would have had in the shared cache.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, Tuple[bytes, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, timeout: float) -> None:
+        cost = len(key) + len(value)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self.size += cost
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(key) + len(entry[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.size,
+        }
+
+class ResponseCache:
+    """
+    Two-tier store for rendered API responses.
+
+    L1 is a per-process ``LocalCache`` of rendered JSON bytes; L2 is the
+    shared Django cache (Redis). Keys embed namespace versions, and each
+    process remembers the versions it has seen for
+    CACHE_VERSION_CHECK_INTERVAL seconds, so a warm L1 hit needs no network
+    at all. A write in another process becomes visible here once that
+    interval has passed; writes in this process are visible immediately.
+    """
+
+    def __init__(self, local_max_bytes: Optional[int] = None,
+                 version_check_interval: Optional[float] = None):
+        if local_max_bytes is None:
+            local_max_bytes = settings.CACHE_LOCAL_MAX_BYTES
+        self.local = LocalCache(local_max_bytes) if local_max_bytes > 0 else None
+        self.version_check_interval = (
+            settings.CACHE_VERSION_CHECK_INTERVAL
+            if version_check_interval is None else version_check_interval
+        )
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self._versions: Dict[str, Tuple[int, float]] = {}
+
+    # Namespace versions
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{settings.CACHE_KEY_PREFIX}:version:{namespace}"
+
+    def get_version(self, namespace: str) -> int:
+        """Current version of a namespace, creating the counter if needed"""
+        known = self._versions.get(namespace)
+        if known is not None and time.monotonic() - known[1] < self.version_check_interval:
+            return known[0]
+
+        key = self._version_key(namespace)
+        version = cache.get(key)
+        if version is None:
+            # Start from the clock rather than 1, so a counter lost to eviction
+            # never comes back at a value older cached entries were written with
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.get(key)
+        self._versions[namespace] = (version, time.monotonic())
+        return version
+
+    def bump_version(self, namespace: str) -> int:
+        """Invalidate every cached response in a namespace in O(1)"""
+        key = self._version_key(namespace)
+        try:
+            version = cache.incr(key)
+        except ValueError:
+            # No counter yet, so nothing can have been cached under it
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.incr(key)
+        self._versions[namespace] = (version, time.monotonic())
+        return version
+
+    # Rendered responses
+    #
+    # Shared entries are (refresh_at, fresh_until, content). Before
+    # refresh_at an entry is simply fresh. Between refresh_at and
+    # fresh_until it is still served, but one request may recompute it
+    # early; after fresh_until it is stale and only served while one request
+    # recomputes it. Redis keeps it CACHE_STALE_TTL seconds past
+    # fresh_until so there is something to serve in the meantime.
+
+    def get(self, key: str) -> Tuple[Optional[bytes], Optional[str], bool]:
+        """
+        Return ``(content, tier, fresh)``.
+
+        ``tier`` is 'L1', 'L2' or None on a miss. ``fresh`` is False when the
+        entry is due for a refresh (near expiry or already stale).
+        """
+        if self.local is not None:
+            content = self.local.get(key)
+            if content is not None:
+                return content, 'L1', True
+
+        entry = cache.get(key)
+        if not isinstance(entry, tuple) or len(entry) != 3:
+            self.shared_misses += 1
+            return None, None, False
+        self.shared_hits += 1
+        refresh_at, fresh_until, content = entry
+        remaining = refresh_at - time.time()
+        if remaining <= 0:
+            return content, 'L2', False
+        if self.local is not None:
+            # L1 copies lapse at refresh_at so refreshes go through L2
+            self.local.set(key, content, remaining)
+        return content, 'L2', True
+
+    def set(self, key: str, content: bytes, timeout: float) -> None:
+        now = time.time()
+        refresh_after = timeout * (1 - settings.CACHE_REFRESH_AHEAD_RATIO)
+        entry = (now + refresh_after, now + timeout, content)
+        cache.set(key, entry, timeout + settings.CACHE_STALE_TTL)
+        if self.local is not None:
+            self.local.set(key, content, refresh_after)
+
+    # Single flight
+
+    def _lock_key(self, key: str) -> str:
+        return f"{key}:lock"
+
+    def acquire(self, key: str) -> bool:
+        """Try to become the one request that computes ``key``"""
+        return cache.add(self._lock_key(key), 1, settings.CACHE_LOCK_TIMEOUT)
+
+    def release(self, key: str) -> None:
+        cache.delete(self._lock_key(key))
+
+    def wait(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Poll for a value another request is computing.
+
+        Gives up after CACHE_LOCK_WAIT seconds, or as soon as the lock is
+        released without a value (the computing request failed).
+        """
+        deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+        delay = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            content, tier, _ = self.get(key)
+            if content is not None:
+                return content, tier
+            if cache.get(self._lock_key(key)) is None:
+                break
+        return None, None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tier hit/miss counters for this process"""
+        return {
+            'local': self.local.stats() if self.local is not None else {},
+            'shared': {'hits': self.shared_hits, 'misses': self.shared_misses},
+        }
+
+response_cache = ResponseCache()
@@ -1,60 +1,247 @@
+import hashlib
+import json
+import time
 from functools import wraps
-from django.core.cache import cache
+from urllib.parse import urlencode
 from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from .cache import response_cache
 
-def cache_response(timeout=None, key_prefix=None):
+# Who a cached response may be shared with
+CACHE_SCOPE_PUBLIC = 'public'
+CACHE_SCOPE_PER_ROLE = 'per-role'
+CACHE_SCOPE_PER_USER = 'per-user'
+CACHE_SCOPES = (CACHE_SCOPE_PUBLIC, CACHE_SCOPE_PER_ROLE, CACHE_SCOPE_PER_USER)
+
+def cache_response(timeout=None, key_prefix=None, namespace=None, scope=None):
     """
     Decorator to cache API responses.
+
+    Responses are stored as rendered JSON in a per-process LRU in front of
+    the shared cache (see ``apps.api.cache.ResponseCache``), and JSON hits
+    are returned as-is without re-rendering.
+
+    Recomputation is single-flight: when an entry is missing, about to
+    expire or stale, one request takes a short lock and runs the view while
+    the others serve the previous copy (stale-while-revalidate) or, with
+    nothing to serve, wait briefly for the new one. The refresh runs inline
+    in the request that won the lock.
+
+    The ``X-Cache`` header tells which path answered: L1, L2, STALE or MISS.
     
     Args:
         timeout (int): Cache timeout in seconds. If None, uses default timeout.
         key_prefix (str): Prefix for cache key. If None, uses default prefix.
+        namespace (str): Resource family the response belongs to, e.g.
+            'news/articles'. If None, derived from the request path.
+        scope (str): 'public' (one entry for everyone), 'per-role' or
+            'per-user'. If None, uses the view's ``cache_scope`` attribute,
+            falling back to 'per-user'.
     """
+    if scope is not None and scope not in CACHE_SCOPES:
+        raise ValueError(f"cache scope must be one of {CACHE_SCOPES}")
+
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(view_instance, request, *args, **kwargs):
             # Generate cache key
-            cache_key = generate_cache_key(request, view_instance, key_prefix)
+            cache_key = generate_cache_key(request, view_instance, key_prefix, namespace, scope)
             
             # Try to get response from cache
-            cached_response = cache.get(cache_key)
-            if cached_response is not None:
-                return Response(cached_response)
-            
-            # Get response from view
-            response = view_func(view_instance, request, *args, **kwargs)
+            content, tier, fresh = response_cache.get(cache_key)
+            if content is not None and fresh:
+                return _cached_response(request, content, tier)
+
+            # Only one request recomputes a missing or expiring entry; the
+            # rest serve the old copy or wait for the new one
+            computing = response_cache.acquire(cache_key)
+            if not computing:
+                if content is not None:
+                    return _cached_response(request, content, 'STALE')
+                content, tier = response_cache.wait(cache_key)
+                if content is not None:
+                    return _cached_response(request, content, tier)
             
-            # Cache the response
-            if response.status_code == 200:
-                cache_timeout = timeout or settings.CACHE_TIMEOUT
-                cache.set(cache_key, response.data, cache_timeout)
+            try:
+                # Get response from view
+                response = view_func(view_instance, request, *args, **kwargs)
+                
+                # Cache the response
+                if response.status_code == 200:
+                    cache_timeout = timeout or settings.CACHE_TIMEOUT
+                    content = JSONRenderer().render(response.data)
+                    response_cache.set(cache_key, content, cache_timeout)
+                    response['X-Cache'] = 'MISS'
+                    # For conditional_response, which validates the cached body
+                    response.cache_content = content
+                    response.cache_timeout = cache_timeout
+            finally:
+                if computing:
+                    response_cache.release(cache_key)
             
             return response
         return _wrapped_view
     return decorator
 
-def generate_cache_key(request, view_instance, key_prefix=None):
-    """Generate a unique cache key for the request."""
+def conditional_response(key_prefix=None, namespace=None, scope=None):
+    """
+    Decorator to answer conditional GETs with 304 Not Modified.
+
+    The strong ETag is a hash of the request's cache key, which carries the
+    namespace version, canonical query string and cache scope, and of the
+    JSON body ``cache_response`` cached for it. Last-Modified is when that
+    body was computed. A matching ``If-None-Match`` (or, without one,
+    ``If-Modified-Since``) returns 304 without sending the body.
+
+    Nothing is read from the database in front of the cache: a hit is
+    validated from the cached bytes alone, so the response's state is only
+    computed by the view on a miss. Changes made outside the API show up
+    when the cached body is refreshed.
+
+    Place it directly above ``cache_response`` and pass the same arguments.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(view_instance, request, *args, **kwargs):
+            response = view_func(view_instance, request, *args, **kwargs)
+            content = getattr(response, 'cache_content', None)
+            if response.status_code != 200 or content is None:
+                return response
+
+            cache_key = generate_cache_key(request, view_instance, key_prefix, namespace, scope)
+            etag = quote_etag(hashlib.sha1(cache_key.encode() + b':' + content).hexdigest())
+            modified_key = f"{cache_key}:modified"
+            timeout = getattr(response, 'cache_timeout', None)
+            if timeout is not None:
+                last_modified = int(time.time())
+                response_cache.set(modified_key, str(last_modified).encode(), timeout)
+            else:
+                stored, _, _ = response_cache.get(modified_key)
+                last_modified = int(stored) if stored else None
+
+            not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                not_modified['X-Cache'] = response['X-Cache']
+                response = not_modified
+
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Let browsers keep the body but revalidate it on every use
+            patch_cache_control(response, no_cache=True)
+            return response
+        return _wrapped_view
+    return decorator
+
+def _cached_response(request, content, tier):
+    """Serve cached JSON bytes directly, or re-render them for other formats"""
+    renderer = getattr(request, 'accepted_renderer', None)
+    if renderer is None or renderer.format == 'json':
+        response = HttpResponse(content, content_type='application/json')
+    else:
+        response = Response(json.loads(content))
+    response['X-Cache'] = tier
+    response.cache_content = content
+    return response
+
+def generate_cache_key(request, view_instance, key_prefix=None, namespace=None, scope=None):
+    """
+    Generate a unique cache key for the request.
+
+    The key embeds the current version of the request's namespace, so bumping
+    that version (see ``invalidate_cache``) makes every older key unreachable.
+    Query parameters are canonicalised, and the caller's identity is only
+    included as far as the cache scope requires.
+    """
     prefix = key_prefix or settings.CACHE_KEY_PREFIX
+    namespace = namespace or get_cache_namespace(request.path)
+    version = get_cache_version(namespace)
     path = request.path
     method = request.method
-    user_id = request.user.id if request.user.is_authenticated else 'anonymous'
+    scope = scope or getattr(view_instance, 'cache_scope', None) or CACHE_SCOPE_PER_USER
     
     # Include query parameters in cache key
-    query_params = request.query_params
-    if query_params:
-        query_string = '&'.join(f"{k}={v}" for k, v in sorted(query_params.items()))
+    query_string = canonical_query_string(request.query_params)
+    if query_string:
         path = f"{path}?{query_string}"
     
-    return f"{prefix}:{method}:{path}:{user_id}"
+    return f"{prefix}:{namespace}:v{version}:{method}:{path}:{cache_identity(request.user, scope)}"
+
+def canonical_query_string(query_params):
+    """
+    Query string that is the same for equivalent requests.
+
+    Parameters are sorted by name, every value of a repeated parameter is
+    kept (in request order, since it can matter), and values are
+    URL-encoded so they cannot run into each other.
+    """
+    return urlencode([
+        (name, value)
+        for name in sorted(query_params)
+        for value in query_params.getlist(name)
+    ])
+
+def cache_identity(user, scope):
+    """The part of a cache key that says who may share the entry"""
+    if scope == CACHE_SCOPE_PUBLIC:
+        return 'public'
+    if not user.is_authenticated:
+        return 'anonymous'
+    if scope == CACHE_SCOPE_PER_USER:
+        return f"user-{user.id}"
+
+    # Memoised on the user object, which lives for one request
+    identity = getattr(user, '_cache_role_identity', None)
+    if identity is None:
+        roles = []
+        if user.is_superuser:
+            roles.append('superuser')
+        if user.is_staff:
+            roles.append('staff')
+        assignments = getattr(user, 'role_assignments', None)
+        if assignments is not None:
+            roles.extend(sorted(assignments.values_list('role__name', flat=True)))
+        identity = 'role-' + ('+'.join(roles) or 'user')
+        user._cache_role_identity = identity
+    return identity
+
+def get_cache_namespace(path):
+    """
+    Resource family for a request path.
 
-def invalidate_cache(pattern):
+    '/api/news/articles/12/' and '/api/news/articles/similar_articles/' both
+    belong to 'news/articles'.
     """
-    Decorator to invalidate cache entries matching a pattern.
+    segments = [segment for segment in path.split('/') if segment]
+    if segments and segments[0] == 'api':
+        segments = segments[1:]
+    return '/'.join(segments[:2])
+
+def get_cache_version(namespace):
+    """Current version of a namespace, creating the counter if needed"""
+    return response_cache.get_version(namespace)
+
+def bump_cache_version(namespace):
+    """Invalidate every cached response in a namespace in O(1)"""
+    return response_cache.bump_version(namespace)
+
+def invalidate_cache(*namespaces):
+    """
+    Decorator to invalidate cached responses for resource families.
+
+    Successful writes bump the namespace version instead of searching for
+    matching keys, so the cost does not grow with the number of cached
+    entries. Entries written under older versions expire by their timeout.
+    The version is also part of ``conditional_response`` ETags, so list
+    every family whose responses nest the written resource.
     
     Args:
-        pattern (str): Pattern to match cache keys for invalidation.
+        namespaces (str): Resource families to invalidate, e.g.
+            'news/stock-mentions', 'news/articles'.
     """
     def decorator(view_func):
         @wraps(view_func)
@@ -62,11 +249,8 @@ def invalidate_cache(pattern):
             response = view_func(view_instance, request, *args, **kwargs)
             
             if response.status_code in [200, 201, 204]:
-                # Invalidate cache entries matching the pattern
-                cache_pattern = f"{settings.CACHE_KEY_PREFIX}:{pattern}"
-                keys = cache.keys(cache_pattern)
-                if keys:
-                    cache.delete_many(keys)
+                for namespace in namespaces:
+                    bump_cache_version(namespace)
             
             return response
         return _wrapped_view
@@ -0,0 +1,54 @@
+import time
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from apps.api.decorators import bump_cache_version, get_cache_version
+
+class Command(BaseCommand):
+    help = 'Compare KEYS-pattern and versioned-namespace cache invalidation as the cache grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--writes', type=int, default=200, help='Invalidations timed per size')
+        parser.add_argument('--namespace', default='benchmark/articles')
+
+    def handle(self, *args, **options):
+        namespace = options['namespace']
+        supports_keys = hasattr(cache, 'keys')
+        if not supports_keys:
+            self.stdout.write('Cache backend has no keys(); only versioned invalidation is timed')
+
+        self.stdout.write(f"{'cached keys':>12} {'KEYS+DEL ms':>12} {'version bump p50 ms':>20} {'p99 ms':>8}")
+        for size in options['sizes']:
+            legacy_ms = float('nan')
+            if supports_keys:
+                # One pattern invalidation deletes everything, so it is timed once per fill
+                self._fill(namespace, size)
+                start = time.perf_counter()
+                keys = cache.keys(f"{settings.CACHE_KEY_PREFIX}:{namespace}:*")
+                if keys:
+                    cache.delete_many(keys)
+                legacy_ms = (time.perf_counter() - start) * 1000
+
+            self._fill(namespace, size)
+            latencies = []
+            for _ in range(options['writes']):
+                start = time.perf_counter()
+                bump_cache_version(namespace)
+                latencies.append(time.perf_counter() - start)
+            latencies_ms = np.asarray(latencies) * 1000
+            self.stdout.write(
+                f"{size:>12} {legacy_ms:>12.2f} {np.percentile(latencies_ms, 50):>20.3f} "
+                f"{np.percentile(latencies_ms, 99):>8.3f}"
+            )
+
+    def _fill(self, namespace, size, chunk_size=1000):
+        """Cache ``size`` fake responses under the namespace's current version"""
+        version = get_cache_version(namespace)
+        payload = {'results': [], 'count': 0}
+        for start in range(0, size, chunk_size):
+            cache.set_many({
+                f"{settings.CACHE_KEY_PREFIX}:{namespace}:v{version}:GET:/api/{namespace}/?page={i}:1": payload
+                for i in range(start, min(start + chunk_size, size))
+            }, timeout=60)
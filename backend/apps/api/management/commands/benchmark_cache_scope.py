@@ -0,0 +1,94 @@
+import random
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.api.decorators import CACHE_SCOPES, generate_cache_key
+
+class Command(BaseCommand):
+    help = 'Replay a request log through each cache key scheme and report hit rates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', help='File of "<user id> <url>" lines; synthesised if omitted')
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=50000)
+        parser.add_argument('--roles', type=int, default=3, help='Distinct roles among synthetic users')
+        parser.add_argument('--duration', type=int, default=3600, help='Seconds the log spans')
+        parser.add_argument('--ttl', type=int, default=300, help='Cache timeout to simulate')
+
+    def handle(self, *args, **options):
+        if options['log']:
+            with open(options['log']) as log_file:
+                log = [line.split(None, 1) for line in log_file if line.strip()]
+            log = [(int(user_id), url.strip()) for user_id, url in log]
+        else:
+            log = self._synthetic_log(options['users'], options['requests'])
+
+        rng = random.Random(1)
+        users = {user_id: _ReplayUser(user_id, rng.randrange(options['roles'])) for user_id, _ in log}
+        step = options['duration'] / len(log)
+        factory = APIRequestFactory()
+
+        schemes = {'legacy': _legacy_key}
+        for scope in CACHE_SCOPES:
+            schemes[scope] = lambda request, scope=scope: generate_cache_key(request, None, scope=scope)
+
+        self.stdout.write(f"{len(log)} requests from {len(users)} users, {options['ttl']}s TTL")
+        self.stdout.write(f"{'scheme':<10} {'hit rate':>9} {'entries':>9}")
+        for name, make_key in schemes.items():
+            expires, hits, entries = {}, 0, set()
+            for position, (user_id, url) in enumerate(log):
+                now = position * step
+                request = Request(factory.get(url))
+                request.user = users[user_id]
+                key = make_key(request)
+                if expires.get(key, -1) > now:
+                    hits += 1
+                else:
+                    expires[key] = now + options['ttl']
+                entries.add(key)
+            self.stdout.write(f"{name:<10} {hits / len(log):>9.1%} {len(entries):>9}")
+
+    def _synthetic_log(self, user_count, request_count):
+        """Dashboard-like traffic: a few hot feeds, parameters in arbitrary order"""
+        rng = random.Random(0)
+        symbols = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMZN', 'GOOG', 'META', 'JPM']
+        log = []
+        for _ in range(request_count):
+            user_id = rng.randint(1, user_count)
+            roll = rng.random()
+            if roll < 0.3:
+                params = [('page', str(min(int(rng.expovariate(1.0)) + 1, 5)))]
+                if rng.random() < 0.5:
+                    params.append(('ordering', '-published_at'))
+                path = '/api/news/articles/'
+            elif roll < 0.6:
+                chosen = rng.sample(symbols, rng.choice([1, 1, 2]))
+                params = [('symbol', symbol) for symbol in chosen] + [('page', '1')]
+                path = '/api/news/articles/'
+            elif roll < 0.8:
+                path, params = '/api/news/categories/', []
+            else:
+                path, params = '/api/news/sources/', [('active', 'true')]
+            rng.shuffle(params)
+            query = '&'.join(f"{name}={value}" for name, value in params)
+            log.append((user_id, f"{path}?{query}" if query else path))
+        return log
+
+def _legacy_key(request):
+    """The key scheme before cache scopes: per user, repeated params collapsed"""
+    path = request.path
+    query_params = request.query_params
+    if query_params:
+        path = f"{path}?{'&'.join(f'{k}={v}' for k, v in sorted(query_params.items()))}"
+    return f"{request.method}:{path}:{request.user.id}"
+
+class _ReplayUser:
+    """Just enough of a user for key generation"""
+
+    is_authenticated = True
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, user_id, role):
+        self.id = user_id
+        self._cache_role_identity = f"role-{role}"
@@ -0,0 +1,99 @@
+import threading
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from apps.api.cache import response_cache
+from apps.api.decorators import bump_cache_version, cache_response, generate_cache_key
+
+class Command(BaseCommand):
+    help = 'Fire concurrent identical requests at a cached view and count how often the view body runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=50)
+        parser.add_argument('--query-seconds', type=float, default=0.2,
+                            help='Simulated cost of the view query')
+
+    def handle(self, *args, **options):
+        clients, query_seconds = options['clients'], options['query_seconds']
+        namespace = 'benchmark/stampede'
+        self.stdout.write(f"{clients} concurrent clients, {query_seconds * 1000:.0f}ms query")
+        self.stdout.write(f"{'scenario':<28} {'queries':>8} {'p50 ms':>8} {'max ms':>8} {'X-Cache':<30}")
+
+        # Old behaviour: plain get / compute / set, no lock
+        view = _CountingView(query_seconds)
+        bump_cache_version(namespace)
+        self._report('cold key, no coalescing', view, self._run(clients, lambda request: self._legacy(view, request)))
+
+        # L1 would answer every thread in this process; the stampede is about L2
+        with override_settings(CACHE_TIMEOUT=1):
+            response_cache.local = None
+            view = _CountingView(query_seconds)
+            bump_cache_version(namespace)
+            self._report('cold key, single-flight', view, self._run(clients, view.cached))
+
+            view.queries = 0
+            time.sleep(1.1)  # let the entry go stale
+            self._report('expired key, single-flight', view, self._run(clients, view.cached))
+
+    def _legacy(self, view, request):
+        key = generate_cache_key(request, view) + ':legacy'
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = view.compute(request)
+        cache.set(key, response.data, 60)
+        return response
+
+    def _run(self, clients, call):
+        factory = APIRequestFactory()
+        barrier = threading.Barrier(clients)
+        results = []
+
+        def client():
+            request = Request(factory.get('/api/benchmark/stampede/?page=1'))
+            request.user = AnonymousUser()
+            barrier.wait()
+            start = time.perf_counter()
+            response = call(request)
+            results.append((time.perf_counter() - start, response.get('X-Cache', 'MISS')))
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _report(self, scenario, view, results):
+        latencies = sorted(latency * 1000 for latency, _ in results)
+        sources = {}
+        for _, source in results:
+            sources[source] = sources.get(source, 0) + 1
+        summary = ' '.join(f"{source}={count}" for source, count in sorted(sources.items()))
+        self.stdout.write(
+            f"{scenario:<28} {view.queries:>8} {latencies[len(latencies) // 2]:>8.0f} "
+            f"{latencies[-1]:>8.0f} {summary:<30}"
+        )
+
+class _CountingView:
+    """Stands in for a viewset action with an expensive query"""
+
+    def __init__(self, query_seconds):
+        self.query_seconds = query_seconds
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def compute(self, request):
+        with self._lock:
+            self.queries += 1
+        time.sleep(self.query_seconds)
+        return Response({'results': list(range(50))})
+
+    @cache_response()
+    def cached(self, request):
+        return self.compute(request)
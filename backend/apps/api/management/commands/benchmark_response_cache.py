@@ -0,0 +1,63 @@
+import time
+import numpy as np
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from apps.api.cache import ResponseCache
+
+class Command(BaseCommand):
+    help = 'Time cached-response reads from the local LRU, the shared cache and the old pickled-data path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reads', type=int, default=2000)
+        parser.add_argument('--page-size', type=int, default=50, help='Articles in the cached payload')
+
+    def handle(self, *args, **options):
+        payload = self._payload(options['page_size'])
+        key = 'benchmark:response-cache'
+        timeout = 60
+
+        # Old behaviour: pickled response.data in the shared cache, rendered on every hit
+        cache.set(key + ':data', payload, timeout)
+        legacy = self._time(options['reads'], lambda: JSONRenderer().render(cache.get(key + ':data')))
+
+        shared_only = ResponseCache(local_max_bytes=0)
+        shared_only.set(key, JSONRenderer().render(payload), timeout)
+        shared = self._time(options['reads'], lambda: shared_only.get(key))
+
+        two_tier = ResponseCache(local_max_bytes=32 * 1024 * 1024)
+        two_tier.set(key, JSONRenderer().render(payload), timeout)
+        local = self._time(options['reads'], lambda: two_tier.get(key))
+
+        self.stdout.write(f"payload: {len(JSONRenderer().render(payload))} bytes JSON")
+        self.stdout.write(f"{'path':<32} {'p50 us':>8} {'p99 us':>8}")
+        for name, latencies in (('shared cache + re-render (old)', legacy),
+                                ('shared cache, rendered bytes', shared),
+                                ('local LRU', local)):
+            self.stdout.write(
+                f"{name:<32} {np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 99):>8.1f}"
+            )
+        self.stdout.write(f"local tier stats: {two_tier.stats()}")
+        cache.delete_many([key, key + ':data'])
+
+    def _time(self, reads, read):
+        latencies = []
+        for _ in range(reads):
+            start = time.perf_counter()
+            read()
+            latencies.append(time.perf_counter() - start)
+        return np.asarray(latencies) * 1e6
+
+    def _payload(self, page_size):
+        """A page shaped like NewsArticleSerializer output"""
+        article = {
+            'id': 1, 'title': 'Shares rally after earnings beat' * 2, 'content': 'Lorem ipsum ' * 300,
+            'url': 'https://news.example.com/markets/2024/01/01/shares-rally', 'source': 1,
+            'published_at': '2024-01-01T12:00:00Z', 'author': 'Staff', 'summary': 'Summary text ' * 10,
+            'sentiment_score': 0.42, 'is_processed': True,
+            'stock_mentions': [{'id': i, 'symbol': 'AAPL', 'context': 'context ' * 10,
+                                'sentiment_score': 0.3} for i in range(3)],
+            'created_at': '2024-01-01T12:00:00Z', 'updated_at': '2024-01-01T12:00:00Z',
+        }
+        return {'count': 1000, 'next': None, 'previous': None,
+                'results': [dict(article, id=i) for i in range(page_size)]}
@@ -0,0 +1,19 @@
+from rest_framework.permissions import SAFE_METHODS
+from .querysets import optimize_queryset
+
+class OptimizedQuerysetMixin:
+    """
+    Prefetch whatever the action's serializer nests.
+
+    ``get_queryset`` is passed through ``optimize_queryset`` with the
+    serializer the current action uses, so adding a nested field to a
+    serializer never reintroduces per-row queries. On reads, columns the
+    serializer does not output (after ``fields=`` trimming) are not loaded.
+    """
+
+    def get_queryset(self):
+        return optimize_queryset(
+            super().get_queryset(),
+            self.get_serializer(),
+            defer_unused=self.request.method in SAFE_METHODS,
+        )
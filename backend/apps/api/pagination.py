@@ -0,0 +1,206 @@
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, Optional, Tuple
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .querysets import estimate_count
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on ``(ordering field, primary key)``.
+
+    Each page is a range scan that starts right after the last row of the
+    previous one, so page 1000 costs the same as page 1 and no ``COUNT(*)``
+    runs. The ordering comes from the view's ``OrderingFilter`` (its first
+    term) or ``ordering``, with the primary key as tie-breaker; nullable
+    fields sort their nulls last. Views whose filters annotate a relevance
+    score name it in ``relevance_annotation``; pages are then keyed on it,
+    best first, unless ``?ordering=`` says otherwise. ``?count=true`` adds a total, estimated
+    by the planner on PostgreSQL for large results.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+    ordering = '-created_at'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = _ordering_field(queryset, self.ordering.lstrip('-'))
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = estimate_count(queryset, settings.API_EXACT_COUNT_THRESHOLD)
+
+        field_names, deferred = queryset.query.deferred_loading
+        if field_names and not deferred and self.ordering.lstrip('-') not in queryset.query.annotations:
+            # The cursor reads the ordering field, which .only() may have left out
+            queryset = queryset.only(*field_names, self.field.name)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if cursor is not None:
+            value, pk, _ = cursor
+            queryset = queryset.filter(self._after(value, pk, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            # The cursor's own row comes after this page
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request) -> Optional[int]:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view) -> str:
+        """The single field pages are keyed on, e.g. ``'-published_at'``"""
+        relevance = getattr(view, 'relevance_annotation', None)
+        if (relevance in queryset.query.annotations
+                and not request.query_params.get(api_settings.ORDERING_PARAM)):
+            return f"-{relevance}"
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return ordering[0]
+        ordering = getattr(view, 'ordering', None) or self.ordering
+        return ordering if isinstance(ordering, str) else ordering[0]
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            count, estimated = self.count
+            response = {'count': count, 'count_is_estimate': estimated, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'count_is_estimate': {'type': 'boolean'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Walked past the start going backwards; the first page is the way forward
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Walked past the end going forward; the first page is the way back
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        position = {
+            'o': self.ordering,
+            'v': getattr(row, getattr(self.field, 'attname', None) or self.ordering.lstrip('-')),
+            'pk': row.pk,
+            'r': reverse,
+        }
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(position, default=_isoformat, separators=(',', ':')).encode()
+        ).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request) -> Optional[Tuple[Any, Any, bool]]:
+        """``(field value, primary key, reverse)`` of the cursor, or None on the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if position['o'] != self.ordering:
+                raise ValueError('cursor belongs to another ordering')
+            value = position['v']
+            if value is not None:
+                value = self.field.to_python(value)
+            return value, position['pk'], bool(position['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _order_by(self, reverse: bool):
+        descending = self.ordering.startswith('-') != reverse
+        name = self.ordering.lstrip('-')
+        if self.field.null:
+            # Nulls last going forward, so first when walking backwards
+            expression = F(name).desc if descending else F(name).asc
+            field = expression(nulls_first=True) if reverse else expression(nulls_last=True)
+        else:
+            field = f"-{name}" if descending else name
+        return field, '-pk' if descending else 'pk'
+
+    def _after(self, value, pk, reverse: bool) -> Q:
+        """Rows that come after ``(value, pk)`` in the order ``_order_by(reverse)`` gives"""
+        descending = self.ordering.startswith('-') != reverse
+        beyond = 'lt' if descending else 'gt'
+        name = self.ordering.lstrip('-')
+        nulls_first = self.field.null and reverse
+        if value is None:
+            after_nulls = Q(**{f"{name}__isnull": True, f"pk__{beyond}": pk})
+            return after_nulls | Q(**{f"{name}__isnull": False}) if nulls_first else after_nulls
+        # The redundant lte/gte bound lets the planner seek into the
+        # (field, id) index instead of scanning it from the start
+        after = Q(**{f"{name}__{beyond}e": value}) & (
+            Q(**{f"{name}__{beyond}": value}) | Q(**{name: value, f"pk__{beyond}": pk})
+        )
+        if self.field.null and not nulls_first:
+            after |= Q(**{f"{name}__isnull": True})
+        return after
+
+def _ordering_field(queryset, name):
+    """The model field, or the output field of an annotation, called ``name``"""
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    return queryset.model._meta.get_field(name)
+
+def _isoformat(value):
+    # Full precision: DjangoJSONEncoder drops microseconds, which would make
+    # rows published in the same millisecond unreachable
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} cannot be used in a cursor")
@@ -0,0 +1,111 @@
+import json
+from typing import List, Optional, Tuple
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+def optimize_queryset(queryset, serializer, defer_unused=False):
+    """
+    Add the ``select_related``/``prefetch_related`` calls a serializer needs.
+
+    Walks the serializer's readable fields: nested serializers and related
+    fields over forward foreign keys become ``select_related`` joins, and
+    many-valued relations become ``Prefetch`` lookups whose querysets are
+    optimised the same way for the child serializer. Serialising a page
+    then costs a fixed number of queries whatever its size.
+
+    ``serializer`` may be a class or an instance (whose fields may have been
+    trimmed, e.g. by ``SparseFieldsetMixin``). With ``defer_unused``, only
+    the columns the serializer reads are loaded; leave it off for querysets
+    whose rows may be saved.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    select_related, prefetch_related = related_lookups(serializer, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if defer_unused:
+        columns = loaded_columns(serializer, queryset.model)
+        if columns is not None:
+            queryset = queryset.only(*columns)
+    return queryset
+
+def loaded_columns(serializer, model) -> Optional[List[str]]:
+    """
+    Model fields a serializer reads from the row itself.
+
+    Returns None if that cannot be told, e.g. for method fields or dotted
+    sources, in which case nothing should be deferred.
+    """
+    columns = [model._meta.pk.name]
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            columns.append(field.source)
+    return columns
+
+def related_lookups(serializer, model) -> Tuple[List[str], List[Prefetch]]:
+    """``select_related`` paths and ``Prefetch`` objects for one serializer"""
+    select_related, prefetch_related = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*' or '.' in field.source:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+        related_model = model_field.related_model
+
+        if model_field.many_to_many or model_field.one_to_many:
+            child = getattr(field, 'child', None) or getattr(field, 'child_relation', None)
+            related_queryset = related_model._default_manager.all()
+            if isinstance(child, serializers.BaseSerializer):
+                related_queryset = optimize_queryset(related_queryset, type(child))
+            prefetch_related.append(Prefetch(field.source, queryset=related_queryset))
+        elif isinstance(field, serializers.BaseSerializer):
+            select_related.append(field.source)
+            nested_select, nested_prefetch = related_lookups(field, related_model)
+            select_related.extend(f"{field.source}__{path}" for path in nested_select)
+            prefetch_related.extend(
+                Prefetch(f"{field.source}__{lookup.prefetch_through}", queryset=lookup.queryset)
+                for lookup in nested_prefetch
+            )
+        elif not isinstance(field, serializers.PrimaryKeyRelatedField):
+            # Slug/string/hyperlinked fields read the related row; primary
+            # keys come straight from the foreign key column
+            select_related.append(field.source)
+    return select_related, prefetch_related
+
+def estimate_count(queryset, exact_below: int) -> Tuple[int, bool]:
+    """
+    ``(row count, whether it is an estimate)`` for a queryset.
+
+    On PostgreSQL the planner's row estimate is used when it is at least
+    ``exact_below``, which costs a plan instead of a scan; smaller results,
+    and other databases, get an exact ``COUNT(*)``.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate >= exact_below:
+            return estimate, True
+    return queryset.count(), False
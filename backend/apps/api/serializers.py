@@ -0,0 +1,45 @@
+from typing import Optional, Set
+
+class SparseFieldsetMixin:
+    """
+    Let clients choose a serializer's fields with ``fields=`` and ``expand=``.
+
+    ``Meta.fields`` lists everything the serializer can return and
+    ``Meta.default_fields`` (optional) what it returns when not asked.
+    ``?fields=id,title`` returns exactly those fields; ``?expand=content``
+    adds fields to the defaults. ``Meta.expandable_fields`` maps a field
+    name to ``(serializer_class, kwargs)`` to use in place of the plain
+    field when it is expanded, e.g. a nested source instead of its ID.
+    Unknown names are ignored; a ``fields=`` with none that exist falls
+    back to the defaults.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+
+        expand = _split(request.query_params.get('expand'))
+        for name, (serializer_class, serializer_kwargs) in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name in expand:
+                self.fields[name] = serializer_class(**serializer_kwargs)
+
+        wanted = self.requested_fields(request.query_params)
+        if wanted is not None:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, query_params) -> Optional[Set[str]]:
+        """Field names to keep, or None to keep them all"""
+        fields = _split(query_params.get('fields')) & set(cls.Meta.fields)
+        if fields:
+            return fields
+        default_fields = getattr(cls.Meta, 'default_fields', None)
+        if default_fields is None:
+            return None
+        return set(default_fields) | _split(query_params.get('expand'))
+
+def _split(value: Optional[str]) -> Set[str]:
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
@@ -0,0 +1,41 @@
+from typing import Callable, Dict, Iterable
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+def count_queries(func: Callable[[], object]) -> int:
+    """Number of SQL queries ``func`` runs, ignoring savepoint bookkeeping"""
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return sum(1 for query in context.captured_queries if 'SAVEPOINT' not in query['sql'].upper())
+
+def assert_constant_queries(fetch: Callable[[int], object], sizes: Iterable[int] = (1, 10, 50)) -> Dict[int, int]:
+    """
+    Fail if the number of queries ``fetch(size)`` runs depends on ``size``.
+
+    Use it to guard list endpoints and serializers against N+1 queries:
+    ``fetch`` should load and serialise ``size`` rows (make sure at least
+    that many exist). Returns the query count per size.
+    """
+    counts = {size: count_queries(lambda: fetch(size)) for size in sizes}
+    if len(set(counts.values())) > 1:
+        detail = ', '.join(f"{size} rows: {count}" for size, count in counts.items())
+        raise AssertionError(f"Query count depends on the number of rows ({detail})")
+    return counts
+
+def assert_query_plan(queryset, uses: Iterable[str] = (), avoids: Iterable[str] = ()) -> str:
+    """
+    Fail unless the database's plan for ``queryset`` mentions every string
+    in ``uses`` (e.g. index names) and none in ``avoids`` (e.g. ``'DISTINCT'``).
+
+    Matching is case-insensitive on the backend's ``EXPLAIN`` text, so the
+    strings are backend specific. Returns the plan.
+    """
+    plan = queryset.explain()
+    text = plan.upper()
+    missing = [term for term in uses if term.upper() not in text]
+    present = [term for term in avoids if term.upper() in text]
+    if missing or present:
+        problems = [f"does not use {', '.join(missing)}"] if missing else []
+        problems += [f"uses {', '.join(present)}"] if present else []
+        raise AssertionError(f"Query plan {' and '.join(problems)}:\n{plan}")
+    return plan
@@ -0,0 +1,30 @@
+from typing import Any, Callable, Iterator, List, Sequence
+
+def length_sorted_batches(texts: Sequence[str], batch_size: int) -> Iterator[List[int]]:
+    """
+    Yield index lists for micro-batches of similar-length texts.
+
+    Models pad every text in a batch to the longest one, so grouping texts of
+    similar length keeps padding (and wasted compute) to a minimum.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    for start in range(0, len(order), batch_size):
+        yield order[start:start + batch_size]
+
+def batched_map(batch_fn: Callable[[List[str]], Sequence[Any]], texts: Sequence[str],
+                batch_size: int) -> List[Any]:
+    """
+    Apply ``batch_fn`` to ``texts`` in length-sorted micro-batches.
+
+    Identical texts are only sent to the model once. Results are returned in
+    the order of ``texts``.
+    """
+    unique_texts = list(dict.fromkeys(texts))
+    unique_results = [None] * len(unique_texts)
+    for indices in length_sorted_batches(unique_texts, batch_size):
+        outputs = batch_fn([unique_texts[i] for i in indices])
+        for i, output in zip(indices, outputs):
+            unique_results[i] = output
+
+    results_by_text = dict(zip(unique_texts, unique_results))
+    return [results_by_text[text] for text in texts]
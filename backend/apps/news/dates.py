@@ -0,0 +1,115 @@
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional, Pattern
+from django.utils import timezone
+
+# Names for the two formats parsed without strptime
+ISO_8601 = 'ISO 8601'
+RFC_2822 = 'RFC 2822'
+
+# What each strptime directive can match, for the shape check that runs
+# before strptime; formats using other directives are tried unchecked
+DIRECTIVE_SHAPES = {
+    '%Y': r'\d{4}', '%y': r'\d{2}', '%m': r'\d{1,2}', '%d': r'\d{1,2}',
+    '%H': r'\d{1,2}', '%I': r'\d{1,2}', '%M': r'\d{1,2}', '%S': r'\d{1,2}',
+    '%B': r'[^\W\d_]+', '%b': r'[^\W\d_]+', '%A': r'[^\W\d_]+', '%a': r'[^\W\d_]+',
+    '%p': r'[AaPp][Mm]', '%%': '%',
+}
+
+class DateParser:
+    """
+    Parses article dates in ISO 8601, RFC 2822 (RSS and Atom feeds) and a
+    list of ``strptime`` formats, returning aware datetimes.
+
+    ISO 8601 goes through ``datetime.fromisoformat`` and RFC 2822 through
+    ``email.utils``. Every format first checks the string's shape (length,
+    separators, where the digits are) and only then parses it, so a string
+    of the wrong shape costs no exception. The format that parsed a
+    source's last date is tried first for that source's next one, so a
+    site that writes "%m/%d/%Y" does not try every other format on each
+    article.
+    """
+
+    def __init__(self, formats: Iterable[str], max_sources: int = 1024):
+        self.parsers: Dict[str, Callable[[str], Optional[datetime]]] = {
+            ISO_8601: _parse_iso_8601,
+            RFC_2822: _parse_rfc_2822,
+        }
+        for date_format in formats:
+            self.parsers.setdefault(date_format, partial(_parse_format, date_format, _shape(date_format)))
+        self.max_sources = max_sources
+        self._last_format: Dict[Any, str] = {}
+
+    def parse(self, value: str, source: Any = None) -> datetime:
+        """
+        Parse ``value``; dates without an offset are taken to be in the
+        current time zone. ``source`` is any hashable key for where the date
+        came from (e.g. the article's host). Raises ValueError.
+        """
+        value = value.strip()
+        last_format = self._last_format.get(source)
+        if last_format is not None:
+            parsed = self.parsers[last_format](value)
+            if parsed is not None:
+                return _aware(parsed)
+
+        for name, parser in self.parsers.items():
+            if name == last_format:
+                continue
+            parsed = parser(value)
+            if parsed is not None:
+                self._remember(source, name)
+                return _aware(parsed)
+
+        raise ValueError(f"Unrecognised date {value!r}")
+
+    def _remember(self, source: Any, name: str) -> None:
+        if len(self._last_format) >= self.max_sources and source not in self._last_format:
+            self._last_format.clear()
+        self._last_format[source] = name
+
+def _parse_iso_8601(value: str) -> Optional[datetime]:
+    if len(value) < 10 or not value[:4].isdigit() or value[4] != '-':
+        return None
+    # fromisoformat only accepts "Z" from Python 3.11
+    if value[-1] in 'Zz':
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def _parse_rfc_2822(value: str) -> Optional[datetime]:
+    # RFC 2822 dates always carry a time, unlike the strptime formats
+    if ':' not in value or value[:4].isdigit():
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+def _shape(date_format: str) -> Optional[Pattern]:
+    """Pattern every string ``date_format`` accepts matches, or None if unknown"""
+    parts = []
+    for token in re.findall(r'%.|[^%]+', date_format):
+        if token.startswith('%'):
+            if token not in DIRECTIVE_SHAPES:
+                return None
+            parts.append(DIRECTIVE_SHAPES[token])
+        else:
+            # strptime lets any run of whitespace stand for a space
+            parts.append(r'\s+'.join(re.escape(part) for part in token.split(' ')))
+    return re.compile(''.join(parts))
+
+def _parse_format(date_format: str, shape: Optional[Pattern], value: str) -> Optional[datetime]:
+    if shape is not None and shape.fullmatch(value) is None:
+        return None
+    try:
+        return datetime.strptime(value, date_format)
+    except ValueError:
+        return None
+
+def _aware(value: datetime) -> datetime:
+    return value if timezone.is_aware(value) else timezone.make_aware(value)
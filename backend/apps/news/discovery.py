@@ -0,0 +1,210 @@
+import gzip
+import logging
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Set
+from urllib.parse import urldefrag, urljoin
+from django.conf import settings
+from .dates import DateParser
+from .fetchers import ConcurrentFetcher
+from .models import NewsArticle, NewsSource
+
+logger = logging.getLogger(__name__)
+
+# Root elements of the documents discovery understands
+FEED_ROOTS = ('rss', 'RDF', 'feed', 'urlset', 'sitemapindex')
+# <link rel="alternate"> types that advertise a feed on a home page
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/rdf+xml')
+# NewsSource fields that hold the conditional-request validators for its feed
+FEED_VALIDATOR_FIELDS = ['feed_etag', 'feed_last_modified']
+
+class FeedEntry(NamedTuple):
+    """An article link from a feed or sitemap"""
+    url: str
+    published_at: Optional[datetime]
+
+class FeedDiscovery:
+    """
+    Finds new article URLs for a source from its RSS, Atom or sitemap feed.
+
+    The feed is fetched with the ETag and Last-Modified it returned last
+    time, so an unchanged feed costs a 304 and no parsing. A source without
+    a ``feed_url`` has its home page read for an advertised feed
+    (``<link rel="alternate">``), which is then remembered. Sitemap indexes
+    are followed to their newest child sitemaps. Entries are taken newest
+    first, and URLs already stored as articles are dropped with one indexed
+    ``url__in`` query per chunk before anything is downloaded.
+
+    URLs that failed on earlier runs (``feed_retry_urls``) are returned
+    again whether or not the feed changed. New validators are only set on
+    the ``source`` instance; the caller saves ``FEED_VALIDATOR_FIELDS``
+    only once every URL is stored, so a failed fetch does not turn the
+    next run into a 304.
+    """
+
+    def __init__(self, fetcher: Optional[ConcurrentFetcher] = None):
+        self.fetcher = fetcher or ConcurrentFetcher()
+        # Feeds use RFC 2822 (RSS) and ISO 8601 (Atom, sitemaps) only
+        self.date_parser = DateParser([])
+
+    def discover(self, source: NewsSource) -> List[str]:
+        """New article URLs for ``source``, newest first"""
+        retry_urls = list(source.feed_retry_urls or {})
+        feed_url = source.feed_url or source.url
+        response = self.fetcher.get(feed_url, headers=self._conditional_headers(source, feed_url))
+        if response.status_code == 304:
+            logger.info(f"Feed for {source.name} not modified")
+            return self.unknown_urls(retry_urls)
+
+        root = _parse_xml(response.content)
+        if root is None or _local_name(root) not in FEED_ROOTS:
+            advertised = None if source.feed_url else _advertised_feed(response.content, response.url)
+            if advertised is None:
+                logger.warning(f"No RSS, Atom or sitemap feed found at {feed_url}")
+                return self.unknown_urls(retry_urls)
+            feed_url = advertised
+            response = self.fetcher.get(feed_url)
+            root = _parse_xml(response.content)
+            if root is None or _local_name(root) not in FEED_ROOTS:
+                logger.warning(f"Unreadable feed {feed_url} advertised by {source.url}")
+                return self.unknown_urls(retry_urls)
+
+        source.feed_url = feed_url
+        source.feed_etag = response.headers.get('ETag', '')
+        source.feed_last_modified = response.headers.get('Last-Modified', '')
+
+        entries = sorted(self._entries(root, response.url), key=_newest_first)
+        urls = list(dict.fromkeys(entry.url for entry in entries if entry.url.startswith(('http://', 'https://'))))
+        return self.unknown_urls(dict.fromkeys(urls[:settings.NEWS_DISCOVERY_MAX_URLS] + retry_urls))
+
+    @staticmethod
+    def unknown_urls(urls: Iterable[str]) -> List[str]:
+        """``urls`` without the ones already stored as articles, in order"""
+        urls = list(urls)
+        known: Set[str] = set()
+        chunk_size = settings.NEWS_DISCOVERY_LOOKUP_CHUNK
+        for start in range(0, len(urls), chunk_size):
+            known.update(
+                NewsArticle.objects.filter(url__in=urls[start:start + chunk_size]).values_list('url', flat=True)
+            )
+        return [url for url in urls if url not in known]
+
+    def _conditional_headers(self, source: NewsSource, feed_url: str) -> dict:
+        # Validators belong to the feed they came from
+        if feed_url != source.feed_url:
+            return {}
+        headers = {}
+        if source.feed_etag:
+            headers['If-None-Match'] = source.feed_etag
+        if source.feed_last_modified:
+            headers['If-Modified-Since'] = source.feed_last_modified
+        return headers
+
+    def _entries(self, root, base_url: str) -> List[FeedEntry]:
+        kind = _local_name(root)
+        if kind == 'sitemapindex':
+            return self._sitemap_index_entries(root, base_url)
+        if kind == 'urlset':
+            # Google News sitemaps carry the publication date separately
+            return [
+                self._entry(base_url, _text(url, 'loc'), _text(url, 'publication_date') or _text(url, 'lastmod'))
+                for url in root.iterchildren('{*}url')
+            ]
+        if kind == 'feed':
+            return [
+                self._entry(base_url, _atom_link(entry), _text(entry, 'published') or _text(entry, 'updated'))
+                for entry in root.iterchildren('{*}entry')
+            ]
+        # RSS 2.0 items sit under <channel>, RSS 1.0 (RDF) items under the root
+        return [
+            self._entry(base_url, _text(item, 'link') or _permalink(item), _text(item, 'pubDate') or _text(item, 'date'))
+            for item in root.iter('{*}item')
+        ]
+
+    def _sitemap_index_entries(self, root, base_url: str) -> List[FeedEntry]:
+        sitemaps = sorted(
+            (self._entry(base_url, _text(sitemap, 'loc'), _text(sitemap, 'lastmod'))
+             for sitemap in root.iterchildren('{*}sitemap')),
+            key=_newest_first
+        )
+        entries = []
+        for sitemap in sitemaps[:settings.NEWS_DISCOVERY_MAX_SITEMAPS]:
+            try:
+                child = _parse_xml(self.fetcher.get(sitemap.url).content)
+            except Exception as e:
+                logger.warning(f"Error fetching sitemap {sitemap.url}: {str(e)}")
+                continue
+            # Nested indexes are not followed
+            if child is not None and _local_name(child) == 'urlset':
+                entries.extend(self._entries(child, sitemap.url))
+        return entries
+
+    def _entry(self, base_url: str, link: str, date: str) -> FeedEntry:
+        url = urldefrag(urljoin(base_url, link))[0] if link else ''
+        published_at = None
+        if date:
+            try:
+                published_at = self.date_parser.parse(date, base_url)
+            except ValueError:
+                pass
+        return FeedEntry(url, published_at)
+
+def _parse_xml(content: bytes):
+    """The document's root element, or None if it is not XML"""
+    from lxml import etree
+
+    if content[:2] == b'\x1f\x8b':
+        # sitemap.xml.gz served without Content-Encoding
+        try:
+            content = gzip.decompress(content)
+        except OSError:
+            return None
+    # Feeds are untrusted: no entity expansion or network access
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True, huge_tree=False)
+    try:
+        root = etree.fromstring(content.strip(), parser)
+    except etree.XMLSyntaxError:
+        return None
+    return root if root is not None and isinstance(root.tag, str) else None
+
+def _advertised_feed(content: bytes, base_url: str) -> Optional[str]:
+    """The first feed a page advertises with <link rel="alternate">"""
+    import lxml.html
+    from lxml.etree import ParserError
+
+    try:
+        page = lxml.html.document_fromstring(content)
+    except (ParserError, ValueError):
+        return None
+    for link in page.iter('link'):
+        rel = (link.get('rel') or '').lower().split()
+        if 'alternate' in rel and (link.get('type') or '').lower() in FEED_TYPES and link.get('href'):
+            return urljoin(base_url, link.get('href').strip())
+    return None
+
+def _local_name(element) -> str:
+    return element.tag.rsplit('}', 1)[-1]
+
+def _text(element, name: str) -> str:
+    """Stripped text of the first child (or grandchild) called ``name`` in any namespace"""
+    child = element.find(f'{{*}}{name}')
+    if child is None:
+        child = element.find(f'.//{{*}}{name}')
+    return (child.text or '').strip() if child is not None else ''
+
+def _atom_link(entry) -> str:
+    for link in entry.iterchildren('{*}link'):
+        if link.get('rel', 'alternate') == 'alternate' and link.get('href'):
+            return link.get('href').strip()
+    return ''
+
+def _permalink(item) -> str:
+    guid = item.find('{*}guid')
+    if guid is None or guid.get('isPermaLink', 'true') != 'true':
+        return ''
+    return (guid.text or '').strip()
+
+def _newest_first(entry: FeedEntry):
+    # Undated entries keep their feed order, after the dated ones
+    if entry.published_at is None:
+        return (1, 0.0)
+    return (0, -entry.published_at.timestamp())
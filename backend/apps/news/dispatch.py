@@ -0,0 +1,69 @@
+import logging
+import time
+from typing import Iterable, List, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+class ArticleBatchDispatcher:
+    """
+    Group article IDs into chunks and send one processing task per chunk.
+
+    A chunk is sent as soon as it reaches ``max_batch_size`` IDs, or when an
+    ID is added after the oldest pending one has waited ``max_wait`` seconds.
+    Whatever is left is sent on ``flush()``/``close()``, which also happens on
+    leaving a ``with`` block.
+    """
+
+    def __init__(self, max_batch_size: Optional[int] = None, max_wait: Optional[float] = None,
+                 task=None):
+        self.max_batch_size = max_batch_size or settings.NEWS_DISPATCH_BATCH_SIZE
+        self.max_wait = settings.NEWS_DISPATCH_MAX_WAIT if max_wait is None else max_wait
+        if task is None:
+            from .tasks import process_articles_batch
+            task = process_articles_batch
+        self.task = task
+        self.articles_sent = 0
+        self.messages_sent = 0
+        self._pending: List[int] = []
+        self._oldest_pending_at: Optional[float] = None
+
+    def add(self, article_id: int) -> None:
+        """Queue one article, sending a chunk if it is full or overdue"""
+        if not self._pending:
+            self._oldest_pending_at = time.monotonic()
+        self._pending.append(article_id)
+
+        if (len(self._pending) >= self.max_batch_size
+                or time.monotonic() - self._oldest_pending_at >= self.max_wait):
+            self.flush()
+
+    def add_many(self, article_ids: Iterable[int]) -> None:
+        for article_id in article_ids:
+            self.add(article_id)
+
+    def flush(self) -> None:
+        """Send the pending chunk, if any"""
+        if not self._pending:
+            return
+
+        article_ids, self._pending = self._pending, []
+        self._oldest_pending_at = None
+        self.task.apply_async(args=[article_ids], kwargs={'enqueued_at': time.time()})
+        self.articles_sent += len(article_ids)
+        self.messages_sent += 1
+
+    def close(self) -> None:
+        self.flush()
+        if self.articles_sent:
+            logger.info(
+                f"Dispatched {self.articles_sent} articles for processing "
+                f"in {self.messages_sent} broker messages"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,260 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# What every backend returns, '' when not found
+EXTRACTION_FIELDS = ('title', 'content', 'author', 'published_at')
+
+# Per-source rules (NewsSource.extraction_rules) map each field to a CSS
+# selector or, when it starts with "/", "./" or "(", an XPath expression.
+# "remove" lists selectors for extra boilerplate to drop before the body
+# is read.
+ExtractionRules = Dict[str, Any]
+
+class BaseExtractor:
+    """Interface for turning an article page into its fields"""
+
+    def extract(self, html: str, rules: Optional[ExtractionRules] = None) -> Dict[str, str]:
+        """Return ``EXTRACTION_FIELDS`` from ``html``, using ``rules`` where given"""
+        raise NotImplementedError
+
+class SoupExtractor(BaseExtractor):
+    """
+    BeautifulSoup with the pure-Python ``html.parser``: the first ``<h1>``,
+    every ``<p>`` on the page and the author ``<meta>``. Rules must be CSS
+    selectors.
+    """
+
+    def extract(self, html: str, rules: Optional[ExtractionRules] = None) -> Dict[str, str]:
+        from bs4 import BeautifulSoup
+
+        rules = rules or {}
+        soup = BeautifulSoup(html, 'html.parser')
+        if any(_is_xpath(selector) for field in EXTRACTION_FIELDS for selector in _as_list(rules.get(field))) \
+                or any(_is_xpath(selector) for selector in _as_list(rules.get('remove'))):
+            raise ValueError('XPath extraction rules need the lxml extraction backend')
+        for selector in _as_list(rules.get('remove')):
+            for element in soup.select(selector):
+                element.decompose()
+
+        def select(field):
+            return [' '.join(element.get_text(' ').split()) for element in soup.select(rules[field])]
+
+        title = soup.find('h1')
+        author = soup.find('meta', {'name': 'author'})
+        fields = {
+            'title': title.text.strip() if title else '',
+            'content': ' '.join([p.text.strip() for p in soup.find_all('p')]),
+            'author': author['content'] if author else '',
+            'published_at': '',
+        }
+        for field in EXTRACTION_FIELDS:
+            if rules.get(field):
+                texts = select(field)
+                fields[field] = ' '.join(texts) if field == 'content' else next(iter(texts), '')
+        return fields
+
+class LxmlExtractor(BaseExtractor):
+    """
+    lxml (libxml2) extraction with boilerplate removal.
+
+    The body is the element the source's ``content`` rule selects, else the
+    ``articleBody`` or ``<article>`` with the most paragraph text, else the
+    whole page. Navigation, page headers and footers, asides, scripts and
+    elements whose class or id is a known sharing, related-links,
+    newsletter, comment or ad block are then dropped, except where they
+    hold the body; headers and footers inside the body belong to the
+    article and stay. Paragraphs that are mostly link text (lists of
+    related stories) are skipped as well.
+
+    Title, author and date come from the source's rules, else from article
+    metadata or the body once the boilerplate is gone, so a logo ``<h1>``
+    or a sidebar's ``<time>`` is never taken for the article's.
+    """
+
+    BOILERPLATE_TAGS = (
+        'script', 'style', 'noscript', 'template', 'iframe', 'svg', 'button',
+        'nav', 'header', 'footer', 'aside',
+    )
+    # Whole class or id tokens only: "has-sidebar", "no-ads" or
+    # "share-price" must not match
+    BOILERPLATE_CLASSES = frozenset({
+        'nav', 'navbar', 'navigation', 'main-nav', 'menu', 'breadcrumb', 'breadcrumbs',
+        'footer', 'site-footer', 'site-header', 'sidebar',
+        'share', 'sharing', 'share-tools', 'share-buttons', 'social', 'social-share',
+        'related', 'related-stories', 'related-articles', 'related-links', 'recommended',
+        'newsletter', 'newsletter-signup', 'subscribe', 'promo',
+        'ad', 'ads', 'advert', 'advertisement',
+        'cookie-banner', 'cookie-consent', 'comments', 'comment-section', 'paywall', 'popup', 'modal',
+    })
+    # Kept with the body when they are inside it
+    BODY_TAGS = ('header', 'footer')
+    MAX_LINK_DENSITY = 0.5
+
+    # Relative selectors are read from the body, absolute ones from the page
+    DEFAULT_SELECTORS = {
+        'title': ['.//h1', '//meta[@property="og:title"]/@content', '//h1', '//title'],
+        'author': [
+            '//meta[@name="author"]/@content', '//meta[@property="article:author"]/@content',
+            './/*[@rel="author"]', './/*[@itemprop="author"]',
+        ],
+        'published_at': [
+            '//meta[@property="article:published_time"]/@content',
+            '//*[@itemprop="datePublished"]/@content', '//*[@itemprop="datePublished"]/@datetime',
+            './/time/@datetime',
+        ],
+    }
+    BODY_SELECTOR = '//*[@itemprop="articleBody"] | //article'
+
+    def extract(self, html: str, rules: Optional[ExtractionRules] = None) -> Dict[str, str]:
+        rules = rules or {}
+        root = self._parse(html)
+        if root is None:
+            return dict.fromkeys(EXTRACTION_FIELDS, '')
+
+        # Explicit rules are read as the page came
+        fields = {
+            field: self._first(root, [rules[field]], field)
+            for field in self.DEFAULT_SELECTORS if rules.get(field)
+        }
+
+        if rules.get('content'):
+            containers = [element for element in _select(root, rules['content']) if not isinstance(element, str)]
+        else:
+            candidates = _select(root, self.BODY_SELECTOR)
+            containers = [max(candidates, key=self._paragraph_length)] if candidates else [root]
+        self._remove_boilerplate(root, _as_list(rules.get('remove')), containers)
+
+        body = containers[0] if containers else root
+        for field, defaults in self.DEFAULT_SELECTORS.items():
+            if field not in fields:
+                fields[field] = self._first(body, defaults, field)
+        fields['content'] = ' '.join(
+            paragraph for container in containers for paragraph in self._paragraphs(container)
+        )
+        return fields
+
+    def _parse(self, html: str):
+        import lxml.html
+        from lxml.etree import ParserError
+
+        try:
+            try:
+                return lxml.html.document_fromstring(html)
+            except ValueError:
+                # lxml refuses str input that declares its own encoding
+                return lxml.html.document_fromstring(html.encode('utf-8'))
+        except ParserError:
+            return None
+
+    def _first(self, context, selectors: List[str], field: str) -> str:
+        return next(
+            (value for selector in selectors for value in self._values(context, selector, field) if value), ''
+        )
+
+    def _values(self, context, selector: str, field: str) -> List[str]:
+        values = []
+        for result in _select(context, selector):
+            if isinstance(result, str):
+                values.append(' '.join(result.split()))
+            elif field == 'published_at' and result.get('datetime'):
+                values.append(result.get('datetime').strip())
+            elif result.tag == 'meta':
+                values.append((result.get('content') or '').strip())
+            else:
+                values.append(_text(result))
+        return values
+
+    def _remove_boilerplate(self, root, selectors: List[str], containers: list) -> None:
+        # The body and everything above it stay whatever they are called
+        kept = set()
+        for container in containers:
+            kept.add(container)
+            kept.update(container.iterancestors())
+
+        def in_body(element):
+            return any(ancestor in containers for ancestor in element.iterancestors())
+
+        doomed = [element for selector in selectors for element in _select(root, selector)]
+        doomed.extend(
+            element for element in root.iter(*self.BOILERPLATE_TAGS)
+            if not (element.tag in self.BODY_TAGS and in_body(element))
+        )
+        for element in root.iter():
+            if not isinstance(element.tag, str):
+                continue
+            tokens = f"{element.get('class', '')} {element.get('id', '')}".lower().split()
+            if tokens and not self.BOILERPLATE_CLASSES.isdisjoint(tokens):
+                doomed.append(element)
+        for element in doomed:
+            # Skip the body, and elements already gone with a dropped ancestor
+            if not isinstance(element, str) and element not in kept and element.getparent() is not None:
+                element.drop_tree()
+
+    def _paragraphs(self, container) -> List[str]:
+        paragraphs = [container] if container.tag == 'p' else container.iter('p')
+        texts = []
+        for paragraph in paragraphs:
+            text = _text(paragraph)
+            if not text:
+                continue
+            link_text = sum(len(_text(link)) for link in paragraph.iter('a'))
+            if link_text / len(text) <= self.MAX_LINK_DENSITY:
+                texts.append(text)
+        if not texts and container.tag != 'p':
+            # A rule may point at a container without <p> children
+            text = _text(container)
+            return [text] if text else []
+        return texts
+
+    def _paragraph_length(self, container) -> int:
+        return sum(len(paragraph.text_content()) for paragraph in container.iter('p'))
+
+@lru_cache(maxsize=512)
+def _compile(selector: str) -> Callable:
+    from lxml.etree import XPath
+
+    if _is_xpath(selector):
+        return XPath(selector)
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(selector)
+
+def _select(root, selector: str) -> list:
+    """Results of ``selector`` under ``root``; a broken selector matches nothing"""
+    try:
+        return _compile(selector)(root)
+    except Exception as e:
+        logger.warning(f"Error applying extraction selector {selector!r}: {str(e)}")
+        return []
+
+def _is_xpath(selector: str) -> bool:
+    return selector.startswith(('/', './', '('))
+
+def _text(element) -> str:
+    return ' '.join(element.text_content().split())
+
+def _as_list(value) -> List[str]:
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+EXTRACTION_BACKENDS = {
+    'lxml': LxmlExtractor,
+    'soup': SoupExtractor,
+}
+
+def load_extractor() -> BaseExtractor:
+    """Build the backend named by NEWS_EXTRACTION_BACKEND (a key or dotted path)"""
+    backend = settings.NEWS_EXTRACTION_BACKEND
+    backend_class = EXTRACTION_BACKENDS.get(backend) or import_string(backend)
+    return backend_class()
+
+def get_extractor() -> BaseExtractor:
+    """Shared extraction backend for the current process"""
+    from .model_registry import registry
+    return registry.get('extractor')
@@ -0,0 +1,145 @@
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# (url, parsed result, error) - exactly one of result/error is set
+FetchResult = Tuple[str, Optional[Any], Optional[Exception]]
+
+class ConcurrentFetcher:
+    """
+    Bounded thread-pool HTTP fetcher.
+
+    Downloads many URLs at once over a shared, pooled ``requests.Session`` so
+    connections are reused. Concurrency is capped globally (worker count and
+    connection pool size) and per host: ``fetch_many`` only hands a URL to
+    the pool while its host has fewer than ``per_host_concurrency`` requests
+    in flight, so workers never sit waiting on a busy host and one slow
+    publisher can only ever tie up its own slots. Single ``get`` calls share
+    a semaphore per netloc for the same limit.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None,
+                 per_host_concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
+        self.max_concurrency = max_concurrency or settings.NEWS_FETCH_MAX_CONCURRENCY
+        self.per_host_concurrency = per_host_concurrency or settings.NEWS_FETCH_PER_HOST_CONCURRENCY
+        self.timeout = timeout or settings.NEWS_FETCH_TIMEOUT
+        self.session = session or self._build_session()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        """Build a session whose connection pool matches the global cap"""
+        session = requests.Session()
+        session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=self.max_concurrency,
+            pool_maxsize=self.max_concurrency
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        """Hold one of the per-host slots for the duration of a request"""
+        host = urlsplit(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_concurrency)
+                self._host_slots[host] = slot
+        with slot:
+            yield
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Fetch a single URL, respecting the per-host limit"""
+        with self._host_slot(url):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def fetch_many(self, urls: Iterable[str],
+                   parse: Optional[Callable[[str, str], Any]] = None) -> Iterator[FetchResult]:
+        """
+        Fetch URLs concurrently and yield results as they complete.
+
+        Args:
+            urls: URLs to download. Duplicates are fetched once.
+            parse: Optional ``parse(url, html)`` callable run in the worker
+                thread; its return value is yielded instead of the raw text.
+
+        Yields:
+            ``(url, result, error)`` tuples. Failures are yielded rather than
+            raised so a single bad URL never aborts the batch.
+        """
+        pending = self._group_by_host(urls)
+        if not pending:
+            return
+
+        def task(url: str) -> Any:
+            response = self.get(url)
+            return parse(url, response.text) if parse else response.text
+
+        # No more workers than can run at once without waiting on a host
+        workers = min(
+            self.max_concurrency,
+            sum(min(self.per_host_concurrency, len(host_urls)) for host_urls in pending.values())
+        )
+        in_flight: Dict[str, int] = {host: 0 for host in pending}
+        futures: Dict[Future, Tuple[str, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='news-fetch') as executor:
+            def submit_ready() -> None:
+                """Fill free workers round-robin from hosts with a free slot"""
+                while len(futures) < workers:
+                    host = next((host for host in pending if in_flight[host] < self.per_host_concurrency), None)
+                    if host is None:
+                        return
+                    url = pending[host].popleft()
+                    if pending[host]:
+                        pending.move_to_end(host)
+                    else:
+                        del pending[host]
+                    in_flight[host] += 1
+                    futures[executor.submit(task, url)] = (url, host)
+
+            submit_ready()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, host = futures.pop(future)
+                    in_flight[host] -= 1
+                    try:
+                        yield url, future.result(), None
+                    except Exception as e:
+                        logger.warning(f"Error fetching {url}: {str(e)}")
+                        yield url, None, e
+                submit_ready()
+
+    @staticmethod
+    def _group_by_host(urls: Iterable[str]) -> 'OrderedDict[str, Deque[str]]':
+        """Distinct URLs queued per host, hosts in order of first appearance"""
+        by_host: 'OrderedDict[str, Deque[str]]' = OrderedDict()
+        seen = set()
+        for url in urls:
+            if url in seen:
+                continue
+            seen.add(url)
+            by_host.setdefault(urlsplit(url).netloc.lower(), deque()).append(url)
+        return by_host
+
+    def close(self) -> None:
+        self.session.close()
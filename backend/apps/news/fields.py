@@ -0,0 +1,118 @@
+from base64 import b64encode
+from typing import Any, Optional
+import numpy as np
+from django.db import models
+
+VECTOR_DTYPES = ('float32', 'float16', 'int8')
+
+def encode_vector(vector: Any, dtype: str = 'float32') -> bytes:
+    """
+    Pack a vector into little-endian bytes.
+
+    ``int8`` vectors are quantised symmetrically and prefixed with their
+    float32 scale, so they take 4 + dim bytes.
+    """
+    values = np.asarray(vector, dtype='<f4').ravel()
+    if dtype == 'float32':
+        return values.tobytes()
+    if dtype == 'float16':
+        return values.astype('<f2').tobytes()
+    if dtype == 'int8':
+        peak = float(np.abs(values).max()) if values.size else 0.0
+        scale = np.float32(peak / 127.0 if peak else 1.0)
+        quantised = np.clip(np.rint(values / scale), -127, 127).astype('i1')
+        return scale.astype('<f4').tobytes() + quantised.tobytes()
+    raise ValueError(f"Unsupported vector dtype '{dtype}'")
+
+def decode_vector(data: Any, dtype: str = 'float32') -> np.ndarray:
+    """
+    Read a vector packed by ``encode_vector``.
+
+    ``float32`` and ``float16`` vectors are read-only NumPy views over the
+    bytes returned by the database driver, so no copy is made. ``int8``
+    vectors are dequantised to float32.
+    """
+    if dtype == 'float32':
+        return np.frombuffer(data, dtype='<f4')
+    if dtype == 'float16':
+        return np.frombuffer(data, dtype='<f2')
+    if dtype == 'int8':
+        scale = np.frombuffer(data, dtype='<f4', count=1)[0]
+        return np.frombuffer(data, dtype='i1', offset=4).astype(np.float32) * scale
+    raise ValueError(f"Unsupported vector dtype '{dtype}'")
+
+class VectorField(models.BinaryField):
+    """
+    Embedding vector stored as packed binary instead of JSON text.
+
+    Accepts lists or NumPy arrays on write and returns NumPy arrays on read.
+    A 384-dim float32 vector takes 1.5KB (768 bytes as float16, 388 as int8)
+    against roughly 8KB of decimal text in a JSONField.
+    """
+
+    description = 'Packed numeric vector'
+
+    def __init__(self, *args, dtype: str = 'float32', **kwargs):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"VectorField dtype must be one of {VECTOR_DTYPES}")
+        self.dtype = dtype
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.dtype != 'float32':
+            kwargs['dtype'] = self.dtype
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        return decode_vector(value, self.dtype)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return decode_vector(value, self.dtype)
+        if isinstance(value, str):
+            # BinaryField serialises to base64 text in fixtures
+            return decode_vector(super().to_python(value), self.dtype)
+        return np.asarray(value, dtype=np.float32)
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, (bytes, bytearray, memoryview)):
+            return value
+        return encode_vector(value, self.dtype)
+
+    def value_to_string(self, obj):
+        return b64encode(self.get_prep_value(self.value_from_object(obj))).decode('ascii')
+
+class SearchVectorField(models.Field):
+    """
+    Precomputed full-text search document.
+
+    A ``tsvector`` on PostgreSQL. Other databases get a text column that
+    stays empty, so the schema and migrations remain portable while search
+    there falls back to substring matching.
+    """
+
+    description = 'Full-text search vector'
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def db_type(self, connection):
+        return 'tsvector' if connection.vendor == 'postgresql' else 'text'
+
+@SearchVectorField.register_lookup
+class SearchMatch(models.Lookup):
+    """``search_vector__matches=SearchQuery(...)``: the ``@@`` operator"""
+
+    lookup_name = 'matches'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ {rhs}", (*lhs_params, *rhs_params)
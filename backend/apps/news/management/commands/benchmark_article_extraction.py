@@ -0,0 +1,110 @@
+import random
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from apps.news.extraction import EXTRACTION_BACKENDS
+
+BODY_SENTENCES = [
+    'Shares of the chipmaker rose 4% after it raised its full-year revenue forecast.',
+    'Analysts said demand from data-centre customers showed no sign of slowing.',
+    'The company also announced a $10 billion buyback, its largest to date.',
+    'Gross margin widened to 62%, helped by a richer mix of high-end products.',
+    'Executives warned that export rules could weigh on sales in the second half.',
+]
+# Everything a real article page wraps the story in
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} | Example News</title>
+<meta name="author" content="Jane Doe">
+<meta property="article:published_time" content="2024-05-{day:02d}T14:30:00Z">
+<script>window.dataLayer = [{{"page": "article"}}];</script>
+<style>.story p {{ margin: 0 0 1em; }}</style></head>
+<body>
+<header class="site-header"><a href="/">Example News</a><p>Markets open in 2 hours</p></header>
+<nav class="main-nav"><ul>{nav}</ul></nav>
+<div class="cookie-banner"><p>We use cookies to improve your experience. Accept all cookies?</p></div>
+<main>
+<div class="breadcrumbs"><a href="/markets">Markets</a> / <a href="/markets/tech">Tech</a></div>
+<article class="story">
+<h1>{title}</h1>
+<div class="share-tools"><a href="#">Share on X</a><a href="#">Share on LinkedIn</a></div>
+{body}
+<div class="newsletter-signup"><p>Get the morning briefing in your inbox every weekday.</p><form><input></form></div>
+</article>
+<aside class="sidebar"><h2>Most read</h2>{related}</aside>
+<section class="related-stories"><p>{related_links}</p></section>
+<section id="comments"><p>Reader comment: great coverage as always, thanks for the write-up!</p></section>
+</main>
+<footer class="site-footer"><p>&copy; 2024 Example News. All rights reserved. Terms of use.</p></footer>
+</body></html>
+'''
+
+class Command(BaseCommand):
+    help = 'Compare article extraction backends on parse time and how much page boilerplate ends up in content'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=500)
+        parser.add_argument('--fixtures', help='Directory of saved *.html article pages to use instead')
+        parser.add_argument('--save', help='Write the generated pages to this directory')
+
+    def handle(self, *args, **options):
+        if options['fixtures']:
+            paths = sorted(Path(options['fixtures']).glob('*.html'))
+            if not paths:
+                raise CommandError(f"No *.html files in {options['fixtures']}")
+            pages = [(path.read_text(errors='replace'), None) for path in paths]
+        else:
+            pages = _pages(options['articles'])
+            if options['save']:
+                directory = Path(options['save'])
+                directory.mkdir(parents=True, exist_ok=True)
+                for i, (html, _) in enumerate(pages):
+                    (directory / f"article-{i:05d}.html").write_text(html)
+
+        megabytes = sum(len(html.encode()) for html, _ in pages) / 1e6
+        self.stdout.write(f"{len(pages)} pages, {megabytes:.1f} MB")
+        self.stdout.write(
+            f"{'backend':<8} {'ms/page':>8} {'chars/page':>11} {'story kept':>11} {'boilerplate':>12} {'dated':>6}"
+        )
+        for name, backend_class in EXTRACTION_BACKENDS.items():
+            extractor = backend_class()
+            start = time.perf_counter()
+            results = [extractor.extract(html) for html, _ in pages]
+            seconds = time.perf_counter() - start
+
+            chars = sum(len(result['content']) for result in results)
+            story = boilerplate = 0
+            for result, (_, expected) in zip(results, pages):
+                if expected is None:
+                    continue
+                kept = sum(len(sentence) for sentence in expected if sentence in result['content'])
+                story += kept
+                boilerplate += len(result['content']) - kept - (len(expected) - 1)
+            generated = sum(1 for _, expected in pages if expected is not None)
+            expected_chars = sum(sum(map(len, expected)) for _, expected in pages if expected is not None)
+            dated = sum(1 for result in results if result['published_at'])
+            self.stdout.write(
+                f"{name:<8} {seconds * 1000 / len(pages):>8.2f} {chars / len(pages):>11.0f} "
+                + (f"{story / expected_chars:>10.0%} {boilerplate / generated:>12.0f} " if generated else f"{'-':>11} {'-':>12} ")
+                + f"{dated:>6}"
+            )
+
+def _pages(count):
+    """``(html, story paragraphs)`` pairs for synthetic article pages"""
+    rng = random.Random(0)
+    pages = []
+    for i in range(count):
+        paragraphs = [
+            ' '.join(rng.choices(BODY_SENTENCES, k=rng.randint(2, 4))) for _ in range(rng.randint(8, 20))
+        ]
+        title = f"Chipmaker lifts forecast as AI demand holds up ({i})"
+        links = [f'<a href="/story/{rng.randrange(10**6)}">Related story headline number {n}</a>' for n in range(8)]
+        html = PAGE_TEMPLATE.format(
+            title=title,
+            day=i % 28 + 1,
+            nav=''.join(f'<li><a href="/section/{n}">Section {n}</a></li>' for n in range(20)),
+            body='\n'.join(f'<p>{paragraph}</p>' for paragraph in paragraphs),
+            related=''.join(f'<p>{link}</p>' for link in links[:4]),
+            related_links=' '.join(links[4:]),
+        )
+        pages.append((html, paragraphs))
+    return pages
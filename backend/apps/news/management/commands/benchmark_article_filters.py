@@ -0,0 +1,135 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.api.testing import assert_query_plan
+from apps.news.models import ArticleCategory, NewsArticle, NewsCategory, NewsSource, StockMention
+from .benchmark_article_list_queries import Rollback
+
+SYMBOL_COUNT = 200
+
+# Plan fragments that mean rows are being de-duplicated
+DEDUPLICATION = {
+    'sqlite': ['DISTINCT'],
+    'postgresql': ['Unique', 'HashAggregate'],
+}
+
+class Command(BaseCommand):
+    help = 'Compare join + DISTINCT and EXISTS article filters on a large mention table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=200000)
+        parser.add_argument('--mentions-per-article', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--check', action='store_true',
+                            help='Fail unless the EXISTS plans skip de-duplication and use the symbol index')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._build_fixture(options['articles'], options['mentions_per_article'])
+                if options['check']:
+                    self._check_plans()
+                self._report(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _build_fixture(self, count, mentions_per_article):
+        """Mentions follow a long tail: a few tickers are everywhere, most are rare"""
+        rng = random.Random(0)
+        source = NewsSource.objects.create(name='Filter Benchmark', url='https://filters.example.com')
+        categories = [
+            NewsCategory.objects.get_or_create(name=f"Filter Benchmark {i}")[0] for i in range(10)
+        ]
+        symbols = [f"F{i}" for i in range(SYMBOL_COUNT)]
+        weights = [1 / (rank + 1) for rank in range(SYMBOL_COUNT)]
+        now = timezone.now()
+        for start in range(0, count, 5000):
+            articles = NewsArticle.objects.bulk_create([
+                NewsArticle(
+                    title=f"Filter article {i}", content='Shares moved after earnings. ' * 40,
+                    summary='Summary', source=source, url=f"https://filters.example.com/{i}",
+                    published_at=now - timezone.timedelta(seconds=i),
+                )
+                for i in range(start, min(start + 5000, count))
+            ])
+            mentions = []
+            for article in articles:
+                # Repeated symbols per article are what made the join need DISTINCT
+                for symbol in rng.choices(symbols, weights, k=mentions_per_article):
+                    mentions.append(StockMention(article=article, symbol=symbol))
+            StockMention.objects.bulk_create(mentions)
+            ArticleCategory.objects.bulk_create([
+                ArticleCategory(article=article, category=category)
+                for article in articles for category in rng.sample(categories, 2)
+            ])
+        self.stdout.write(
+            f"{count} articles, {StockMention.objects.count()} mentions, {ArticleCategory.objects.count()} category links"
+        )
+
+    def _cases(self):
+        return {
+            'common symbol': {'symbol': 'F0'},
+            'rare symbol': {'symbol': f"F{SYMBOL_COUNT - 1}"},
+            'category': {'category': 'Filter Benchmark 3'},
+            'symbol + category': {'symbol': 'F5', 'category': 'Filter Benchmark 3'},
+        }
+
+    def _check_plans(self):
+        avoids = DEDUPLICATION.get(connection.vendor, [])
+        for name, params in self._cases().items():
+            # Category probes may go through either (article, category)
+            # index depending on which side the planner drives from
+            uses = ['news_mention_symbol_idx'] if 'symbol' in params else []
+            try:
+                assert_query_plan(self._page(_semi_join(params)), uses=uses, avoids=avoids)
+            except AssertionError as e:
+                raise CommandError(f"{name}: {e}")
+        self.stdout.write('Query plans OK')
+
+    def _report(self, repeat):
+        self.stdout.write(
+            f"{'filter':<18} {'rows':>7} {'page ms before':>15} {'after':>8}"
+        )
+        for name, params in self._cases().items():
+            before, after = _join_distinct(params), _semi_join(params)
+            rows = after.count()
+            if rows != before.count():
+                raise CommandError(f"{name}: the two filters disagree")
+            page_before = _median_ms(lambda: list(self._page(before)), repeat)
+            page_after = _median_ms(lambda: list(self._page(after)), repeat)
+            self.stdout.write(
+                f"{name:<18} {rows:>7} {page_before:>15.1f} {page_after:>8.1f}"
+            )
+
+    def _page(self, queryset):
+        """The first page of the article list"""
+        return queryset.order_by('-published_at', '-id')[:10]
+
+def _join_distinct(params):
+    """The filters as NewsArticleViewSet used to apply them"""
+    queryset = NewsArticle.objects.all()
+    if 'symbol' in params:
+        queryset = queryset.filter(stock_mentions__symbol=params['symbol'])
+    if 'category' in params:
+        queryset = queryset.filter(categories__category__name=params['category'])
+    return queryset.distinct()
+
+def _semi_join(params):
+    queryset = NewsArticle.objects.all()
+    if 'symbol' in params:
+        queryset = queryset.mentioning(params['symbol'])
+    if 'category' in params:
+        queryset = queryset.in_category(params['category'])
+    return queryset
+
+def _median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
@@ -0,0 +1,84 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from apps.api.querysets import optimize_queryset
+from apps.api.testing import assert_constant_queries, count_queries
+from apps.news.models import ArticleCategory, NewsArticle, NewsCategory, NewsSource, StockMention
+from apps.news.serializers import NewsArticleSerializer
+
+SYMBOLS = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMZN', 'GOOG']
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = 'Count queries and time for serialising article pages with and without prefetching'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 50, 200])
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if the optimised query count depends on page size')
+
+    def handle(self, *args, **options):
+        page_sizes = options['page_sizes']
+        try:
+            with transaction.atomic():
+                build_article_fixture(max(page_sizes))
+                self._report(page_sizes)
+                if options['check']:
+                    try:
+                        assert_constant_queries(self._fetcher(optimised=True), page_sizes)
+                    except AssertionError as e:
+                        raise CommandError(str(e))
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _report(self, page_sizes):
+        self.stdout.write(f"{'page':>5} {'queries before':>15} {'queries after':>14} {'ms before':>10} {'ms after':>9}")
+        for size in page_sizes:
+            row = []
+            for optimised in (False, True):
+                fetch = self._fetcher(optimised)
+                queries = count_queries(lambda: fetch(size))
+                start = time.perf_counter()
+                fetch(size)
+                row.append((queries, (time.perf_counter() - start) * 1000))
+            (before_queries, before_ms), (after_queries, after_ms) = row
+            self.stdout.write(
+                f"{size:>5} {before_queries:>15} {after_queries:>14} {before_ms:>10.1f} {after_ms:>9.1f}"
+            )
+
+    def _fetcher(self, optimised):
+        queryset = NewsArticle.objects.filter(source__name='Benchmark Source').order_by('-published_at')
+        if optimised:
+            queryset = optimize_queryset(queryset, NewsArticleSerializer)
+
+        def fetch(size):
+            return NewsArticleSerializer(list(queryset[:size]), many=True).data
+        return fetch
+
+def build_article_fixture(count):
+    """Articles with three mentions and two categories each"""
+    source = NewsSource.objects.create(name='Benchmark Source', url='https://benchmark.example.com')
+    categories = [
+        NewsCategory.objects.get_or_create(name=name)[0] for name in ('Benchmark A', 'Benchmark B')
+    ]
+    now = timezone.now()
+    articles = NewsArticle.objects.bulk_create([
+        NewsArticle(
+            title=f"Benchmark article {i}", content='Shares moved after earnings. ' * 200,
+            url=f"https://benchmark.example.com/articles/{i}", source=source,
+            published_at=now - timezone.timedelta(minutes=i), summary='Summary',
+        )
+        for i in range(count)
+    ])
+    StockMention.objects.bulk_create([
+        StockMention(article=article, symbol=SYMBOLS[(article.pk + j) % len(SYMBOLS)], context='context')
+        for article in articles for j in range(3)
+    ])
+    ArticleCategory.objects.bulk_create([
+        ArticleCategory(article=article, category=category)
+        for article in articles for category in categories
+    ])
@@ -0,0 +1,94 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.api.pagination import KeysetPagination
+from apps.news.models import NewsArticle, NewsSource
+from apps.news.views import NewsArticleViewSet
+from .benchmark_article_list_queries import Rollback
+
+class Command(BaseCommand):
+    help = 'Time article list pages at increasing depth with page-number and keyset pagination'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=200000)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._build_fixture(options['articles'])
+                self._report(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _build_fixture(self, count):
+        source = NewsSource.objects.create(name='Pagination Benchmark', url='https://pagination.example.com')
+        now = timezone.now()
+        batch = []
+        for i in range(count):
+            batch.append(NewsArticle(
+                title=f"Pagination article {i}", content='Body', summary='Summary', source=source,
+                url=f"https://pagination.example.com/{i}",
+                # Several articles per second, so the id tie-breaker matters
+                published_at=now - timezone.timedelta(seconds=i // 4),
+            ))
+            if len(batch) == 5000:
+                NewsArticle.objects.bulk_create(batch)
+                batch = []
+        NewsArticle.objects.bulk_create(batch)
+
+    def _report(self, options):
+        factory = APIRequestFactory()
+        page_size = options['page_size']
+        self.stdout.write(f"{options['articles']} articles, {page_size} per page")
+        self.stdout.write(f"{'page':>6} {'page-number ms':>15} {'keyset ms':>10}")
+        for page in options['pages']:
+            offset = (page - 1) * page_size
+            if offset >= options['articles']:
+                continue
+
+            numbered = self._time(
+                factory.get('/api/news/articles/', {'page': page, 'page_size': page_size}),
+                PageNumberPagination, options['repeat'],
+            )
+
+            url = f"http://testserver/api/news/articles/?page_size={page_size}"
+            if offset:
+                # Where the previous page's next link would point
+                queryset = self._queryset(Request(factory.get(url)))
+                pagination = KeysetPagination()
+                pagination.base_url = url
+                pagination.ordering = '-published_at'
+                pagination.field = NewsArticle._meta.get_field('published_at')
+                url = pagination.encode_cursor(queryset[offset - 1], reverse=False)
+            keyset = self._time(factory.get(url), KeysetPagination, options['repeat'])
+            self.stdout.write(f"{page:>6} {numbered:>15.2f} {keyset:>10.2f}")
+
+    def _time(self, django_request, pagination_class, repeat):
+        """Median milliseconds to fetch one page, count included for page numbers"""
+        timings = []
+        for _ in range(repeat):
+            request = Request(django_request)
+            view = self._view(request)
+            start = time.perf_counter()
+            rows = pagination_class().paginate_queryset(self._queryset(request, view), request, view)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert rows
+        return statistics.median(timings)
+
+    def _view(self, request):
+        view = NewsArticleViewSet(request=request, format_kwarg=None, action='list', kwargs={})
+        request.user = None
+        return view
+
+    def _queryset(self, request, view=None):
+        view = view or self._view(request)
+        return view.filter_queryset(view.get_queryset()).filter(source__name='Pagination Benchmark')
@@ -0,0 +1,50 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.api.querysets import optimize_queryset
+from apps.news.models import NewsArticle
+from apps.news.serializers import NewsArticleListSerializer, NewsArticleSerializer
+from .benchmark_article_list_queries import Rollback, build_article_fixture
+
+class Command(BaseCommand):
+    help = 'Compare payload size and load+serialise time of article list representations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        variants = [
+            ('full serializer (before)', NewsArticleSerializer, ''),
+            ('compact default', NewsArticleListSerializer, ''),
+            ('compact + expand relations', NewsArticleListSerializer, 'expand=stock_mentions,categories'),
+            ('fields=id,title,sentiment', NewsArticleListSerializer, 'fields=id,title,sentiment_score'),
+        ]
+        try:
+            with transaction.atomic():
+                build_article_fixture(options['page_size'])
+                self.stdout.write(f"{'representation':<28} {'bytes':>9} {'ms':>8}")
+                for name, serializer_class, query in variants:
+                    size, ms = self._measure(serializer_class, query, options['page_size'], options['repeat'])
+                    self.stdout.write(f"{name:<28} {size:>9} {ms:>8.1f}")
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _measure(self, serializer_class, query, page_size, repeat):
+        """Median time to load, serialise and render one page"""
+        request = Request(APIRequestFactory().get(f"/api/news/articles/?{query}"))
+        context = {'request': request}
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            queryset = NewsArticle.objects.filter(source__name='Benchmark Source').order_by('-published_at')
+            queryset = optimize_queryset(queryset, serializer_class(context=context), defer_unused=True)
+            data = serializer_class(list(queryset[:page_size]), many=True, context=context).data
+            content = JSONRenderer().render(data)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return len(content), timings[len(timings) // 2] * 1000
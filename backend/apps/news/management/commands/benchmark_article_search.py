@@ -0,0 +1,128 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.api.testing import assert_query_plan
+from apps.news.models import NewsArticle, NewsSource
+from apps.news.search import SEARCH_RANK, PostgresSearchBackend
+from .benchmark_article_list_queries import Rollback
+
+# Filler every article draws from, and the words the cases search for
+COMMON_WORDS = [
+    'shares', 'market', 'investors', 'quarter', 'revenue', 'growth', 'analysts',
+    'stock', 'trading', 'percent', 'company', 'outlook', 'demand', 'prices',
+]
+RARE_WORDS = ['antitrust', 'buyback', 'downgrade', 'bankruptcy', 'spinoff']
+
+class Command(BaseCommand):
+    help = 'Compare icontains and full-text article search on a large article table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=200000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--check', action='store_true',
+                            help='Fail unless full-text searches use the GIN index')
+
+    def handle(self, *args, **options):
+        backend = PostgresSearchBackend() if connection.vendor == 'postgresql' else None
+        if backend is None:
+            self.stdout.write(self.style.WARNING(
+                f"Full-text search needs PostgreSQL; timing icontains only on {connection.vendor}"
+            ))
+        try:
+            with transaction.atomic():
+                self._build_fixture(options['articles'], backend)
+                if options['check'] and backend is not None:
+                    self._check_plans(backend)
+                self._report(backend, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _build_fixture(self, count, backend):
+        """Articles of a few hundred words, where rare words turn up in about 1% of them"""
+        rng = random.Random(0)
+        source = NewsSource.objects.create(name='Search Benchmark', url='https://search.example.com')
+        now = timezone.now()
+        start_time = time.perf_counter()
+        for start in range(0, count, 5000):
+            articles = NewsArticle.objects.bulk_create([
+                NewsArticle(
+                    title=' '.join(rng.choices(COMMON_WORDS, k=6)).capitalize(),
+                    content=' '.join(
+                        rng.choices(COMMON_WORDS, k=300)
+                        + [word for word in RARE_WORDS if rng.random() < 0.01]
+                    ),
+                    summary='Summary', source=source, url=f"https://search.example.com/{i}",
+                    published_at=now - timezone.timedelta(seconds=i),
+                )
+                for i in range(start, min(start + 5000, count))
+            ])
+            if backend is not None:
+                backend.update(article.pk for article in articles)
+        if backend is not None:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE news_newsarticle')
+        self.stdout.write(f"{count} articles in {time.perf_counter() - start_time:.0f}s")
+
+    def _cases(self):
+        return {
+            'common word': ['revenue'],
+            'rare word': [RARE_WORDS[0]],
+            'prefix': [RARE_WORDS[1][:4]],
+            'two words': [RARE_WORDS[2], 'outlook'],
+            'no match': ['zzyzx'],
+        }
+
+    def _check_plans(self, backend):
+        for name, terms in self._cases().items():
+            try:
+                assert_query_plan(
+                    self._page(backend.search(NewsArticle.objects.all(), terms), SEARCH_RANK),
+                    uses=['news_article_search_idx'],
+                )
+            except AssertionError as e:
+                raise CommandError(f"{name}: {e}")
+        self.stdout.write('Query plans OK')
+
+    def _report(self, backend, repeat):
+        self.stdout.write(
+            f"{'search':<12} {'icontains rows':>15} {'ms':>8} {'full-text rows':>15} {'ms':>8}"
+        )
+        for name, terms in self._cases().items():
+            before = _contains(terms)
+            rows_before = before.count()
+            ms_before = _median_ms(lambda: list(self._page(before, 'published_at')), repeat)
+            if backend is None:
+                self.stdout.write(f"{name:<12} {rows_before:>15} {ms_before:>8.1f}")
+                continue
+            after = backend.search(NewsArticle.objects.all(), terms)
+            rows_after = after.count()
+            ms_after = _median_ms(lambda: list(self._page(after, SEARCH_RANK)), repeat)
+            self.stdout.write(
+                f"{name:<12} {rows_before:>15} {ms_before:>8.1f} {rows_after:>15} {ms_after:>8.1f}"
+            )
+
+    def _page(self, queryset, ordering):
+        """The first page of ``?search=``, in the order the list endpoint uses"""
+        return queryset.order_by(f"-{ordering}", '-id')[:20]
+
+def _contains(terms):
+    """What DRF's SearchFilter builds from NewsArticleViewSet.search_fields"""
+    queryset = NewsArticle.objects.all()
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(content__icontains=term) | Q(author__icontains=term)
+        )
+    return queryset
+
+def _median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
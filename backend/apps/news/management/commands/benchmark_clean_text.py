@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.news.tests.clean_text_corpus import article_bodies, reference_clean_text
+from apps.news.validators import NewsDataValidator
+
+class Command(BaseCommand):
+    help = 'Time NewsDataValidator.clean_text on article-sized bodies against the previous implementation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        bodies = article_bodies(options['articles'])
+        characters = sum(len(body) for body in bodies)
+        self.stdout.write(f"{len(bodies)} bodies, {characters / len(bodies):.0f} characters on average")
+        self.stdout.write(f"{'implementation':<16} {'ms total':>9} {'us/body':>8}")
+        timings = {
+            'previous': lambda: [reference_clean_text(body) for body in bodies],
+            'clean_text': lambda: [NewsDataValidator.clean_text(body) for body in bodies],
+            'clean_many': lambda: NewsDataValidator.clean_many(bodies),
+        }
+        for name, func in timings.items():
+            seconds = min(_seconds(func) for _ in range(options['repeat']))
+            self.stdout.write(f"{name:<16} {seconds * 1000:>9.0f} {seconds * 1e6 / len(bodies):>8.1f}")
+
+def _seconds(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
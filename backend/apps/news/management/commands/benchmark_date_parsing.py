@@ -0,0 +1,91 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.news.dates import DateParser
+from apps.news.validators import NewsDataValidator
+
+# How each simulated source writes its dates; most feeds and APIs use the
+# first four
+SOURCE_FORMATS = [
+    lambda d: d.strftime('%Y-%m-%dT%H:%M:%SZ'),
+    lambda d: d.astimezone(dt_timezone(timedelta(hours=-5))).isoformat(),
+    lambda d: d.strftime('%a, %d %b %Y %H:%M:%S +0000'),
+    lambda d: d.strftime('%Y-%m-%d %H:%M:%S'),
+    lambda d: d.strftime('%Y-%m-%d'),
+    lambda d: d.strftime('%B %d, %Y'),
+    lambda d: d.strftime('%d %B %Y'),
+    # Days above 12, so the old day-first format cannot claim these
+    lambda d: d.replace(day=max(d.day, 13)).strftime('%m/%d/%Y'),
+]
+
+# validate_date's list before the ISO 8601 fast path replaced its first four
+PREVIOUS_DATE_FORMATS = [
+    '%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S',
+    '%B %d, %Y', '%B %d %Y', '%d %B %Y', '%d/%m/%Y', '%m/%d/%Y',
+]
+
+class Command(BaseCommand):
+    help = 'Compare date parsing throughput on a mix of source formats against the previous strptime loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dates', type=int, default=100000)
+        parser.add_argument('--sources', type=int, default=40)
+        parser.add_argument('--check', action='store_true',
+                            help='Fail unless every date the previous parser accepted parses to the same instant')
+
+    def handle(self, *args, **options):
+        samples = _samples(options['dates'], options['sources'])
+        formats = NewsDataValidator.DATE_FORMATS
+
+        if options['check']:
+            self._check(samples, DateParser(formats))
+
+        self.stdout.write(f"{len(samples)} dates from {options['sources']} sources")
+        self.stdout.write(f"{'parser':<24} {'dates/s':>10} {'failed':>7}")
+        runs = {
+            'previous strptime loop': lambda value, source: _previous_parse(value, PREVIOUS_DATE_FORMATS),
+            'DateParser': lambda value, source, parser=DateParser(formats): parser.parse(value),
+            'DateParser per source': lambda value, source, parser=DateParser(formats): parser.parse(value, source),
+        }
+        for name, parse in runs.items():
+            failed = 0
+            start = time.perf_counter()
+            for source, value in samples:
+                try:
+                    parse(value, source)
+                except ValueError:
+                    failed += 1
+            seconds = time.perf_counter() - start
+            self.stdout.write(f"{name:<24} {len(samples) / seconds:>10.0f} {failed:>7}")
+
+    def _check(self, samples, parser):
+        for source, value in samples:
+            try:
+                expected = _previous_parse(value, PREVIOUS_DATE_FORMATS)
+            except ValueError:
+                continue
+            if parser.parse(value, source) != timezone.make_aware(expected):
+                raise CommandError(f"{value!r} parses differently")
+        self.stdout.write('Dates the previous parser accepted parse to the same instant')
+
+def _previous_parse(value, formats):
+    """validate_date as it was: each format in turn, naive results"""
+    for date_format in formats:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    raise ValueError(value)
+
+def _samples(count, sources):
+    """``(source, date string)`` pairs; each source sticks to one format"""
+    rng = random.Random(0)
+    source_formats = [(f"source-{i}.example.com", SOURCE_FORMATS[i % len(SOURCE_FORMATS)]) for i in range(sources)]
+    start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    samples = []
+    for _ in range(count):
+        source, render = rng.choice(source_formats)
+        samples.append((source, render(start + timedelta(seconds=rng.randrange(365 * 86400)))))
+    return samples
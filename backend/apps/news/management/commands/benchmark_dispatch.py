@@ -0,0 +1,48 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from apps.news.dispatch import ArticleBatchDispatcher
+
+class RecordingTask:
+    """Stands in for the Celery task and records what would be sent"""
+
+    def __init__(self):
+        self.messages = []
+
+    def apply_async(self, args, kwargs):
+        self.messages.append((args[0], kwargs['enqueued_at']))
+
+class Command(BaseCommand):
+    help = 'Compare broker messages and dispatch latency for different chunk sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=2000)
+        parser.add_argument('--rate', type=float, default=2000.0,
+                            help='Article arrival rate (articles/second)')
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 128],
+                            help='Chunk sizes; 1 matches one process_article.delay per article')
+        parser.add_argument('--max-wait', type=float, default=0.5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'batch':>6} {'messages':>9} {'avg wait ms':>12} {'max wait ms':>12}"
+        )
+        for batch_size in options['batch_sizes']:
+            task = RecordingTask()
+            added_at = {}
+            rng = random.Random(0)
+            with ArticleBatchDispatcher(batch_size, options['max_wait'], task=task) as dispatcher:
+                for article_id in range(options['articles']):
+                    time.sleep(rng.expovariate(options['rate']))
+                    added_at[article_id] = time.time()
+                    dispatcher.add(article_id)
+
+            waits = [
+                sent_at - added_at[article_id]
+                for article_ids, sent_at in task.messages
+                for article_id in article_ids
+            ]
+            self.stdout.write(
+                f"{batch_size:>6} {len(task.messages):>9} "
+                f"{1000 * sum(waits) / len(waits):>12.2f} {1000 * max(waits):>12.2f}"
+            )
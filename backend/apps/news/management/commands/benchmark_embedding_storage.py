@@ -0,0 +1,46 @@
+import json
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from apps.news.fields import VECTOR_DTYPES, decode_vector, encode_vector
+
+class Command(BaseCommand):
+    help = 'Compare JSON and binary embedding storage size and deserialisation time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100000)
+        parser.add_argument('--dim', type=int, default=384)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((options['articles'], options['dim']), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        # What JSONField stores and parses back today
+        json_rows = [json.dumps(vector.tolist()) for vector in vectors]
+        json_bytes = sum(len(row) for row in json_rows)
+        start = time.perf_counter()
+        for row in json_rows:
+            json.loads(row)
+        json_seconds = time.perf_counter() - start
+
+        self.stdout.write(f"{options['articles']} articles x {options['dim']} dims")
+        self.stdout.write(
+            f"{'format':<8} {'total MB':>9} {'bytes/row':>10} {'decode s':>9} {'max abs err':>12}"
+        )
+        self.stdout.write(
+            f"{'json':<8} {json_bytes / 1e6:>9.1f} {json_bytes / len(json_rows):>10.0f} "
+            f"{json_seconds:>9.3f} {0.0:>12.2e}"
+        )
+
+        for dtype in VECTOR_DTYPES:
+            rows = [encode_vector(vector, dtype) for vector in vectors]
+            total = sum(len(row) for row in rows)
+            start = time.perf_counter()
+            decoded = [decode_vector(row, dtype) for row in rows]
+            seconds = time.perf_counter() - start
+            error = float(np.abs(np.asarray(decoded, dtype=np.float32) - vectors).max())
+            self.stdout.write(
+                f"{dtype:<8} {total / 1e6:>9.1f} {total / len(rows):>10.0f} "
+                f"{seconds:>9.3f} {error:>12.2e}"
+            )
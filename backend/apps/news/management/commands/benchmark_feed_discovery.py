@@ -0,0 +1,139 @@
+import hashlib
+import threading
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.news.models import NewsArticle, NewsSource
+from apps.news.services import NewsIngestionService
+from .benchmark_article_list_queries import Rollback
+
+ARTICLE_PARAGRAPH = (
+    'Shares of the chipmaker rose 4% after it raised its full-year revenue forecast, '
+    'and analysts said demand from data-centre customers showed no sign of slowing. '
+)
+
+class Command(BaseCommand):
+    help = 'Simulate hourly ingestion runs against a local news site and count what each strategy downloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=8)
+        parser.add_argument('--feed-size', type=int, default=50, help='Items the feed lists')
+        parser.add_argument('--new-per-run', type=int, default=3,
+                            help='Stories published between runs; every other run publishes none')
+        parser.add_argument('--page-kb', type=int, default=80, help='Size of each article page')
+
+    def handle(self, *args, **options):
+        site = _Site(options['feed_size'], options['page_kb'])
+        server = ThreadingHTTPServer(('127.0.0.1', 0), site.handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            self.stdout.write(
+                f"{options['runs']} runs, feed of {options['feed_size']} items, "
+                f"{options['new_per_run']} new stories every other run, {options['page_kb']} KB pages"
+            )
+            self.stdout.write(f"{'strategy':<22} {'requests':>9} {'pages':>6} {'MB':>7} {'not modified':>13} {'saved':>6}")
+            for name in ('refetch every item', 'feed discovery'):
+                site.reset(options['feed_size'])
+                try:
+                    with transaction.atomic():
+                        saved = self._simulate(name, site, base_url, options)
+                        raise Rollback
+                except Rollback:
+                    pass
+                self.stdout.write(
+                    f"{name:<22} {site.requests:>9} {site.pages:>6} {site.bytes / 1e6:>7.1f} "
+                    f"{site.not_modified:>13} {saved:>6}"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _simulate(self, name, site, base_url, options):
+        source = NewsSource.objects.create(name='Discovery Benchmark', url=f"{base_url}/")
+        service = NewsIngestionService()
+        for run in range(options['runs']):
+            if run and run % 2 == 0:
+                site.publish(options['new_per_run'])
+            if name == 'feed discovery':
+                service.ingest_from_source(source)
+                source.refresh_from_db()
+            else:
+                # Every item in the feed, downloaded and upserted each run
+                feed = service.fetcher.get(f"{base_url}/feed.xml").text
+                urls = [f"{base_url}/story/{story}" for story in site.listed()]
+                if len(urls) != feed.count('<item>'):
+                    raise CommandError('Feed and site disagree')
+                results = service.fetcher.fetch_many(urls, parse=service.parse_article)
+                service._save_batch(source, [data for _, data, error in results if error is None])
+        return NewsArticle.objects.filter(source=source).count()
+
+class _Site:
+    """A news site with a home page, an RSS feed that honours ETags and article pages"""
+
+    def __init__(self, feed_size, page_kb):
+        self.feed_size = feed_size
+        self.page = ARTICLE_PARAGRAPH * max(1, page_kb * 1024 // len(ARTICLE_PARAGRAPH))
+        self.lock = threading.Lock()
+        self.reset(feed_size)
+
+    def reset(self, stories):
+        self.latest = stories
+        self.requests = self.pages = self.bytes = self.not_modified = 0
+
+    def publish(self, count):
+        self.latest += count
+
+    def listed(self):
+        return range(self.latest, max(0, self.latest - self.feed_size), -1)
+
+    def feed(self):
+        start = datetime(2024, 5, 1, tzinfo=dt_timezone.utc)
+        items = ''.join(
+            f"<item><title>Story {story}</title><link>/story/{story}</link>"
+            f"<pubDate>{format_datetime(start + timedelta(minutes=story))}</pubDate></item>"
+            for story in self.listed()
+        )
+        return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Example</title>{items}</channel></rss>'
+
+    def handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers, body = 200, {'Content-Type': 'text/html; charset=utf-8'}, ''
+                if self.path == '/':
+                    body = '<html><head><link rel="alternate" type="application/rss+xml" href="/feed.xml"></head></html>'
+                elif self.path == '/feed.xml':
+                    body = site.feed()
+                    etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+                    headers = {'Content-Type': 'application/rss+xml', 'ETag': etag}
+                    if self.headers.get('If-None-Match') == etag:
+                        status, body = 304, ''
+                elif self.path.startswith('/story/'):
+                    story = self.path.rsplit('/', 1)[1]
+                    body = (
+                        f'<html><head><meta property="article:published_time" content="2024-05-01T00:00:00Z"></head>'
+                        f'<body><article><h1>Story {story}</h1><p>{site.page}</p></article></body></html>'
+                    )
+                else:
+                    status = 404
+                data = body.encode()
+                with site.lock:
+                    site.requests += 1
+                    site.bytes += len(data)
+                    site.pages += self.path.startswith('/story/')
+                    site.not_modified += status == 304
+                self.send_response(status)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
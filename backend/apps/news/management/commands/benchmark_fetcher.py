@@ -0,0 +1,79 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+from apps.news.fetchers import ConcurrentFetcher
+
+ARTICLE_HTML = (
+    '<html><head><meta name="author" content="Jane Doe"></head><body>'
+    '<h1>Stub article</h1>'
+    + '<p>Shares of $AAPL rose after the company reported record quarterly revenue.</p>' * 40
+    + '</body></html>'
+).encode()
+
+class StubServer(ThreadingHTTPServer):
+    """Local HTTP server that serves the same article after a fixed delay"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        super().__init__(('127.0.0.1', 0), StubHandler)
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(ARTICLE_HTML)))
+        self.end_headers()
+        self.wfile.write(ARTICLE_HTML)
+
+    def log_message(self, format, *args):
+        pass
+
+class Command(BaseCommand):
+    help = 'Benchmark ConcurrentFetcher throughput against a local stub HTTP server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=512,
+                            help='Number of article URLs to fetch per run')
+        parser.add_argument('--latency', type=float, default=0.05,
+                            help='Simulated publisher latency in seconds')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 128],
+                            help='Concurrency levels to measure')
+
+    def handle(self, *args, **options):
+        server = StubServer(options['latency'])
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base_url}/article/{i}" for i in range(options['articles'])]
+
+        self.stdout.write(
+            f"{len(urls)} articles, {options['latency'] * 1000:.0f}ms simulated latency"
+        )
+        self.stdout.write(f"{'concurrency':>12} {'seconds':>10} {'articles/s':>12} {'errors':>8}")
+        try:
+            for concurrency in options['concurrency']:
+                # Every URL shares one host, so the per-host cap must match
+                fetcher = ConcurrentFetcher(
+                    max_concurrency=concurrency,
+                    per_host_concurrency=concurrency
+                )
+                errors = 0
+                start = time.perf_counter()
+                for _, _, error in fetcher.fetch_many(urls):
+                    if error is not None:
+                        errors += 1
+                elapsed = time.perf_counter() - start
+                fetcher.close()
+                self.stdout.write(
+                    f"{concurrency:>12} {elapsed:>10.2f} {len(urls) / elapsed:>12.1f} {errors:>8}"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,71 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.news.models import NewsSource
+from apps.news.services import NewsIngestionService
+
+SYMBOLS = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMZN', 'GOOG']
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = 'Count database queries per article for batched article persistence'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 50, 200],
+                            help='Batch sizes to measure')
+        parser.add_argument('--max-queries', type=int, default=None,
+                            help='Fail if any batch needs more than this many queries')
+
+    def handle(self, *args, **options):
+        service = NewsIngestionService()
+        self.stdout.write(f"{'batch':>6} {'queries':>8} {'per article':>12} {'seconds':>9}")
+
+        counts = []
+        for batch_size in options['batch_sizes']:
+            queries, elapsed = self._measure(service, batch_size)
+            counts.append(queries)
+            self.stdout.write(
+                f"{batch_size:>6} {queries:>8} {queries / batch_size:>12.3f} {elapsed:>9.4f}"
+            )
+
+        if options['max_queries'] is not None and max(counts) > options['max_queries']:
+            raise CommandError(
+                f"Query count grew with batch size: {counts} (limit {options['max_queries']})"
+            )
+
+    def _measure(self, service, batch_size):
+        """Save one batch inside a transaction that is always rolled back"""
+        try:
+            with transaction.atomic():
+                source = NewsSource.objects.create(
+                    name='Benchmark Source', url='https://benchmark.example.com'
+                )
+                articles_data = [self._article(i) for i in range(batch_size)]
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    service.process_articles(source, articles_data)
+                    elapsed = time.perf_counter() - start
+                raise Rollback
+        except Rollback:
+            pass
+        # Savepoint bookkeeping is not a round trip for the articles themselves
+        queries = [
+            query for query in context.captured_queries
+            if 'SAVEPOINT' not in query['sql'].upper()
+        ]
+        return len(queries), elapsed
+
+    @staticmethod
+    def _article(i):
+        symbols = ' '.join(f"${symbol}" for symbol in SYMBOLS[:(i % len(SYMBOLS)) + 1])
+        return {
+            'url': f"https://benchmark.example.com/articles/{i}",
+            'title': f"Benchmark article {i}",
+            'content': f"Shares of {symbols} moved after earnings. " * 10,
+            'author': 'Benchmark',
+            'published_at': timezone.now(),
+        }
@@ -0,0 +1,104 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from apps.news.model_registry import get_ml_utils
+from apps.news.services import NewsProcessingService
+from apps.news.stub_models import StubMLUtils
+
+WORDS = (
+    'shares rose after the company reported record quarterly revenue while analysts '
+    'warned that margins could fall as costs rise across the market this year'
+).split()
+
+class SimulatedMLUtils(StubMLUtils):
+    """
+    Stub models with a CPU-inference cost profile.
+
+    Every model call pays a fixed overhead, and a batch costs as much as its
+    longest text times its size, the way padded transformer batches do.
+    """
+
+    def __init__(self, call_overhead: float, per_char: float):
+        super().__init__()
+        self.call_overhead = call_overhead
+        self.per_char = per_char
+
+    def _run(self, texts):
+        longest = max((len(text) for text in texts), default=0)
+        time.sleep(self.call_overhead + self.per_char * longest * len(texts))
+
+    def generate_summary(self, text):
+        self._run([text])
+        return super().generate_summary(text)
+
+    def analyze_sentiment(self, text):
+        self._run([text])
+        return super().analyze_sentiment(text)
+
+    def generate_embedding(self, text):
+        self._run([text])
+        return super().generate_embedding(text)
+
+    def categorize_article(self, text):
+        self._run([text])
+        return super().categorize_article(text)
+
+    def _batched(self, method, texts):
+        self._run(texts)
+        return [getattr(StubMLUtils, method)(self, text) for text in texts]
+
+    def generate_summaries(self, texts):
+        return self._batched('generate_summary', texts)
+
+    def analyze_sentiments(self, texts):
+        return self._batched('analyze_sentiment', texts)
+
+    def generate_embeddings(self, texts):
+        return self._batched('generate_embedding', texts)
+
+    def categorize_articles(self, texts):
+        return self._batched('categorize_article', texts)
+
+class Command(BaseCommand):
+    help = 'Benchmark batched article inference throughput (articles/sec) against batch size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=128)
+        parser.add_argument('--mentions-per-article', type=int, default=3)
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 16, 64])
+        parser.add_argument('--call-overhead', type=float, default=0.002,
+                            help='Simulated fixed cost per model call in seconds')
+        parser.add_argument('--per-char', type=float, default=0.0000002,
+                            help='Simulated cost per padded character in seconds')
+        parser.add_argument('--real-models', action='store_true',
+                            help='Use the registered MLUtils instead of the simulated stub')
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        texts = [
+            ' '.join(rng.choice(WORDS) for _ in range(rng.randint(50, 800)))
+            for _ in range(options['articles'])
+        ]
+        mention_texts = [
+            ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+            for _ in range(options['articles'] * options['mentions_per_article'])
+        ]
+
+        if options['real_models']:
+            ml_utils = get_ml_utils()
+        else:
+            ml_utils = SimulatedMLUtils(options['call_overhead'], options['per_char'])
+        service = NewsProcessingService(ml_utils=ml_utils)
+
+        self.stdout.write(
+            f"{len(texts)} articles, {len(mention_texts)} mentions, "
+            f"{type(ml_utils).__name__}"
+        )
+        self.stdout.write(f"{'batch':>6} {'seconds':>9} {'articles/s':>11}")
+        for batch_size in options['batch_sizes']:
+            with override_settings(NEWS_ML_BATCH_SIZE=batch_size):
+                start = time.perf_counter()
+                service.analyze_texts(texts, mention_texts)
+                elapsed = time.perf_counter() - start
+            self.stdout.write(f"{batch_size:>6} {elapsed:>9.2f} {len(texts) / elapsed:>11.1f}")
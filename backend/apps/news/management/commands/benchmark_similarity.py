@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from django.core.management.base import BaseCommand
+from apps.news.similarity import SimilarityCorpus
+
+class Command(BaseCommand):
+    help = 'Measure exact similarity search latency with and without filter pushdown'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000])
+        parser.add_argument('--dim', type=int, default=384)
+        parser.add_argument('--queries', type=int, default=100)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--symbols', type=int, default=500, help='Distinct tickers in the corpus')
+        parser.add_argument('--sources', type=int, default=20)
+
+    def handle(self, *args, **options):
+        k = options['k']
+        self.stdout.write(
+            f"{'articles':>9} {'filter':<12} {'matching':>9} {'pushdown ms':>12} {'post-filter ms':>15}"
+        )
+        for size in options['sizes']:
+            corpus = self._corpus(size, options['dim'], options['symbols'], options['sources'])
+            rng = np.random.default_rng(1)
+            queries = corpus.vectors[rng.choice(size, options['queries'], replace=False)]
+            now = datetime.now(timezone.utc)
+
+            scenarios = {
+                'none': {},
+                'symbol': {'symbols': ['SYM1']},
+                'category': {'categories': ['earnings']},
+                'source': {'sources': [1, 2]},
+                'last 30d': {'published_after': now - timedelta(days=30)},
+                'combined': {'categories': ['earnings'], 'published_after': now - timedelta(days=90)},
+            }
+            for name, filters in scenarios.items():
+                mask = corpus.mask(**filters) if filters else None
+                matching = size if mask is None else int(mask.sum())
+
+                pushdown = []
+                for query in queries:
+                    start = time.perf_counter()
+                    mask = corpus.mask(**filters) if filters else None
+                    corpus.search(query, k=k, mask=mask)
+                    pushdown.append(time.perf_counter() - start)
+
+                # Baseline: score everything, then drop rows that fail the filters
+                post_filter = []
+                for query in queries:
+                    start = time.perf_counter()
+                    scores = corpus.vectors @ query
+                    order = np.argsort(-scores)
+                    if filters:
+                        order = order[corpus.mask(**filters)[order]]
+                    corpus.ids[order[:k]]
+                    post_filter.append(time.perf_counter() - start)
+
+                self.stdout.write(
+                    f"{size:>9} {name:<12} {matching:>9} {self._p50(pushdown):>12.2f} "
+                    f"{self._p50(post_filter):>15.2f}"
+                )
+
+    def _corpus(self, size, dim, symbol_count, source_count):
+        """Synthetic corpus with Zipf-like ticker popularity and a year of dates"""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((size, dim), dtype=np.float32)
+        ids = np.arange(1, size + 1)
+        source_ids = rng.integers(1, source_count + 1, size=size)
+        now = datetime.now(timezone.utc).timestamp()
+        published_at = now - rng.uniform(0, 365 * 86400, size=size)
+
+        weights = 1.0 / np.arange(1, symbol_count + 1)
+        tickers = rng.choice(symbol_count, size=size * 2, p=weights / weights.sum())
+        rows = np.repeat(np.arange(size), 2)
+        symbol_rows = {f'SYM{t + 1}': rows[tickers == t] for t in np.unique(tickers)}
+
+        categories = ['earnings', 'markets', 'economy', 'technology', 'mergers']
+        assigned = rng.integers(len(categories), size=size)
+        category_rows = {name: np.flatnonzero(assigned == i) for i, name in enumerate(categories)}
+        return SimilarityCorpus(ids, vectors, source_ids, published_at, symbol_rows, category_rows)
+
+    def _p50(self, latencies):
+        return float(np.percentile(np.asarray(latencies) * 1000, 50))
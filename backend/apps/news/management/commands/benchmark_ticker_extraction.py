@@ -0,0 +1,88 @@
+import random
+import re
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from apps.news.tickers import TickerExtractor, load_ticker_extractor
+from apps.news.validators import NewsDataValidator
+
+# {symbol} is replaced by a ticker the article is about
+MENTION_SENTENCES = [
+    'Shares of {symbol} rose 3.2% in early trading after the results.',
+    'Analysts raised their price target on ${symbol} to $220.',
+    'The company (NASDAQ: {symbol}) reported Q3 EPS of $1.46, ahead of estimates.',
+    '{symbol} said its CEO will present at the conference in New York.',
+]
+# Upper-case words every financial story is full of, none of them tickers
+FILLER_SENTENCES = [
+    'The CEO told CNBC that US demand for AI chips remained strong through Q2.',
+    'The SEC and the FED are expected to comment before the IPO window reopens.',
+    'GDP growth slowed to 2.1% while the CPI print came in hot, said an ETF strategist.',
+    'I think the EU rules on ESG reporting will weigh on EBITDA margins, the CFO said.',
+    'Revenue grew 12% year over year as the company expanded into new markets.',
+    'Investors are watching guidance for the second half, according to people familiar with the matter.',
+]
+
+class Command(BaseCommand):
+    help = 'Compare ticker extraction throughput and mention counts against the previous regex'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        extractor = load_ticker_extractor()
+        symbols = sorted(extractor.bare_symbols) or ['AAPL', 'MSFT', 'NVDA']
+        raw, planted = _corpus(options['articles'], symbols)
+        # What ingestion actually extracts from: content after clean_text
+        cleaned = NewsDataValidator.clean_many(raw)
+        megabytes = sum(len(text.encode()) for text in raw) / 1e6
+        self.stdout.write(f"{len(raw)} articles, {megabytes:.1f} MB; universe of {len(extractor.symbols)} tickers")
+
+        self.stdout.write(
+            f"{'extractor':<22} {'text':<8} {'MB/s':>7} {'mentions':>9} {'planted':>8} {'other':>7}"
+        )
+        extractors = {
+            'previous regex': _previous_extract,
+            'universe': extractor.extract,
+            'universe + contexts': extractor.contexts,
+            'cashtags only': TickerExtractor().extract,
+        }
+        for name, extract in extractors.items():
+            for label, texts in (('raw', raw), ('cleaned', cleaned)):
+                seconds = min(_seconds(lambda: [extract(text) for text in texts]) for _ in range(options['repeat']))
+                found = [set(extract(text)) for text in texts]
+                mentions = sum(len(symbols) for symbols in found)
+                hits = sum(len(symbols & expected) for symbols, expected in zip(found, planted))
+                self.stdout.write(
+                    f"{name:<22} {label:<8} {megabytes / seconds:>7.1f} {mentions:>9} {hits:>8} {mentions - hits:>7}"
+                )
+
+def _previous_extract(text):
+    """extract_stock_mentions as it was before the ticker universe"""
+    symbols = set()
+    for match in re.finditer(r'\$[A-Z]{1,5}|[A-Z]{1,5}', text):
+        try:
+            symbols.add(NewsDataValidator.validate_stock_symbol(match.group()))
+        except ValidationError:
+            continue
+    return list(symbols)
+
+def _corpus(count, symbols):
+    """Articles about one or two tickers, padded with acronym-heavy filler"""
+    rng = random.Random(0)
+    texts, planted = [], []
+    for _ in range(count):
+        about = rng.sample(symbols, rng.randint(1, 2))
+        sentences = rng.choices(FILLER_SENTENCES, k=rng.randint(20, 40))
+        for symbol in about:
+            for sentence in rng.sample(MENTION_SENTENCES, 2):
+                sentences.insert(rng.randrange(len(sentences) + 1), sentence.format(symbol=symbol))
+        texts.append(' '.join(sentences))
+        planted.append(set(about))
+    return texts, planted
+
+def _seconds(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
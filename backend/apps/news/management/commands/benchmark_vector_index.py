@@ -0,0 +1,70 @@
+import tempfile
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from apps.news.vector_index import LocalVectorIndex
+
+class Command(BaseCommand):
+    help = 'Compare LocalVectorIndex recall and latency with brute-force NumPy search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--dim', type=int, default=384)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--nprobe', type=int, nargs='+', default=[8, 16, 32])
+
+    def handle(self, *args, **options):
+        dim, k = options['dim'], options['k']
+        self.stdout.write(
+            f"{'vectors':>9} {'method':<14} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8} {'recall@' + str(k):>10}"
+        )
+        for size in options['sizes']:
+            vectors, queries = self._dataset(size, dim, options['queries'])
+            ids = np.arange(1, size + 1)
+
+            # Exact answers from a single matmul + argpartition per query
+            exact, latencies = [], []
+            for query in queries:
+                start = time.perf_counter()
+                scores = vectors @ query
+                top = np.argpartition(-scores, k - 1)[:k]
+                latencies.append(time.perf_counter() - start)
+                exact.append(set(ids[top].tolist()))
+            self._report(size, 'brute-force', 0.0, latencies, 1.0)
+
+            with tempfile.TemporaryDirectory() as path:
+                vector_index = LocalVectorIndex(path=path, dim=dim)
+                start = time.perf_counter()
+                vector_index.rebuild(ids, vectors)
+                build_seconds = time.perf_counter() - start
+
+                for nprobe in options['nprobe']:
+                    vector_index.nprobe = nprobe
+                    hits, latencies = 0, []
+                    for query, expected in zip(queries, exact):
+                        start = time.perf_counter()
+                        results = vector_index.search(query, k=k)
+                        latencies.append(time.perf_counter() - start)
+                        hits += len(expected & {article_id for article_id, _ in results})
+                    recall = hits / (k * len(queries))
+                    self._report(size, f'ivf nprobe={nprobe}', build_seconds, latencies, recall)
+
+    def _dataset(self, size, dim, query_count):
+        """Clustered unit vectors, closer to real embeddings than uniform noise"""
+        rng = np.random.default_rng(0)
+        centers = rng.standard_normal((max(1, size // 1000), dim), dtype=np.float32)
+        vectors = centers[rng.integers(len(centers), size=size)]
+        vectors += 0.5 * rng.standard_normal((size, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = vectors[rng.choice(size, query_count, replace=False)]
+        queries = queries + 0.1 * rng.standard_normal(queries.shape, dtype=np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        return vectors, queries
+
+    def _report(self, size, method, build_seconds, latencies, recall):
+        latencies_ms = np.asarray(latencies) * 1000
+        self.stdout.write(
+            f"{size:>9} {method:<14} {build_seconds:>8.1f} {np.percentile(latencies_ms, 50):>8.2f} "
+            f"{np.percentile(latencies_ms, 99):>8.2f} {recall:>10.3f}"
+        )
@@ -0,0 +1,129 @@
+import re
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.news.models import ArticleCategory, NewsArticle, NewsCategory, NewsSource, StockMention
+from apps.news.views import ArticleCategoryViewSet, NewsArticleViewSet, StockMentionViewSet
+
+# Plan lines that mean a whole table is read
+FULL_SCAN = {
+    'sqlite': re.compile(r'^SCAN (\w+)$'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the queries behind the news list endpoints and the reprocessing task, '
+        'and report which indexes they use. Run it against a database with '
+        'production-like data: planners pick indexes from table statistics.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plans', action='store_true', help='Print each full query plan')
+
+    def handle(self, *args, **options):
+        models = [NewsArticle, StockMention, ArticleCategory, NewsCategory, NewsSource]
+        declared = {index.name: model._meta.label for model in models for index in model._meta.indexes}
+        known = set(declared)
+        with connection.cursor() as cursor:
+            for model in models:
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                known.update(name for name, info in constraints.items() if info['index'])
+        # Longest first, so a name is never reported because it prefixes another
+        patterns = {
+            name: re.compile(rf"\b{re.escape(name)}\b")
+            for name in sorted(known, key=len, reverse=True)
+        }
+        full_scan = FULL_SCAN.get(connection.vendor)
+
+        used = set()
+        for label, queries in self._captured_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            for sql in queries:
+                plan = self._explain(sql)
+                names = [name for name, pattern in patterns.items() if pattern.search(plan)]
+                if 'PRIMARY KEY' in plan:
+                    # SQLite's rowid lookups name no index
+                    names.append('primary key')
+                used.update(names)
+                scans = sorted({
+                    match.group(1) for line in plan.splitlines()
+                    if full_scan and (match := full_scan.search(line.strip()))
+                })
+                summary = ', '.join(names) or 'no index'
+                if scans:
+                    summary += self.style.WARNING(f"; full scan of {', '.join(scans)}")
+                self.stdout.write(f"  {_abbreviate(sql)}\n    {summary}")
+                if options['plans']:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        unused = sorted(set(declared) - used)
+        if unused:
+            self.stdout.write(self.style.WARNING(
+                'Declared indexes no reported query used: '
+                + ', '.join(f"{name} ({declared[name]})" for name in unused)
+            ))
+
+    def _captured_queries(self):
+        """``(label, [sql, ...])`` for every request and task query the report covers"""
+        factory = APIRequestFactory()
+        user = get_user_model()(username='index-report')
+        symbol = (
+            StockMention.objects.values('symbol').annotate(mentions=Count('id'))
+            .order_by('-mentions').values_list('symbol', flat=True).first() or 'AAPL'
+        )
+        category = NewsCategory.objects.values_list('id', 'name').first()
+        source_id = NewsSource.objects.values_list('id', flat=True).first()
+        article_id = NewsArticle.objects.values_list('id', flat=True).first()
+
+        endpoints = [
+            (NewsArticleViewSet, '/api/news/articles/', [
+                {}, {'ordering': 'created_at'}, {'ordering': '-sentiment_score'},
+                {'min_sentiment': '0.5'}, {'is_processed': 'false'}, {'symbol': symbol},
+            ]),
+            (StockMentionViewSet, '/api/news/stock-mentions/', [
+                {}, {'symbol': symbol}, {'ordering': 'sentiment_score'},
+            ]),
+            (ArticleCategoryViewSet, '/api/news/article-categories/', [{}]),
+        ]
+        if source_id is not None:
+            endpoints[0][2].append({'source': source_id})
+        if category is not None:
+            endpoints[0][2].append({'category': category[1]})
+            endpoints[2][2].append({'category': category[0]})
+        if article_id is not None:
+            endpoints[1][2].append({'article': article_id})
+
+        # Response caching would hide the queries on repeat requests, and
+        # throttling is not what is being measured
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            for viewset, path, cases in endpoints:
+                view = viewset.as_view({'get': 'list'}, throttle_classes=[])
+                for params in cases:
+                    request = factory.get(path, params)
+                    force_authenticate(request, user)
+                    with CaptureQueriesContext(connection) as context:
+                        view(request)
+                    yield request.get_full_path(), _selects(context)
+
+        with CaptureQueriesContext(connection) as context:
+            list(NewsArticle.objects.unprocessed()[:100])
+        yield 'tasks.reprocess_failed_articles', _selects(context)
+
+    def _explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+            # SQLite returns (id, parent, notused, detail); PostgreSQL one text column
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+def _selects(context):
+    return [query['sql'] for query in context.captured_queries if query['sql'].lstrip().upper().startswith('SELECT')]
+
+def _abbreviate(sql, width=110):
+    """The FROM clause onwards, which is what decides the plan"""
+    position = sql.upper().find(' FROM ')
+    sql = sql[position + 1:] if position >= 0 else sql
+    return sql if len(sql) <= width else f"{sql[:width - 3]}..."
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from apps.news.models import NewsArticle
+from apps.news.search import ContainsSearchBackend, get_search_backend
+
+class Command(BaseCommand):
+    help = 'Recompute the stored search data for every article, e.g. after enabling full-text search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if isinstance(backend, ContainsSearchBackend):
+            self.stdout.write(f"{type(backend).__name__} stores nothing; nothing to do")
+            return
+
+        ids = NewsArticle.objects.order_by('id').values_list('id', flat=True)
+        batch, updated = [], 0
+        for article_id in ids.iterator(chunk_size=options['batch_size']):
+            batch.append(article_id)
+            if len(batch) == options['batch_size']:
+                backend.update(batch)
+                updated += len(batch)
+                batch = []
+        backend.update(batch)
+        updated += len(batch)
+        self.stdout.write(f"Updated search data for {updated} articles")
@@ -0,0 +1,28 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from apps.news.models import NewsArticle
+from apps.news.vector_index import get_vector_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the vector index from the embeddings stored on articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        vector_index = get_vector_index()
+        if not hasattr(vector_index, 'rebuild'):
+            self.stdout.write(f"{type(vector_index).__name__} manages its own storage; nothing to do")
+            return
+
+        ids, vectors = [], []
+        rows = NewsArticle.objects.with_embeddings().filter(
+            embedding_vector__isnull=False
+        ).values_list('id', 'embedding_vector')
+        for article_id, vector in rows.iterator(chunk_size=options['chunk_size']):
+            ids.append(article_id)
+            vectors.append(vector)
+
+        dim = getattr(vector_index, 'dim', 0)
+        vector_index.rebuild(ids, np.asarray(vectors, dtype=np.float32).reshape(len(ids), dim))
+        self.stdout.write(f"Indexed {len(ids)} article embeddings")
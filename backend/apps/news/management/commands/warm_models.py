@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from apps.news.model_registry import registry
+
+class Command(BaseCommand):
+    help = 'Load the registered ML models and report load time and memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Models to load (default: all)')
+
+    def handle(self, *args, **options):
+        stats = registry.warm(options['names'] or None)
+        self.stdout.write(f"{'model':<20} {'seconds':>9} {'rss MB':>9}")
+        for name, model_stats in stats.items():
+            self.stdout.write(
+                f"{name:<20} {model_stats['load_seconds']:>9.2f} {model_stats['rss_delta_mb']:>9.1f}"
+            )
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+import apps.news.fields
+from apps.news.fields import encode_vector
+
+BATCH_SIZE = 1000
+
+def json_to_binary(apps, schema_editor):
+    NewsArticle = apps.get_model('news', 'NewsArticle')
+    rows = NewsArticle.objects.filter(
+        embedding_vector__isnull=False
+    ).values_list('id', 'embedding_vector')
+    batch = []
+    for article_id, vector in rows.iterator(chunk_size=BATCH_SIZE):
+        # JSON null is not SQL NULL, so empty vectors can still show up here
+        if not vector:
+            continue
+        batch.append(NewsArticle(id=article_id, embedding_blob=encode_vector(vector)))
+        if len(batch) >= BATCH_SIZE:
+            NewsArticle.objects.bulk_update(batch, ['embedding_blob'])
+            batch = []
+    NewsArticle.objects.bulk_update(batch, ['embedding_blob'])
+
+def binary_to_json(apps, schema_editor):
+    NewsArticle = apps.get_model('news', 'NewsArticle')
+    rows = NewsArticle.objects.filter(
+        embedding_blob__isnull=False
+    ).values_list('id', 'embedding_blob')
+    batch = []
+    for article_id, vector in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(NewsArticle(id=article_id, embedding_vector=[float(value) for value in vector]))
+        if len(batch) >= BATCH_SIZE:
+            NewsArticle.objects.bulk_update(batch, ['embedding_vector'])
+            batch = []
+    NewsArticle.objects.bulk_update(batch, ['embedding_vector'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='embedding_blob',
+            field=apps.news.fields.VectorField(blank=True, null=True),
+        ),
+        migrations.RunPython(json_to_binary, binary_to_json),
+        migrations.RemoveField(
+            model_name='newsarticle',
+            name='embedding_vector',
+        ),
+        migrations.RenameField(
+            model_name='newsarticle',
+            old_name='embedding_blob',
+            new_name='embedding_vector',
+        ),
+    ]
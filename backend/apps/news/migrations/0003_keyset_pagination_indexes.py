@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_binary_embedding_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['published_at', 'id'], name='news_article_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmention',
+            index=models.Index(fields=['created_at', 'id'], name='news_mention_created_idx'),
+        ),
+    ]
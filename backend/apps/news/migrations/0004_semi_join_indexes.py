@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlecategory',
+            index=models.Index(fields=['category', 'article'], name='news_category_article_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmention',
+            index=models.Index(fields=['symbol', 'article'], name='news_mention_symbol_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_semi_join_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['created_at', 'id'], name='news_article_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['sentiment_score', 'id'], name='news_article_sentiment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['source', 'published_at', 'id'], name='news_article_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['created_at'], name='news_article_unprocessed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmention',
+            index=models.Index(fields=['sentiment_score', 'id'], name='news_mention_sentiment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmention',
+            index=models.Index(fields=['symbol', 'created_at', 'id'], name='news_mention_timeline_idx'),
+        ),
+    ]
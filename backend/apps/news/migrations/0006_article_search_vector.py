@@ -0,0 +1,31 @@
+from django.db import migrations
+
+import apps.news.fields
+
+# GIN indexes only exist on PostgreSQL, where search_vector is a tsvector;
+# elsewhere the column stays empty and search uses icontains
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS news_article_search_idx '
+            'ON news_newsarticle USING gin (search_vector)'
+        )
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS news_article_search_idx')
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='search_vector',
+            field=apps.news.fields.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_article_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='extraction_rules',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
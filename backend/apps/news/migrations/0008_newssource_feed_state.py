@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_newssource_extraction_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_etag',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_last_modified',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
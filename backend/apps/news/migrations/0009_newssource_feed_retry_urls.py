@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_newssource_feed_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_retry_urls',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_newssource_feed_retry_urls'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['updated_at'], name='news_article_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmention',
+            index=models.Index(fields=['updated_at'], name='news_mention_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecategory',
+            index=models.Index(fields=['updated_at'], name='news_category_link_updated_idx'),
+        ),
+    ]
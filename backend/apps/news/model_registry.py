@@ -0,0 +1,134 @@
+import logging
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """
+    Process-wide registry of lazily loaded ML models.
+
+    Each registered loader runs at most once per process, the first time its
+    model is requested (or when the registry is warmed), and the loaded object
+    is shared by every service, task and view in that process.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a zero-argument loader under ``name``"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the model registered as ``name``, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+            return model
+
+    def _load(self, name: str) -> Any:
+        try:
+            loader = self._loaders[name]
+        except KeyError:
+            raise KeyError(f"No model registered as '{name}'")
+
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        model = loader()
+        load_seconds = time.perf_counter() - start
+        rss_delta = max(_rss_bytes() - rss_before, 0)
+
+        self._models[name] = model
+        self._stats[name] = {
+            'load_seconds': round(load_seconds, 3),
+            'rss_delta_mb': round(rss_delta / (1024 * 1024), 1),
+        }
+        logger.info(
+            f"Loaded model '{name}' in {load_seconds:.2f}s "
+            f"(+{self._stats[name]['rss_delta_mb']} MB RSS, pid {os.getpid()})"
+        )
+        return model
+
+    def warm(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Load the given (default: all) models now and return their stats"""
+        for name in names or list(self._loaders):
+            self.get(name)
+        return self.stats()
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Load time and resident memory growth for each loaded model"""
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        """Drop loaded models so the next ``get`` reloads them"""
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+
+def _rss_bytes() -> int:
+    """Current resident set size, falling back to the peak where unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is reported in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _load_ml_utils():
+    if settings.NEWS_ML_STUB_MODELS:
+        from .stub_models import StubMLUtils
+        return StubMLUtils()
+
+    from .ml_utils import MLUtils
+    return MLUtils()
+
+def _load_vector_index():
+    from .vector_index import load_vector_index
+    return load_vector_index()
+
+def _load_similarity_engine():
+    from .similarity import SimilarityEngine
+    return SimilarityEngine()
+
+def _load_search_backend():
+    from .search import load_search_backend
+    return load_search_backend()
+
+def _load_ticker_extractor():
+    from .tickers import load_ticker_extractor
+    return load_ticker_extractor()
+
+def _load_extractor():
+    from .extraction import load_extractor
+    return load_extractor()
+
+registry = ModelRegistry()
+registry.register('ml_utils', _load_ml_utils)
+registry.register('vector_index', _load_vector_index)
+registry.register('similarity_engine', _load_similarity_engine)
+registry.register('search_backend', _load_search_backend)
+registry.register('ticker_extractor', _load_ticker_extractor)
+registry.register('extractor', _load_extractor)
+
+def get_ml_utils():
+    """Shared MLUtils instance for the current process"""
+    return registry.get('ml_utils')
@@ -1,7 +1,9 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
+from .fields import SearchVectorField, VectorField
 from .validators import NewsDataValidator
 
 class NewsSource(models.Model):
@@ -10,6 +12,16 @@ class NewsSource(models.Model):
     url = models.URLField()
     description = models.TextField(blank=True)
     active = models.BooleanField(default=True)
+    # Per-field CSS/XPath selectors for this site's article pages, e.g.
+    # {"content": "div.story-body", "remove": [".inline-promo"]}
+    extraction_rules = models.JSONField(default=dict, blank=True)
+    # RSS, Atom or sitemap URL, found from the home page when left blank,
+    # and the validators it last returned (see apps.news.discovery)
+    feed_url = models.URLField(blank=True)
+    feed_etag = models.CharField(max_length=255, blank=True)
+    feed_last_modified = models.CharField(max_length=64, blank=True)
+    # Article URLs whose fetch or save failed, with the number of failed runs
+    feed_retry_urls = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,13 +31,17 @@ class NewsSource(models.Model):
             'name': self.name,
             'url': self.url,
             'description': self.description,
-            'active': self.active
+            'active': self.active,
+            'feed_url': self.feed_url,
+            'extraction_rules': self.extraction_rules
         }
         cleaned_data = NewsDataValidator.validate_source_data(data)
         self.name = cleaned_data['name']
         self.url = cleaned_data['url']
         self.description = cleaned_data['description']
         self.active = cleaned_data['active']
+        self.feed_url = cleaned_data['feed_url']
+        self.extraction_rules = cleaned_data['extraction_rules']
 
     def save(self, *args, **kwargs):
         self.clean()
@@ -34,6 +50,46 @@ class NewsSource(models.Model):
     def __str__(self):
         return self.name
 
+class NewsArticleQuerySet(models.QuerySet):
+    """QuerySet for articles"""
+
+    def with_embeddings(self):
+        """
+        Load embedding vectors, which are deferred by default.
+
+        Starts the deferred fields over (search vectors stay deferred), so
+        call it before ``only()`` or ``defer()``.
+        """
+        return self.defer(None).defer('search_vector')
+
+    def mentioning(self, symbol: str):
+        """
+        Articles that mention ``symbol``.
+
+        A semi-join (``EXISTS``) rather than a join, so an article that
+        mentions the symbol twice still comes back once without a
+        ``DISTINCT`` over whole article rows.
+        """
+        return self.filter(Exists(
+            StockMention.objects.filter(article=OuterRef('pk'), symbol=symbol)
+        ))
+
+    def in_category(self, name: str):
+        """Articles assigned to the category called ``name``"""
+        return self.filter(Exists(
+            ArticleCategory.objects.filter(article=OuterRef('pk'), category__name=name)
+        ))
+
+    def unprocessed(self):
+        """Articles still waiting for processing, newest first"""
+        return self.filter(is_processed=False).order_by('-created_at')
+
+class NewsArticleManager(models.Manager.from_queryset(NewsArticleQuerySet)):
+    """Manager that never pulls embedding or search vectors into list queries"""
+
+    def get_queryset(self):
+        return super().get_queryset().defer('embedding_vector', 'search_vector')
+
 class NewsArticle(models.Model):
     """Model for storing financial news articles"""
     title = models.CharField(max_length=500)
@@ -44,11 +100,32 @@ class NewsArticle(models.Model):
     author = models.CharField(max_length=100, blank=True)
     summary = models.TextField(blank=True)
     sentiment_score = models.FloatField(null=True, blank=True)
-    embedding_vector = models.JSONField(null=True, blank=True)
+    embedding_vector = VectorField(null=True, blank=True)
+    # Maintained by the search backend (see apps.news.search), not by save()
+    search_vector = SearchVectorField()
     is_processed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = NewsArticleManager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks (ordering field, id) for each ordering_fields entry
+            models.Index(fields=['published_at', 'id'], name='news_article_published_idx'),
+            models.Index(fields=['created_at', 'id'], name='news_article_created_idx'),
+            models.Index(fields=['sentiment_score', 'id'], name='news_article_sentiment_idx'),
+            # ?source= feeds in the default order
+            models.Index(fields=['source', 'published_at', 'id'], name='news_article_source_idx'),
+            # Unprocessed articles are a small, shrinking slice; reprocess_failed_articles
+            # takes the newest of them
+            models.Index(
+                fields=['created_at'], condition=Q(is_processed=False), name='news_article_unprocessed_idx'
+            ),
+            # Newest change, for the similarity corpus's freshness check
+            models.Index(fields=['updated_at'], name='news_article_updated_idx'),
+        ]
+
     def clean(self):
         """Validate article data"""
         data = {
@@ -81,6 +158,17 @@ class StockMention(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='news_mention_created_idx'),
+            models.Index(fields=['sentiment_score', 'id'], name='news_mention_sentiment_idx'),
+            # Serves the EXISTS lookups behind NewsArticle.objects.mentioning()
+            models.Index(fields=['symbol', 'article'], name='news_mention_symbol_idx'),
+            # Per-ticker timelines (?symbol= in the default order)
+            models.Index(fields=['symbol', 'created_at', 'id'], name='news_mention_timeline_idx'),
+            models.Index(fields=['updated_at'], name='news_mention_updated_idx'),
+        ]
+
     def clean(self):
         """Validate stock mention data"""
         self.symbol = NewsDataValidator.validate_stock_symbol(self.symbol)
@@ -127,6 +215,11 @@ class ArticleCategory(models.Model):
     class Meta:
         verbose_name_plural = "article categories"
         unique_together = ['article', 'category']
+        indexes = [
+            # The unique constraint leads with article; category filters need this order
+            models.Index(fields=['category', 'article'], name='news_category_article_idx'),
+            models.Index(fields=['updated_at'], name='news_category_link_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.article.title} - {self.category.name}" 
\ No newline at end of file
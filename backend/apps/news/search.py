@@ -0,0 +1,131 @@
+import logging
+import re
+from typing import Iterable, List
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+logger = logging.getLogger(__name__)
+
+# Annotation holding each match's relevance; higher is better
+SEARCH_RANK = 'search_rank'
+
+class BaseSearchBackend:
+    """Interface for article full-text search"""
+
+    def search(self, queryset, terms: List[str]):
+        """
+        Restrict ``queryset`` to articles matching every term, annotated
+        with ``SEARCH_RANK``. Returning None leaves the search to DRF's
+        substring matching.
+        """
+        raise NotImplementedError
+
+    def update(self, ids: Iterable[int]) -> None:
+        """Recompute the stored search data for the given article IDs"""
+
+class ContainsSearchBackend(BaseSearchBackend):
+    """DRF's ``icontains`` search: nothing stored, nothing ranked"""
+
+    def search(self, queryset, terms: List[str]):
+        return None
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL full-text search over ``NewsArticle.search_vector``.
+
+    The vector is computed when articles are written, weighting the title
+    above the summary and author and those above the body, and sits behind
+    a GIN index. Every search word matches as a prefix ("earn" finds
+    "earnings"), and results are ranked with ``ts_rank``.
+    """
+
+    def __init__(self, config: str = None):
+        self.config = config or settings.NEWS_SEARCH_CONFIG
+
+    def vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return (
+            SearchVector('title', weight='A', config=self.config)
+            + SearchVector('summary', 'author', weight='B', config=self.config)
+            + SearchVector('content', weight='C', config=self.config)
+        )
+
+    def query(self, terms: List[str]):
+        from django.contrib.postgres.search import SearchQuery
+
+        words = [word for term in terms for word in re.findall(r'\w+', term)]
+        if not words:
+            return None
+        return SearchQuery(
+            ' & '.join(f"{word}:*" for word in words), search_type='raw', config=self.config
+        )
+
+    def search(self, queryset, terms: List[str]):
+        from django.contrib.postgres.search import SearchRank
+
+        query = self.query(terms)
+        if query is None:
+            return None
+        # ts_rank returns a float4; as a double the rank survives the round
+        # trip through a pagination cursor and compares equal to itself
+        rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+        return queryset.filter(search_vector__matches=query).annotate(**{SEARCH_RANK: rank})
+
+    def update(self, ids: Iterable[int]) -> None:
+        from .models import NewsArticle
+
+        NewsArticle.objects.filter(pk__in=list(ids)).update(search_vector=self.vector())
+
+SEARCH_BACKENDS = {
+    'icontains': ContainsSearchBackend,
+    'postgres': PostgresSearchBackend,
+}
+
+def load_search_backend() -> BaseSearchBackend:
+    """
+    Build the backend named by NEWS_SEARCH_BACKEND (a key or dotted path).
+
+    ``'auto'`` picks full-text search on PostgreSQL and ``icontains``
+    elsewhere.
+    """
+    backend = settings.NEWS_SEARCH_BACKEND
+    if backend == 'auto':
+        backend = 'postgres' if connections['default'].vendor == 'postgresql' else 'icontains'
+    backend_class = SEARCH_BACKENDS.get(backend) or import_string(backend)
+    return backend_class()
+
+def get_search_backend() -> BaseSearchBackend:
+    """Shared search backend for the current process"""
+    from .model_registry import registry
+    return registry.get('search_backend')
+
+def update_search_index(ids: Iterable[int]) -> None:
+    """Refresh search data after articles are written; search falls back to stale data if this fails"""
+    ids = list(ids)
+    try:
+        get_search_backend().update(ids)
+    except Exception as e:
+        logger.error(f"Error updating search data for articles {ids}: {str(e)}")
+
+class ArticleSearchFilter(SearchFilter):
+    """
+    ``?search=`` through the configured search backend.
+
+    Matches are annotated with ``SEARCH_RANK``; ``KeysetPagination`` orders
+    by it unless the request asks for another ordering. Backends that do
+    not index anything leave the view's ``search_fields`` to DRF.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        results = get_search_backend().search(queryset, terms)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results
@@ -1,5 +1,8 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from apps.api.serializers import SparseFieldsetMixin
 from .models import NewsSource, NewsArticle, StockMention, NewsCategory, ArticleCategory
+from .validators import NewsDataValidator
 
 class NewsCategorySerializer(serializers.ModelSerializer):
     """Serializer for NewsCategory model"""
@@ -27,7 +30,18 @@ class NewsSourceSerializer(serializers.ModelSerializer):
         model = NewsSource
         fields = ['id', 'name', 'url', 'description', 'active', 'created_at', 'updated_at']
 
-class NewsArticleSerializer(serializers.ModelSerializer):
+class NewsSourceConfigSerializer(NewsSourceSerializer):
+    """NewsSource with its feed and extraction rules, for managing sources"""
+    class Meta(NewsSourceSerializer.Meta):
+        fields = NewsSourceSerializer.Meta.fields + ['feed_url', 'extraction_rules']
+
+    def validate_extraction_rules(self, value):
+        try:
+            return NewsDataValidator.validate_extraction_rules(value)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+
+class NewsArticleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for NewsArticle model"""
     source = NewsSourceSerializer(read_only=True)
     stock_mentions = StockMentionSerializer(many=True, read_only=True)
@@ -42,6 +56,33 @@ class NewsArticleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['summary', 'sentiment_score', 'is_processed']
 
+class NewsArticleListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact NewsArticle representation for feeds.
+
+    Leaves out ``content`` and the nested relations unless asked for with
+    ``?expand=content,stock_mentions,categories,source`` (``source`` is an
+    ID until expanded), or picked with ``?fields=``.
+    """
+    stock_mentions = StockMentionSerializer(many=True, read_only=True)
+    categories = ArticleCategorySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = NewsArticle
+        fields = [
+            'id', 'title', 'content', 'url', 'source', 'published_at',
+            'author', 'summary', 'sentiment_score', 'is_processed',
+            'stock_mentions', 'categories', 'created_at', 'updated_at'
+        ]
+        default_fields = [
+            'id', 'title', 'url', 'source', 'published_at', 'author',
+            'summary', 'sentiment_score', 'is_processed', 'updated_at'
+        ]
+        expandable_fields = {
+            'source': (NewsSourceSerializer, {'read_only': True}),
+        }
+        read_only_fields = fields
+
 class NewsArticleCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating NewsArticle"""
     source_id = serializers.IntegerField(write_only=True)
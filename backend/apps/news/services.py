@@ -1,14 +1,22 @@
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
-import requests
-from bs4 import BeautifulSoup
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from django.conf import settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from .models import NewsSource, NewsArticle, StockMention, NewsCategory, ArticleCategory
-from .ml_utils import MLUtils
+from .batching import batched_map
+from .discovery import FEED_VALIDATOR_FIELDS, FeedDiscovery
+from .extraction import get_extractor
+from .fetchers import ConcurrentFetcher
+from .model_registry import get_ml_utils
+from .search import update_search_index
+from .tickers import get_ticker_extractor
 from .validators import NewsDataValidator
+from .vector_index import get_vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -16,89 +24,165 @@ class NewsIngestionService:
     """Service for ingesting and processing news articles"""
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        self.ml_utils = MLUtils()
+        self.fetcher = ConcurrentFetcher()
+        self.discovery = FeedDiscovery(self.fetcher)
 
-    def fetch_article(self, url: str) -> Dict[str, Any]:
+    @property
+    def ml_utils(self):
+        """Process-wide MLUtils, loaded on first use"""
+        return get_ml_utils()
+
+    def fetch_article(self, url: str, source: Optional[NewsSource] = None) -> Dict[str, Any]:
         """Fetch article content from URL"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract article content (customize based on source)
-            title = soup.find('h1').text.strip() if soup.find('h1') else ''
-            content = ' '.join([p.text.strip() for p in soup.find_all('p')])
-            author = soup.find('meta', {'name': 'author'})
-            author = author['content'] if author else ''
+            response = self.fetcher.get(url)
+            return self.parse_article(url, response.text, source=source)
+        except Exception as e:
+            logger.error(f"Error fetching article from {url}: {str(e)}")
+            raise
+
+    def parse_article(self, url: str, html: str, source: Optional[NewsSource] = None) -> Dict[str, Any]:
+        """
+        Extract and validate article data from downloaded HTML, using the
+        source's extraction rules where it has them
+        """
+        try:
+            rules = source.extraction_rules if source is not None else None
+            data = get_extractor().extract(html, rules)
+            data['url'] = url
+
+            # A page date that does not parse is no reason to lose the
+            # article; it is dated now instead, as before extraction found dates
+            if data.get('published_at'):
+                try:
+                    data['published_at'] = NewsDataValidator.validate_date(
+                        data['published_at'], source=urlsplit(url).netloc
+                    )
+                except ValidationError:
+                    logger.warning(f"Unparseable date {data['published_at']!r} on {url}")
+                    data['published_at'] = ''
             
             # Clean and validate data
-            data = {
-                'title': title,
-                'content': content,
-                'author': author,
-                'url': url
-            }
             return NewsDataValidator.validate_article_data(data)
             
         except Exception as e:
-            logger.error(f"Error fetching article from {url}: {str(e)}")
+            logger.error(f"Error parsing article from {url}: {str(e)}")
             raise
 
     def extract_stock_mentions(self, content: str) -> List[str]:
         """Extract stock symbols from content"""
         return NewsDataValidator.extract_stock_mentions(content)
 
-    @transaction.atomic
+    def extract_mention_contexts(self, content: str) -> Dict[str, str]:
+        """Stock symbols in content, each with the text around its first mention"""
+        return get_ticker_extractor().contexts(content)
+
     def process_article(self, source: NewsSource, article_data: Dict[str, Any]) -> NewsArticle:
         """Process and save article"""
+        return self.process_articles(source, [article_data])[0]
+
+    @transaction.atomic
+    def process_articles(self, source: NewsSource, articles_data: List[Dict[str, Any]]) -> List[NewsArticle]:
+        """
+        Process and save a batch of articles.
+
+        Articles are upserted on ``url`` with a single ``bulk_create`` and all
+        new stock mentions for the batch are written with one more, so the
+        number of queries does not grow with the batch size.
+        """
+        if not articles_data:
+            return []
+
         try:
-            # Create or update article
-            article, created = NewsArticle.objects.update_or_create(
-                url=article_data['url'],
-                defaults={
-                    'title': article_data['title'],
-                    'content': article_data['content'],
-                    'source': source,
-                    'author': article_data.get('author', ''),
-                    'published_at': article_data.get('published_at', timezone.now())
-                }
+            # Later entries win when a batch contains the same URL twice
+            articles_by_url = {data['url']: data for data in articles_data}
+            now = timezone.now()
+            articles = [
+                NewsArticle(
+                    url=url,
+                    title=data['title'],
+                    content=data['content'],
+                    source=source,
+                    author=data.get('author', ''),
+                    published_at=data.get('published_at') or now
+                )
+                for url, data in articles_by_url.items()
+            ]
+            NewsArticle.objects.bulk_create(
+                articles,
+                update_conflicts=True,
+                unique_fields=['url'],
+                update_fields=['title', 'content', 'source', 'author', 'published_at', 'updated_at']
             )
 
-            # Extract and save stock mentions
-            stock_symbols = self.extract_stock_mentions(article_data['content'])
-            for symbol in stock_symbols:
-                StockMention.objects.get_or_create(
-                    article=article,
-                    symbol=symbol,
-                    defaults={'context': ''}
+            # Not every backend returns primary keys for upserted rows
+            if any(article.pk is None for article in articles):
+                ids = dict(
+                    NewsArticle.objects.filter(url__in=articles_by_url).values_list('url', 'id')
                 )
+                for article in articles:
+                    article.pk = ids[article.url]
+
+            # Extract and save stock mentions, skipping ones already stored
+            existing = set(
+                StockMention.objects.filter(
+                    article__in=articles
+                ).values_list('article_id', 'symbol')
+            )
+            mentions = [
+                StockMention(article=article, symbol=symbol, context=context)
+                for article in articles
+                for symbol, context in self.extract_mention_contexts(article.content).items()
+                if (article.pk, symbol) not in existing
+            ]
+            StockMention.objects.bulk_create(mentions)
+
+            ids = [article.pk for article in articles]
+            transaction.on_commit(lambda: update_search_index(ids))
 
-            return article
+            return articles
 
         except Exception as e:
-            logger.error(f"Error processing article: {str(e)}")
+            logger.error(f"Error processing articles: {str(e)}")
             raise
 
-    def ingest_from_source(self, source: NewsSource) -> List[NewsArticle]:
-        """Ingest articles from a news source"""
+    def ingest_from_source(self, source: NewsSource,
+                           on_saved: Optional[Callable[[List[int]], None]] = None) -> List[NewsArticle]:
+        """
+        Ingest articles from a news source.
+
+        ``on_saved`` is called with the IDs of each batch once it is
+        committed, so processing can start while later batches are still
+        downloading.
+        """
         articles = []
+
+        def save(articles_data):
+            saved = self._save_batch(source, articles_data)
+            articles.extend(saved)
+            if on_saved is not None and saved:
+                ids = [article.pk for article in saved]
+                transaction.on_commit(lambda: on_saved(ids))
+
         try:
-            # Fetch articles from source
-            # This is a placeholder - implement actual fetching logic
+            # New article URLs from the source's feed, plus earlier failures
+            previous_validators = {field: getattr(source, field) for field in FEED_VALIDATOR_FIELDS}
             article_urls = self._get_article_urls(source)
             
-            for url in article_urls:
-                try:
-                    article_data = self.fetch_article(url)
-                    article = self.process_article(source, article_data)
-                    articles.append(article)
-                except Exception as e:
-                    logger.error(f"Error processing article {url}: {str(e)}")
+            # Downloads run concurrently; saving stays on this thread so
+            # all database work uses the task's own connection
+            pending = []
+            results = self.fetcher.fetch_many(article_urls, parse=partial(self.parse_article, source=source))
+            for url, article_data, error in results:
+                if error is not None:
+                    logger.error(f"Error fetching article {url}: {str(error)}")
                     continue
+                pending.append(article_data)
+                if len(pending) >= settings.NEWS_INGEST_BATCH_SIZE:
+                    save(pending)
+                    pending = []
+            save(pending)
+            self._save_feed_state(source, article_urls, {article.url for article in articles}, previous_validators)
 
         except Exception as e:
             logger.error(f"Error ingesting from source {source.name}: {str(e)}")
@@ -106,17 +190,63 @@ class NewsIngestionService:
 
         return articles
 
+    def _save_feed_state(self, source: NewsSource, article_urls: List[str], stored_urls: set,
+                         previous_validators: Dict[str, str]) -> None:
+        """
+        Record the URLs to retry next run, and the feed's new validators
+        only if none are left: otherwise an unchanged feed would answer
+        304 and the failed URLs would never be seen again
+        """
+        retry_urls = {}
+        for url in article_urls:
+            if url in stored_urls:
+                continue
+            attempts = source.feed_retry_urls.get(url, 0) + 1
+            if attempts >= settings.NEWS_DISCOVERY_MAX_RETRIES:
+                logger.warning(f"Giving up on {url} from {source.name} after {attempts} failed runs")
+            else:
+                retry_urls[url] = attempts
+        source.feed_retry_urls = retry_urls
+
+        if retry_urls:
+            for field, value in previous_validators.items():
+                setattr(source, field, value)
+        NewsSource.objects.filter(pk=source.pk).update(
+            feed_url=source.feed_url, feed_retry_urls=retry_urls,
+            **{field: getattr(source, field) for field in FEED_VALIDATOR_FIELDS}
+        )
+
+    def _save_batch(self, source: NewsSource, articles_data: List[Dict[str, Any]]) -> List[NewsArticle]:
+        """Save a batch, falling back to one article at a time if it fails"""
+        try:
+            return self.process_articles(source, articles_data)
+        except Exception:
+            if len(articles_data) <= 1:
+                return []
+
+        articles = []
+        for article_data in articles_data:
+            try:
+                articles.append(self.process_article(source, article_data))
+            except Exception as e:
+                logger.error(f"Error processing article {article_data['url']}: {str(e)}")
+                continue
+        return articles
+
     def _get_article_urls(self, source: NewsSource) -> List[str]:
-        """Get article URLs from source"""
-        # Implement source-specific URL extraction
-        # This is a placeholder - you'll need to implement the actual logic
-        return []
+        """New article URLs from the source's RSS, Atom or sitemap feed"""
+        return self.discovery.discover(source)
 
 class NewsProcessingService:
     """Service for processing and analyzing news articles"""
 
-    def __init__(self):
-        self.ml_utils = MLUtils()
+    def __init__(self, ml_utils=None):
+        self._ml_utils = ml_utils
+
+    @property
+    def ml_utils(self):
+        """Process-wide MLUtils, loaded on first use"""
+        return self._ml_utils or get_ml_utils()
 
     def generate_summary(self, article: NewsArticle) -> str:
         """Generate article summary"""
@@ -130,39 +260,135 @@ class NewsProcessingService:
         """Categorize article"""
         return self.ml_utils.categorize_article(article.content)
 
-    @transaction.atomic
     def process_article(self, article: NewsArticle) -> None:
         """Process article with all analysis steps"""
+        self.process_articles([article])
+
+    def analyze_texts(self, texts: List[str], mention_texts: List[str] = ()) -> Dict[str, List[Any]]:
+        """
+        Run every model over ``texts`` in length-sorted micro-batches.
+
+        Mention contexts are packed into the same sentiment batches as the
+        article bodies. No database access happens here.
+        """
+        batch_size = settings.NEWS_ML_BATCH_SIZE
+        sentiments = batched_map(
+            self._batch_method('analyze_sentiments', 'analyze_sentiment'),
+            list(texts) + list(mention_texts),
+            batch_size
+        )
+        return {
+            'summaries': batched_map(
+                self._batch_method('generate_summaries', 'generate_summary'), texts, batch_size
+            ),
+            'sentiments': sentiments[:len(texts)],
+            'mention_sentiments': sentiments[len(texts):],
+            'embeddings': batched_map(
+                self._batch_method('generate_embeddings', 'generate_embedding'), texts, batch_size
+            ),
+            'categories': batched_map(
+                self._batch_method('categorize_articles', 'categorize_article'), texts, batch_size
+            ),
+        }
+
+    def _batch_method(self, batch_name: str, single_name: str) -> Callable[[List[str]], List[Any]]:
+        """Use the model's batch API when it has one, else call it per text"""
+        batch_method = getattr(self.ml_utils, batch_name, None)
+        if batch_method is not None:
+            return batch_method
+        single_method = getattr(self.ml_utils, single_name)
+        return lambda texts: [single_method(text) for text in texts]
+
+    @transaction.atomic
+    def process_articles(self, articles: List[NewsArticle]) -> None:
+        """
+        Process a batch of articles with all analysis steps.
+
+        Inference runs once over the whole batch and results are written back
+        with bulk queries, so the query count does not grow with batch size.
+        """
+        if not articles:
+            return
+
         try:
-            # Generate summary
-            article.summary = self.generate_summary(article)
-            
-            # Analyze sentiment
-            article.sentiment_score = self.analyze_sentiment(article.content)
-            
-            # Generate embedding
-            article.embedding_vector = self.ml_utils.generate_embedding(article.content)
-            
-            # Categorize article
-            categories = self.categorize_article(article)
-            for category_data in categories:
-                category, created = NewsCategory.objects.get_or_create(
-                    name=category_data['name']
-                )
-                ArticleCategory.objects.get_or_create(
-                    article=article,
-                    category=category,
-                    defaults={'confidence_score': category_data['confidence']}
-                )
-            
+            mentions = list(StockMention.objects.filter(article__in=articles))
+            results = self.analyze_texts(
+                [article.content for article in articles],
+                [mention.context for mention in mentions]
+            )
+
+            now = timezone.now()
+            for i, article in enumerate(articles):
+                article.summary = results['summaries'][i]
+                article.sentiment_score = results['sentiments'][i]
+                article.embedding_vector = results['embeddings'][i]
+                article.is_processed = True
+                article.updated_at = now
+
+            # Categorize articles
+            self._save_categories(articles, results['categories'])
+
             # Update stock mentions with sentiment
-            for mention in article.stock_mentions.all():
-                mention.sentiment_score = self.analyze_sentiment(mention.context)
-                mention.save()
-            
-            article.is_processed = True
-            article.save()
+            for mention, sentiment in zip(mentions, results['mention_sentiments']):
+                mention.sentiment_score = sentiment
+                mention.updated_at = now
+            StockMention.objects.bulk_update(mentions, ['sentiment_score', 'updated_at'])
+
+            NewsArticle.objects.bulk_update(
+                articles,
+                ['summary', 'sentiment_score', 'embedding_vector', 'is_processed', 'updated_at']
+            )
+
+            # Keep the similarity index and search data (summaries are
+            # searchable) in step once the batch is committed
+            ids = [article.id for article in articles]
+            embeddings = [article.embedding_vector for article in articles]
+            transaction.on_commit(lambda: self._index_embeddings(ids, embeddings))
+            transaction.on_commit(lambda: update_search_index(ids))
 
         except Exception as e:
-            logger.error(f"Error processing article {article.id}: {str(e)}")
-            raise 
\ No newline at end of file
+            article_ids = [article.id for article in articles]
+            logger.error(f"Error processing articles {article_ids}: {str(e)}")
+            raise
+
+    def _index_embeddings(self, ids: List[int], embeddings: List[Any]) -> None:
+        """Add embeddings to the vector index; the index can be rebuilt if this fails"""
+        try:
+            get_vector_index().add(ids, embeddings)
+        except Exception as e:
+            logger.error(f"Error indexing embeddings for articles {ids}: {str(e)}")
+
+    def _save_categories(self, articles: List[NewsArticle],
+                         categories_per_article: List[List[Dict[str, Any]]]) -> None:
+        """Create missing categories and link them to articles in bulk"""
+        # The same few category names come back for most articles
+        cleaned_names = iter(NewsDataValidator.clean_many(
+            category_data['name'] for categories in categories_per_article for category_data in categories
+        ))
+        cleaned = [
+            [(next(cleaned_names), category_data['confidence']) for category_data in categories]
+            for categories in categories_per_article
+        ]
+        names = {name for categories in cleaned for name, _ in categories if name}
+        if not names:
+            return
+
+        NewsCategory.objects.bulk_create(
+            [NewsCategory(name=name) for name in names],
+            ignore_conflicts=True
+        )
+        category_ids = dict(
+            NewsCategory.objects.filter(name__in=names).values_list('name', 'id')
+        )
+
+        links = [
+            ArticleCategory(
+                article=article,
+                category_id=category_ids[name],
+                confidence_score=confidence
+            )
+            for article, categories in zip(articles, cleaned)
+            for name, confidence in categories
+            if name in category_ids
+        ]
+        ArticleCategory.objects.bulk_create(links, ignore_conflicts=True)
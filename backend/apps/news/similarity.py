@@ -0,0 +1,270 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from django.conf import settings
+from django.db.models import Max
+from .vector_index import _normalise
+
+logger = logging.getLogger(__name__)
+
+class SimilarityCorpus:
+    """
+    Immutable snapshot of every embedded article, laid out for exact search.
+
+    Embeddings are one contiguous, L2-normalised float32 matrix, so a query is
+    a single matmul followed by ``argpartition``. Filter columns sit beside it:
+    source IDs and publish timestamps as arrays compared in bulk, symbols and
+    categories as posting lists of row numbers. Filters are turned into a row
+    mask before scoring, so filtered-out articles are never scored at all.
+    """
+
+    # Below this fraction of candidate rows, gathering them first is cheaper
+    # than scoring the whole matrix and masking afterwards
+    GATHER_THRESHOLD = 0.25
+
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray, source_ids: np.ndarray,
+                 published_at: np.ndarray, symbol_rows: Dict[str, np.ndarray],
+                 category_rows: Dict[str, np.ndarray]):
+        order = np.argsort(ids, kind='stable')
+        self.ids = np.asarray(ids, dtype=np.int64)[order]
+        self.vectors = _normalise(np.ascontiguousarray(np.asarray(vectors, dtype=np.float32)[order]))
+        self.source_ids = np.asarray(source_ids, dtype=np.int64)[order]
+        self.published_at = np.asarray(published_at, dtype=np.float64)[order]
+        # Posting lists are built against the caller's row order
+        inverse = np.empty(len(order), dtype=np.int64)
+        inverse[order] = np.arange(len(order))
+        self.symbol_rows = {key: np.sort(inverse[rows]) for key, rows in symbol_rows.items()}
+        self.category_rows = {key: np.sort(inverse[rows]) for key, rows in category_rows.items()}
+
+    @classmethod
+    def from_database(cls, chunk_size: int = 2000) -> 'SimilarityCorpus':
+        """Load every article that has an embedding, plus its symbols and categories"""
+        from .models import ArticleCategory, NewsArticle, StockMention
+
+        rows = NewsArticle.objects.with_embeddings().filter(
+            embedding_vector__isnull=False
+        ).values_list('id', 'source_id', 'published_at', 'embedding_vector')
+
+        ids, source_ids, published_at, vectors = [], [], [], []
+        for article_id, source_id, published, vector in rows.iterator(chunk_size=chunk_size):
+            if vector is None or not len(vector):
+                continue
+            ids.append(article_id)
+            source_ids.append(source_id)
+            published_at.append(published.timestamp())
+            vectors.append(vector)
+
+        dim = len(vectors[0]) if vectors else settings.NEWS_EMBEDDING_DIM
+        row_of = {article_id: row for row, article_id in enumerate(ids)}
+        symbol_rows = _posting_lists(
+            StockMention.objects.values_list('article_id', 'symbol').iterator(chunk_size=chunk_size),
+            row_of,
+        )
+        category_rows = _posting_lists(
+            ArticleCategory.objects.values_list('article_id', 'category__name').iterator(chunk_size=chunk_size),
+            row_of,
+        )
+        return cls(
+            np.asarray(ids, dtype=np.int64),
+            np.vstack(vectors) if vectors else np.zeros((0, dim), dtype=np.float32),
+            np.asarray(source_ids, dtype=np.int64),
+            np.asarray(published_at, dtype=np.float64),
+            symbol_rows,
+            category_rows,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _row(self, article_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self.ids, article_id))
+        if row < len(self.ids) and self.ids[row] == article_id:
+            return row
+        return None
+
+    def mask(self, symbols: Optional[Iterable[str]] = None,
+             categories: Optional[Iterable[str]] = None,
+             sources: Optional[Iterable[int]] = None,
+             published_after: Optional[datetime] = None,
+             published_before: Optional[datetime] = None,
+             exclude_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        Boolean row mask for the given filters.
+
+        Values within one filter are OR-ed (any of these symbols), and the
+        filters themselves are AND-ed.
+        """
+        mask = np.ones(len(self.ids), dtype=bool)
+        if symbols:
+            mask &= self._posting_mask(self.symbol_rows, symbols)
+        if categories:
+            mask &= self._posting_mask(self.category_rows, categories)
+        if sources:
+            mask &= np.isin(self.source_ids, np.fromiter(sources, dtype=np.int64))
+        if published_after is not None:
+            mask &= self.published_at >= published_after.timestamp()
+        if published_before is not None:
+            mask &= self.published_at <= published_before.timestamp()
+        for article_id in exclude_ids or ():
+            row = self._row(article_id)
+            if row is not None:
+                mask[row] = False
+        return mask
+
+    def _posting_mask(self, posting_lists: Dict[str, np.ndarray], keys: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(self.ids), dtype=bool)
+        for key in keys:
+            rows = posting_lists.get(key)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+    def search(self, vector, k: int = 5, offset: int = 0,
+               mask: Optional[np.ndarray] = None) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Exact cosine search over the rows allowed by ``mask``.
+
+        Returns ``(results, total)``: the ``(article_id, score)`` pairs ranked
+        ``offset`` to ``offset + k``, best first, and the number of rows
+        that matched the filters.
+        """
+        query = _normalise(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+
+        if mask is None:
+            rows, scores = None, self.vectors @ query
+        else:
+            rows = np.flatnonzero(mask)
+            if len(rows) < self.GATHER_THRESHOLD * len(self.ids):
+                scores = self.vectors[rows] @ query
+            else:
+                scores = (self.vectors @ query)[rows]
+
+        total = len(scores)
+        end = min(offset + k, total)
+        if offset >= end:
+            return [], total
+
+        # Only the first ``end`` scores need ordering; the rest stay unsorted
+        top = np.argpartition(-scores, end - 1)[:end] if end < total else np.arange(total)
+        top = top[np.argsort(-scores[top], kind='stable')][offset:end]
+        ids = self.ids[top] if rows is None else self.ids[rows[top]]
+        return [(int(article_id), float(score)) for article_id, score in zip(ids, scores[top])], total
+
+class SimilarityEngine:
+    """
+    Keeps a per-process ``SimilarityCorpus`` reasonably fresh, off the
+    request path.
+
+    A background thread loads the corpus and then, every
+    NEWS_SIMILARITY_REFRESH_SECONDS, checks whether embedded articles, stock
+    mentions or category links have changed (the newest ``updated_at`` and
+    ``id`` of each table, both index lookups) and reloads a new snapshot if
+    so. Searches read whichever snapshot is current and never wait for a
+    load; ``corpus`` is None until the first one finishes, or while there
+    are more than NEWS_SIMILARITY_EXACT_MAX_ARTICLES embedded articles, and
+    callers fall back to the vector index then.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None, max_articles: Optional[int] = None):
+        self.refresh_seconds = (
+            settings.NEWS_SIMILARITY_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self.max_articles = settings.NEWS_SIMILARITY_EXACT_MAX_ARTICLES if max_articles is None else max_articles
+        self._corpus: Optional[SimilarityCorpus] = None
+        self._signature = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._wake = threading.Event()
+
+    @property
+    def corpus(self) -> Optional[SimilarityCorpus]:
+        """The current snapshot, or None while exact search is unavailable"""
+        self.start()
+        return self._corpus
+
+    def start(self) -> None:
+        """Start the refresh thread, if this process has none yet"""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='similarity-refresh', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        from django.db import connection
+
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing the similarity corpus: {str(e)}")
+            finally:
+                # Do not hold a database connection open between checks
+                connection.close()
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+
+    def refresh(self) -> None:
+        """Reload the corpus now if the data changed since the last load"""
+        from .models import NewsArticle
+
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+
+        count = NewsArticle.objects.filter(embedding_vector__isnull=False).count()
+        if count > self.max_articles:
+            if self._corpus is not None or self._signature is None:
+                logger.warning(
+                    f"{count} embedded articles exceed NEWS_SIMILARITY_EXACT_MAX_ARTICLES "
+                    f"({self.max_articles}); similarity search uses the vector index"
+                )
+            self._corpus = None
+            self._signature = signature
+            return
+
+        start = time.perf_counter()
+        self._corpus = SimilarityCorpus.from_database()
+        self._signature = signature
+        logger.info(
+            f"Loaded {len(self._corpus)} article embeddings for similarity search "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    def _current_signature(self):
+        from .models import ArticleCategory, NewsArticle, StockMention
+
+        # Deletions go unnoticed until something else changes; callers drop
+        # IDs that no longer exist
+        return tuple(
+            tuple(queryset.aggregate(latest=Max('updated_at'), last_id=Max('id')).values())
+            for queryset in (
+                NewsArticle.objects.filter(embedding_vector__isnull=False),
+                StockMention.objects.all(),
+                ArticleCategory.objects.all(),
+            )
+        )
+
+    def invalidate(self) -> None:
+        """Check for changes now rather than at the next interval"""
+        self._wake.set()
+
+def _posting_lists(pairs: Iterable[Tuple[int, str]], row_of: Dict[int, int]) -> Dict[str, np.ndarray]:
+    rows_by_key = defaultdict(list)
+    for article_id, key in pairs:
+        row = row_of.get(article_id)
+        if row is not None:
+            rows_by_key[key].append(row)
+    return {key: np.unique(np.asarray(rows, dtype=np.int64)) for key, rows in rows_by_key.items()}
+
+def get_similarity_engine() -> SimilarityEngine:
+    """Shared similarity engine for the current process"""
+    from .model_registry import registry
+    return registry.get('similarity_engine')
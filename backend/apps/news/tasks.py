@@ -1,38 +1,98 @@
 import logging
-from celery import shared_task
+import time
+from typing import Any, Dict, List, Optional
+from celery import chord, shared_task
+from django.conf import settings
 from django.utils import timezone
+from .dispatch import ArticleBatchDispatcher
 from .models import NewsSource, NewsArticle
 from .services import NewsIngestionService, NewsProcessingService
+from .vector_index import get_vector_index
 
 logger = logging.getLogger(__name__)
 
 @shared_task
-def ingest_news_from_sources():
+def ingest_news_from_sources(fan_out: Optional[bool] = None):
     """Task to ingest news from all active sources"""
     try:
-        ingestion_service = NewsIngestionService()
-        processing_service = NewsProcessingService()
-        
+        if fan_out is None:
+            fan_out = settings.NEWS_INGEST_FAN_OUT
+
         # Get all active sources
-        sources = NewsSource.objects.filter(is_active=True)
-        
-        for source in sources:
-            try:
-                # Ingest articles from source
-                articles = ingestion_service.ingest_from_source(source)
-                
-                # Process each article
-                for article in articles:
-                    process_article.delay(article.id)
-                    
-            except Exception as e:
-                logger.error(f"Error processing source {source.name}: {str(e)}")
-                continue
+        source_ids = list(
+            NewsSource.objects.filter(active=True).values_list('id', flat=True)
+        )
+        if not source_ids:
+            logger.info("No active news sources to ingest")
+            return None
+
+        started_at = time.time()
+        if fan_out:
+            # One sub-task per source, aggregated once every source is done
+            callback = aggregate_ingest_results.s(started_at=started_at)
+            header = [ingest_news_from_source.s(source_id) for source_id in source_ids]
+            chord(header)(callback)
+            return None
+
+        results = [_ingest_source(source_id) for source_id in source_ids]
+        return aggregate_ingest_results(results, started_at=started_at)
                 
     except Exception as e:
         logger.error(f"Error in ingest_news_from_sources task: {str(e)}")
         raise
 
+@shared_task
+def ingest_news_from_source(source_id: int) -> Dict[str, Any]:
+    """Task to ingest news from a single source"""
+    return _ingest_source(source_id)
+
+@shared_task
+def aggregate_ingest_results(results: List[Dict[str, Any]], started_at: float = None) -> Dict[str, Any]:
+    """Chord callback summarising a fanned-out ingestion run"""
+    summary = {
+        'sources': len(results),
+        'failed_sources': sum(1 for result in results if result['status'] != 'success'),
+        'articles': sum(result['articles'] for result in results),
+        'messages': sum(result['messages'] for result in results),
+        'source_seconds': round(sum(result['duration'] for result in results), 3),
+        'slowest_source': max(results, key=lambda result: result['duration'], default=None),
+    }
+    if started_at is not None:
+        summary['wall_seconds'] = round(time.time() - started_at, 3)
+
+    logger.info(
+        f"Ingested {summary['articles']} articles from {summary['sources']} sources "
+        f"({summary['failed_sources']} failed) in {summary.get('wall_seconds', '?')}s wall time, "
+        f"{summary['source_seconds']}s across sources, {summary['messages']} processing tasks queued"
+    )
+    return summary
+
+def _ingest_source(source_id: int) -> Dict[str, Any]:
+    """Ingest one source and report counts and timing; never raises"""
+    result = {'source_id': source_id, 'status': 'success', 'articles': 0, 'messages': 0, 'duration': 0.0}
+    start = time.perf_counter()
+    try:
+        source = NewsSource.objects.get(id=source_id)
+        ingestion_service = NewsIngestionService()
+
+        # Ingest articles from source, handing each saved batch on for
+        # processing in chunks (one task per chunk) as it commits
+        with ArticleBatchDispatcher() as dispatcher:
+            articles = ingestion_service.ingest_from_source(source, on_saved=dispatcher.add_many)
+        result['articles'] = len(articles)
+        result['messages'] = dispatcher.messages_sent
+
+    except NewsSource.DoesNotExist:
+        logger.error(f"News source with id {source_id} not found")
+        result['status'] = 'not_found'
+    except Exception as e:
+        logger.error(f"Error processing source {source_id}: {str(e)}")
+        result['status'] = 'error'
+        result['error'] = str(e)
+
+    result['duration'] = round(time.perf_counter() - start, 3)
+    return result
+
 @shared_task
 def process_article(article_id: int):
     """Task to process a single article"""
@@ -46,15 +106,62 @@ def process_article(article_id: int):
         logger.error(f"Error processing article {article_id}: {str(e)}")
         raise
 
+@shared_task
+def process_articles_batch(article_ids: List[int], enqueued_at: float = None) -> Dict[str, Any]:
+    """Task to process a batch of articles with batched model inference"""
+    queue_latency = time.time() - enqueued_at if enqueued_at is not None else None
+    articles = list(NewsArticle.objects.filter(id__in=article_ids))
+    missing = set(article_ids) - {article.id for article in articles}
+    if missing:
+        logger.error(f"Articles with ids {sorted(missing)} not found")
+
+    processing_service = NewsProcessingService()
+    failed = []
+    try:
+        processing_service.process_articles(articles)
+    except Exception as e:
+        # Isolate the bad article(s) instead of failing the whole chunk
+        logger.warning(f"Batch of {len(articles)} articles failed, processing individually: {str(e)}")
+        for article in articles:
+            try:
+                processing_service.process_article(article)
+            except Exception as e:
+                logger.error(f"Error processing article {article.id}: {str(e)}")
+                failed.append(article.id)
+
+    # Failed articles get their own single-article task, as before batching
+    for article_id in failed:
+        process_article.apply_async(
+            args=[article_id], countdown=settings.NEWS_PROCESS_RETRY_DELAY
+        )
+
+    stats = {
+        'articles': len(articles),
+        'failed': len(failed),
+        'queue_seconds': round(queue_latency, 3) if queue_latency is not None else None,
+    }
+    if articles:
+        # End-to-end latency: from the article being stored to it being processed
+        oldest = min(article.created_at for article in articles)
+        stats['ingest_to_processed_seconds'] = round(
+            (timezone.now() - oldest).total_seconds(), 3
+        )
+    logger.info(f"Processed article batch: {stats}")
+    return stats
+
 @shared_task
 def cleanup_old_articles(days: int = 30):
     """Task to clean up old articles"""
     try:
         cutoff_date = timezone.now() - timezone.timedelta(days=days)
-        deleted_count = NewsArticle.objects.filter(
-            published_at__lt=cutoff_date
-        ).delete()[0]
+        old_articles = NewsArticle.objects.filter(published_at__lt=cutoff_date)
+        old_ids = list(old_articles.values_list('id', flat=True))
+        deleted_count = old_articles.delete()[0]
         logger.info(f"Deleted {deleted_count} old articles")
+
+        # Tombstoned in the index; compaction folds them in once the log is long enough
+        if old_ids:
+            get_vector_index().remove(old_ids)
     except Exception as e:
         logger.error(f"Error in cleanup_old_articles task: {str(e)}")
         raise
@@ -63,12 +170,10 @@ def cleanup_old_articles(days: int = 30):
 def reprocess_failed_articles():
     """Task to reprocess articles that failed processing"""
     try:
-        failed_articles = NewsArticle.objects.filter(
-            is_processed=False
-        ).order_by('-created_at')[:100]  # Process 100 at a time
+        failed_articles = NewsArticle.objects.unprocessed()[:100]  # Process 100 at a time
         
-        for article in failed_articles:
-            process_article.delay(article.id)
+        with ArticleBatchDispatcher() as dispatcher:
+            dispatcher.add_many(article.id for article in failed_articles)
             
     except Exception as e:
         logger.error(f"Error in reprocess_failed_articles task: {str(e)}")
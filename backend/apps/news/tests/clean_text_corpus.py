@@ -0,0 +1,53 @@
+import random
+import re
+
+SENTENCES = [
+    'Shares of Apple Inc. (NASDAQ: AAPL) rose 3.2% to $187.44 in early trading on Tuesday.',
+    "The company's fiscal Q3 revenue came in at $81.8 billion, ahead of the $81.5 billion consensus.",
+    '“We see demand holding up through the holiday quarter,” CFO Luca Maestri said on the call.',
+    'Analysts at Morgan Stanley & Co. reiterated their overweight rating — a 12-month target of $220.',
+    'The S&P 500 closed at 4,567.80, while the Nasdaq-100 added 1.1 %; yields on the 10-year slipped.',
+    'Zürich-based UBS said the déjà-vu rally in Nikkei 225 names could fade by year-end.',
+    'Revenue per share: 3¼ cents vs. 2½ cents — see the table below for details.',
+    'Read more: https://example.com/markets/2024/03/apple-earnings?utm_source=rss#comments',
+]
+
+# Inputs chosen for the corner cases of the pipeline: tags next to and
+# between whitespace, unterminated tags, characters dropped between spaces,
+# and non-ASCII whitespace and word characters
+EDGE_CASES = [
+    '', ' ', '\n\t ', '<', '>', '<>', '<<a>', 'a<br>b', 'a <br> b', 'a<br> <br>b',
+    'a & b', '& a', 'a &', ' & & ', 'x < y > z', 'x < y', '5 > 3', '<p>\n  Hello\n</p>',
+    'a b', 'a　　b', 'a\x1cb', 'a\x85b', 'a b', 'naïve café', 'ＡＢＣ１２３',
+    '“quoted” and ‘single’', "it's", '$AAPL', 'snake_case', '-.,!?', 'é', '\U0001F4C8 up',
+]
+
+def reference_clean_text(text):
+    """
+    clean_text as it was, less its quote replacements: both were no-ops
+    (one swapped '"' for itself, the other was mangled into a triple-quoted
+    string containing characters the regex had already removed)
+    """
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = ' '.join(text.split())
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    return text.strip()
+
+def article_bodies(count):
+    """Bodies of 4-8 paragraphs; half keep their markup as scraped, a quarter are pure ASCII"""
+    rng = random.Random(0)
+    ascii_sentences = [sentence for sentence in SENTENCES if sentence.isascii()]
+    bodies = []
+    for i in range(count):
+        sentences = ascii_sentences if i % 4 == 0 else SENTENCES
+        paragraphs = [
+            ' '.join(rng.choices(sentences, k=rng.randint(3, 6)))
+            for _ in range(rng.randint(4, 8))
+        ]
+        if i % 2:
+            bodies.append('<div class="article">\n  <p>' + '</p>\n  <p>'.join(paragraphs) + '</p>\n</div>')
+        else:
+            bodies.append('\n\n'.join(paragraphs))
+    return bodies
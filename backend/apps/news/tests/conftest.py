@@ -0,0 +1,6 @@
+import pytest
+from apps.news.models import NewsSource
+
+@pytest.fixture
+def source(db):
+    return NewsSource.objects.create(name='Test Source', url='https://test.example.com')
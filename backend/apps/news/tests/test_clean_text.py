@@ -0,0 +1,41 @@
+import sys
+import pytest
+from apps.news.validators import NewsDataValidator
+from .clean_text_corpus import EDGE_CASES, article_bodies, reference_clean_text
+
+# Sampled by default: everything up to the CJK symbols block (Latin,
+# punctuation and the odd spaces), every whitespace character, and a
+# stride through the rest
+SAMPLE_BELOW = 0x3100
+SAMPLE_STRIDE = 97
+
+def _code_point_inputs(codes):
+    """Each code point alone and between words"""
+    return [
+        text
+        for code in codes if not 0xD800 <= code <= 0xDFFF
+        for char in [chr(code)]
+        for text in (char, f"a{char}b", f"a {char} b")
+    ]
+
+def _assert_matches_reference(inputs):
+    expected = [reference_clean_text(text) for text in inputs]
+    for text, reference in zip(inputs, expected):
+        assert NewsDataValidator.clean_text(text) == reference, f"clean_text({text[:80]!r})"
+    assert NewsDataValidator.clean_many(inputs) == expected
+
+def test_articles_match_previous_implementation():
+    _assert_matches_reference(article_bodies(200))
+
+def test_edge_cases_match_previous_implementation():
+    _assert_matches_reference(EDGE_CASES)
+
+def test_sampled_code_points_match_previous_implementation():
+    codes = set(range(SAMPLE_BELOW)) | set(range(SAMPLE_BELOW, sys.maxunicode + 1, SAMPLE_STRIDE))
+    codes |= {code for code in range(sys.maxunicode + 1) if chr(code).isspace()}
+    _assert_matches_reference(_code_point_inputs(sorted(codes)))
+
+@pytest.mark.slow
+@pytest.mark.parametrize('plane', range((sys.maxunicode + 1) // 0x10000))
+def test_every_code_point_matches_previous_implementation(plane):
+    _assert_matches_reference(_code_point_inputs(range(plane * 0x10000, (plane + 1) * 0x10000)))
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+import pytest
+from apps.news.fetchers import ConcurrentFetcher
+
+class RecordingSession:
+    """Stands in for requests.Session and records concurrency per host"""
+
+    def __init__(self, delay=0.01, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.active = Counter()
+        self.peak = Counter()
+        self.threads = set()
+
+    def get(self, url, headers=None, timeout=None):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.active[host] += 1
+            self.peak[host] = max(self.peak[host], self.active[host])
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[host] -= 1
+        if url in self.fail:
+            raise ConnectionError(url)
+        return _Response(url)
+
+    def close(self):
+        pass
+
+class _Response:
+    def __init__(self, url):
+        self.text = f"<html>{url}</html>"
+
+    def raise_for_status(self):
+        pass
+
+def _fetcher(session, max_concurrency=32, per_host_concurrency=4):
+    return ConcurrentFetcher(max_concurrency=max_concurrency, per_host_concurrency=per_host_concurrency,
+                             timeout=1, session=session)
+
+def test_single_host_starts_only_as_many_workers_as_it_may_use():
+    session = RecordingSession()
+    urls = [f"https://one.example.com/{i}" for i in range(20)]
+    results = list(_fetcher(session).fetch_many(urls))
+
+    assert sorted(url for url, _, _ in results) == sorted(urls)
+    assert session.peak['one.example.com'] == 4
+    assert len(session.threads) <= 4
+
+@pytest.mark.parametrize('max_concurrency', [3, 32])
+def test_limits_hold_across_hosts(max_concurrency):
+    session = RecordingSession()
+    urls = [f"https://{host}.example.com/{i}" for host in ('a', 'b', 'c') for i in range(10)]
+    results = list(_fetcher(session, max_concurrency=max_concurrency, per_host_concurrency=2).fetch_many(urls))
+
+    assert len(results) == 30
+    assert max(session.peak.values()) <= 2
+    assert len(session.threads) <= min(max_concurrency, 6)
+    # Round-robin: every host gets going even when the global cap is lower than the hosts' share
+    assert set(session.peak) == {'a.example.com', 'b.example.com', 'c.example.com'}
+
+def test_failures_and_duplicates():
+    session = RecordingSession(fail=['https://a.example.com/bad'])
+    urls = ['https://a.example.com/ok', 'https://a.example.com/bad', 'https://a.example.com/ok']
+    results = {url: (result, error) for url, result, error in _fetcher(session).fetch_many(
+        urls, parse=lambda url, html: len(html)
+    )}
+
+    assert results['https://a.example.com/ok'] == (len('<html>https://a.example.com/ok</html>'), None)
+    assert isinstance(results['https://a.example.com/bad'][1], ConnectionError)
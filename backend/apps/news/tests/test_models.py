@@ -0,0 +1,19 @@
+import numpy as np
+from apps.api.testing import count_queries
+from apps.news.models import NewsArticle
+
+CONTENT = 'Shares of the chipmaker rose 4% after it raised its full-year revenue forecast on strong demand. ' * 2
+
+def test_embeddings_are_deferred_unless_asked_for(source):
+    vector = np.arange(8, dtype=np.float32)
+    NewsArticle.objects.create(
+        url='https://test.example.com/embedded', title='Embedded', content=CONTENT, source=source,
+        embedding_vector=vector
+    )
+
+    article = NewsArticle.objects.get()
+    assert article.get_deferred_fields() >= {'embedding_vector', 'search_vector'}
+
+    article = NewsArticle.objects.with_embeddings().get()
+    assert article.get_deferred_fields() == {'search_vector'}
+    assert count_queries(lambda: np.testing.assert_array_equal(article.embedding_vector, vector)) == 0
@@ -0,0 +1,31 @@
+from django.utils import timezone
+from apps.api.testing import assert_constant_queries
+from apps.news.models import NewsArticle, StockMention
+from apps.news.services import NewsIngestionService
+
+SYMBOLS = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'AMZN', 'GOOG']
+
+def _article(i):
+    symbols = ' '.join(f"${symbol}" for symbol in SYMBOLS[:(i % len(SYMBOLS)) + 1])
+    return {
+        'url': f"https://test.example.com/articles/{i}",
+        'title': f"Test article {i}",
+        'content': f"Shares of {symbols} moved after earnings. " * 10,
+        'author': 'Test',
+        'published_at': timezone.now(),
+    }
+
+def test_process_articles_query_count_does_not_grow_with_batch(source):
+    service = NewsIngestionService()
+    assert_constant_queries(lambda size: service.process_articles(source, [_article(i) for i in range(size)]))
+
+def test_process_articles_upserts_on_url(source):
+    service = NewsIngestionService()
+    service.process_articles(source, [_article(i) for i in range(3)])
+    updated = dict(_article(0), title='Updated title')
+    articles = service.process_articles(source, [updated])
+
+    assert NewsArticle.objects.count() == 3
+    assert articles[0].pk == NewsArticle.objects.get(url=updated['url']).pk
+    assert NewsArticle.objects.get(url=updated['url']).title == 'Updated title'
+    assert StockMention.objects.filter(article=articles[0], symbol='AAPL').count() == 1
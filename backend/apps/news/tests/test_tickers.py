@@ -0,0 +1,45 @@
+import pytest
+from apps.news.tickers import TickerExtractor, mention_context
+
+@pytest.fixture
+def extractor():
+    return TickerExtractor(['AAPL', 'MSFT', 'NVDA', 'GM', 'A'])
+
+@pytest.mark.parametrize('text, expected', [
+    ('AAPL and MSFT rose while NVDA slipped.', ['AAPL', 'MSFT', 'NVDA']),
+    ('The CEO told US investors AAPL would grow.', ['AAPL']),
+    ('XAAPL and AAPLX are not AAPL.', ['AAPL']),
+    ('$TSLA jumped and NASDAQ: AMZN followed.', ['TSLA', 'AMZN']),
+    ('Shares of Apple (NYSE:$IBM) and nasdaq : INTC.', ['IBM', 'INTC']),
+    ('GM said A shares rose at 4 PM.', []),
+    ('$GM and $A rose.', ['GM', 'A']),
+    ('AAPL, AAPL and $AAPL.', ['AAPL']),
+    ('', []),
+])
+def test_extract(extractor, text, expected):
+    assert extractor.extract(text) == expected
+
+def test_finditer_positions(extractor):
+    text = 'Buy $AAPL, not MSFT.'
+    assert [(match.symbol, text[match.start:match.end]) for match in extractor.finditer(text)] == [
+        ('AAPL', 'AAPL'), ('MSFT', 'MSFT')
+    ]
+
+def test_context_starts_at_a_sentence_the_symbol_opens(extractor):
+    text = 'Markets were quiet after a long weekend. AAPL rose 3% after earnings. MSFT fell.'
+    assert extractor.contexts(text) == {
+        'AAPL': 'AAPL rose 3% after earnings.',
+        'MSFT': 'MSFT fell.',
+    }
+
+def test_context_keeps_abbreviations_inside_the_sentence(extractor):
+    text = 'Analysts were upbeat. Apple Inc. and AAPL holders cheered on Tuesday. Others sold.'
+    assert extractor.contexts(text)['AAPL'] == 'Apple Inc. and AAPL holders cheered on Tuesday.'
+
+def test_context_ends_at_a_sentence_end_on_the_window_edge():
+    assert mention_context('AAPL rose. Then it fell.', 0, 4, width=6) == 'AAPL rose.'
+
+def test_context_is_cut_on_word_boundaries():
+    text = 'one two three four AAPL five six seven eight'
+    start = text.index('AAPL')
+    assert mention_context(text, start, start + 4, width=8) == 'four AAPL five'
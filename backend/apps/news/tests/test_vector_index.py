@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from apps.news.vector_index import LocalVectorIndex
+
+DIM = 8
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(100, DIM)).astype(np.float32)
+
+def test_add_remove_and_search(tmp_path, vectors):
+    index = LocalVectorIndex(str(tmp_path), dim=DIM)
+    index.add(list(range(1, 101)), vectors)
+    index.remove([1])
+
+    assert len(index) == 99
+    assert index.search(vectors[1], k=1)[0][0] == 2
+    assert 1 not in [article_id for article_id, _ in index.search(vectors[0], k=99)]
+
+def test_writes_are_seen_by_other_instances_across_compactions(tmp_path, vectors):
+    writer = LocalVectorIndex(str(tmp_path), dim=DIM)
+    reader = LocalVectorIndex(str(tmp_path))
+    writer.add(list(range(1, 51)), vectors[:50])
+    assert len(reader) == 50
+
+    writer.compact()
+    writer.add(list(range(51, 101)), vectors[50:])
+    assert len(reader) == 100
+    assert reader.search(vectors[70], k=1)[0][0] == 71
+
+def test_reader_retries_a_generation_removed_while_it_was_read(tmp_path, vectors, monkeypatch):
+    writer = LocalVectorIndex(str(tmp_path), dim=DIM)
+    writer.rebuild(list(range(1, 101)), vectors)
+    reader = LocalVectorIndex(str(tmp_path))
+    writer.compact()
+    stale_meta = writer._read_meta()
+    # Compaction moves on and removes the generation the reader is about to read
+    writer.compact()
+
+    stale = [stale_meta]
+    read_meta = reader._read_meta
+    monkeypatch.setattr(reader, '_read_meta', lambda: stale.pop() if stale else read_meta())
+
+    assert len(reader) == 100
+    assert reader._generation == writer._generation
@@ -0,0 +1,162 @@
+import pytest
+from urllib.parse import urlsplit
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.api.cache import ResponseCache
+from apps.api.decorators import bump_cache_version
+from apps.api.testing import assert_constant_queries, count_queries
+from apps.news.models import ArticleCategory, NewsArticle, NewsCategory, StockMention
+from apps.news.serializers import NewsArticleListSerializer
+from apps.news.views import ArticleCategoryViewSet, NewsArticleViewSet, StockMentionViewSet
+
+SIZES = (1, 10, 50)
+# Article categories use the default page number pagination, without ?page_size=
+DEFAULT_PAGE_SIZES = (1, 5, 10)
+CONTENT = 'Shares of the chipmaker rose 4% after it raised its full-year revenue forecast on strong demand. ' * 2
+
+@pytest.fixture(autouse=True)
+def local_cache(settings, monkeypatch):
+    # Responses are cached per URL; every test starts from empty caches
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'news-tests'}
+    }
+    monkeypatch.setattr('apps.api.decorators.response_cache', ResponseCache())
+
+@pytest.fixture
+def user(db):
+    return get_user_model().objects.create_user(email='reader@example.com', username='reader', password='reader')
+
+@pytest.fixture
+def articles(source):
+    """Articles keyed by size, each with ``size`` stock mentions and categories"""
+    categories = NewsCategory.objects.bulk_create([NewsCategory(name=f"Category {i}") for i in range(max(SIZES))])
+    now = timezone.now()
+    articles = {}
+    for size in SIZES + DEFAULT_PAGE_SIZES:
+        if size in articles:
+            continue
+        article = NewsArticle.objects.create(
+            url=f"https://test.example.com/articles/{size}", title=f"Article {size}", content=CONTENT,
+            source=source, published_at=now - timedelta(minutes=size)
+        )
+        StockMention.objects.bulk_create([
+            StockMention(article=article, symbol=f"S{chr(65 + i // 26)}{chr(65 + i % 26)}", context='Shares rose.') for i in range(size)
+        ])
+        ArticleCategory.objects.bulk_create([
+            ArticleCategory(article=article, category=category, confidence_score=0.9)
+            for category in categories[:size]
+        ])
+        articles[size] = article
+    NewsArticle.objects.bulk_create([
+        NewsArticle(
+            url=f"https://test.example.com/more/{i}", title=f"More {i}", content=CONTENT,
+            source=source, published_at=now - timedelta(hours=1, minutes=i)
+        )
+        for i in range(max(SIZES))
+    ])
+    return articles
+
+def _get(viewset, action, user, path, status=200, headers=None, **kwargs):
+    request = APIRequestFactory().get(path, **(headers or {}))
+    force_authenticate(request, user)
+    response = viewset.as_view({'get': action}, throttle_classes=[])(request, **kwargs)
+    assert response.status_code == status
+    return response
+
+@pytest.mark.parametrize('query', ['', '&expand=content,stock_mentions,categories,source'])
+def test_article_list_query_count_does_not_grow_with_page_size(user, articles, query):
+    def fetch(size):
+        response = _get(NewsArticleViewSet, 'list', user, f"/api/news/articles/?page_size={size}{query}")
+        assert len(response.data['results']) == size
+
+    assert_constant_queries(fetch, SIZES)
+
+def test_article_retrieve_query_count_does_not_grow_with_relations(user, articles):
+    def fetch(size):
+        article = articles[size]
+        response = _get(NewsArticleViewSet, 'retrieve', user, f"/api/news/articles/{article.pk}/", pk=article.pk)
+        assert len(response.data['stock_mentions']) == size
+        assert len(response.data['categories']) == size
+
+    assert_constant_queries(fetch, SIZES)
+
+@pytest.mark.parametrize('viewset, path, sizes', [
+    (StockMentionViewSet, '/api/news/stock-mentions/', SIZES),
+    (ArticleCategoryViewSet, '/api/news/article-categories/', DEFAULT_PAGE_SIZES),
+])
+def test_relation_list_query_count_does_not_grow_with_rows(user, articles, viewset, path, sizes):
+    def fetch(size):
+        response = _get(viewset, 'list', user, f"{path}?article={articles[size].pk}&page_size={size}")
+        assert len(response.data['results']) == size
+
+    assert_constant_queries(fetch, sizes)
+
+@pytest.mark.parametrize('viewset, path, model', [
+    (StockMentionViewSet, '/api/news/stock-mentions/', StockMention),
+    (ArticleCategoryViewSet, '/api/news/article-categories/', ArticleCategory),
+])
+def test_relation_retrieve(user, articles, viewset, path, model):
+    row = model.objects.first()
+    response = _get(viewset, 'retrieve', user, f"{path}{row.pk}/", pk=row.pk)
+    assert response.data['id'] == row.pk
+
+@pytest.mark.parametrize('fields, expected', [
+    ('id,unknown', {'id'}),
+    ('unknown', set(NewsArticleListSerializer.Meta.default_fields)),
+])
+def test_article_list_ignores_unknown_fields(user, articles, fields, expected):
+    response = _get(NewsArticleViewSet, 'list', user, f"/api/news/articles/?fields={fields}")
+    assert set(response.data['results'][0]) == expected
+
+def test_article_list_previous_page_links_forward_when_emptied(user, articles):
+    first_page = _get(NewsArticleViewSet, 'list', user, '/api/news/articles/?page_size=5').data
+    second_page = _get(NewsArticleViewSet, 'list', user, _path(first_page['next'])).data
+    NewsArticle.objects.filter(pk__in=[row['id'] for row in first_page['results']]).delete()
+    # Deleted behind the API's back, so nothing invalidated the cached first page
+    bump_cache_version('news/articles')
+
+    previous_page = _get(NewsArticleViewSet, 'list', user, _path(second_page['previous'])).data
+    assert previous_page['results'] == []
+    assert previous_page['previous'] is None
+    assert _get(NewsArticleViewSet, 'list', user, _path(previous_page['next'])).data['results'] == second_page['results']
+
+def _path(link):
+    parts = urlsplit(link)
+    return f"{parts.path}?{parts.query}"
+
+def test_article_list_not_modified_from_cache_without_queries(user, articles):
+    path = '/api/news/articles/?page_size=5'
+    first = _get(NewsArticleViewSet, 'list', user, path)
+    etag, last_modified = first['ETag'], first['Last-Modified']
+
+    responses = []
+    queries = count_queries(lambda: responses.append(
+        _get(NewsArticleViewSet, 'list', user, path, status=304, headers={'HTTP_IF_NONE_MATCH': etag})
+    ))
+    assert queries == 0
+    assert responses[0]['ETag'] == etag
+    assert _get(NewsArticleViewSet, 'list', user, path, status=304,
+                headers={'HTTP_IF_MODIFIED_SINCE': last_modified})['ETag'] == etag
+
+def test_article_etag_changes_when_a_nested_mention_changes(user, articles):
+    article = articles[1]
+    path = f"/api/news/articles/{article.pk}/"
+    etag = _get(NewsArticleViewSet, 'retrieve', user, path, pk=article.pk)['ETag']
+
+    request = APIRequestFactory().patch(f"/api/news/stock-mentions/{article.stock_mentions.get().pk}/",
+                                        {'context': 'Shares fell.'}, format='json')
+    force_authenticate(request, user)
+    response = StockMentionViewSet.as_view({'patch': 'partial_update'}, throttle_classes=[])(
+        request, pk=article.stock_mentions.get().pk
+    )
+    assert response.status_code == 200
+
+    response = _get(NewsArticleViewSet, 'retrieve', user, path, headers={'HTTP_IF_NONE_MATCH': etag}, pk=article.pk)
+    assert response['ETag'] != etag
+    assert response.data['stock_mentions'][0]['context'] == 'Shares fell.'
+
+@pytest.mark.parametrize('pk', ['abc', '999999'])
+def test_article_retrieve_missing_or_malformed_pk_is_404(user, articles, pk):
+    _get(NewsArticleViewSet, 'retrieve', user, f"/api/news/articles/{pk}/", status=404, pk=pk)
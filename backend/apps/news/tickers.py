@@ -0,0 +1,165 @@
+import logging
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Exchanges whose "EXCHANGE: SYMBOL" prefix marks a ticker explicitly
+EXCHANGES = (
+    'NASDAQ', 'NYSE', 'NYSEARCA', 'NYSEAMERICAN', 'AMEX', 'CBOE',
+    'OTC', 'OTCMKTS', 'OTCQX', 'TSX', 'TSXV', 'LSE', 'ASX',
+)
+
+# Universe symbols that are also everyday upper-case words or common
+# abbreviations (headlines, "4 PM ET", "MA" degrees, "DE" for Delaware);
+# they only count as cashtags or with an exchange prefix, as do single
+# letters
+AMBIGUOUS_SYMBOLS = frozenset({
+    'ALL', 'ARE', 'CAN', 'CAT', 'FOR', 'IT', 'LOW', 'NET', 'NOW', 'ON', 'ONE', 'SO', 'SEE',
+    'ARM', 'BA', 'COST', 'DE', 'GE', 'GM', 'HD', 'ICE', 'MA', 'MO', 'MS', 'PG', 'PM', 'TM',
+})
+
+SYMBOL_PATTERN = re.compile(r'[A-Z]{1,5}')
+
+# An upper-case word of up to five letters. The leading character class
+# comes first so the regex engine can skip ahead to candidates; the
+# lookbehind after it checks the word boundary.
+CANDIDATE_PATTERN = re.compile(r'[A-Z](?<!\w.)[A-Z]{0,4}(?!\w)')
+# A "$" or "EXCHANGE:" marker ending right before a candidate
+MARKER_PATTERN = re.compile(
+    rf"(?<![\w$])(?:(?i:{'|'.join(EXCHANGES)})\s?:\s?\$?|\$)\Z"
+)
+MARKER_WIDTH = max(len(exchange) for exchange in EXCHANGES) + 3
+# Sentence-ending punctuation; "Inc. rose" does not end a sentence
+SENTENCE_END_PATTERN = re.compile(r'[.!?](?=\s+["\'(“‘]?[A-Z0-9])')
+
+class TickerMatch(NamedTuple):
+    """A ticker mention; ``text[start:end]`` is the symbol itself"""
+    symbol: str
+    start: int
+    end: int
+
+class TickerExtractor:
+    """
+    Finds ticker mentions in article text.
+
+    One regex pass picks out upper-case words. A word counts if it is in the
+    ticker universe (a set lookup), or if it is marked as a cashtag
+    (``$AAPL``) or with an exchange prefix (``NASDAQ: AAPL``), which is
+    only checked for words right after a ``$`` or ``:``. So "CEO", "US"
+    or "I" are not reported unless the universe lists them.
+
+    ``NewsDataValidator.clean_text`` strips ``$`` and ``:``, so text that has
+    been cleaned relies on the universe alone.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self.symbols = frozenset(symbols)
+        self.bare_symbols = frozenset(
+            symbol for symbol in self.symbols if len(symbol) > 1 and symbol not in AMBIGUOUS_SYMBOLS
+        )
+
+    def finditer(self, text: str) -> Iterator[TickerMatch]:
+        """Every mention in ``text``, in order"""
+        if not text:
+            return
+        bare_symbols = self.bare_symbols
+        for match in CANDIDATE_PATTERN.finditer(text):
+            symbol = match.group()
+            start = match.start()
+            if symbol in bare_symbols or _is_marked(text, start):
+                yield TickerMatch(symbol, start, match.end())
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct symbols mentioned in ``text``, in order of first mention"""
+        return list(dict.fromkeys(match.symbol for match in self.finditer(text)))
+
+    def contexts(self, text: str, width: Optional[int] = None) -> Dict[str, str]:
+        """The context of each symbol's first mention, keyed by symbol"""
+        width = settings.NEWS_MENTION_CONTEXT_CHARS if width is None else width
+        contexts = {}
+        for match in self.finditer(text):
+            if match.symbol not in contexts:
+                contexts[match.symbol] = mention_context(text, match.start, match.end, width)
+        return contexts
+
+def _is_marked(text: str, start: int) -> bool:
+    """Whether the word at ``start`` follows a ``$`` or an exchange prefix"""
+    before = text[max(start - 3, 0):start]
+    if '$' not in before and ':' not in before:
+        return False
+    return MARKER_PATTERN.search(text, max(start - MARKER_WIDTH, 0), start) is not None
+
+def mention_context(text: str, start: int, end: int, width: int) -> str:
+    """
+    The sentence around ``text[start:end]``, cut to at most ``width``
+    characters either side of the mention, on a word boundary
+    """
+    low = max(start - width, 0)
+    high = min(end + width, len(text))
+
+    # The lookahead reads past the punctuation, so each search runs beyond
+    # its side of the window: to the mention for a sentence starting with
+    # it, and past ``high`` for one ending right at the edge
+    sentence_starts = [
+        match.end() for match in SENTENCE_END_PATTERN.finditer(text, low, end) if match.end() <= start
+    ]
+    if sentence_starts:
+        low = sentence_starts[-1]
+    elif low > 0:
+        low = text.find(' ', low, start) + 1
+
+    sentence_end = SENTENCE_END_PATTERN.search(text, end)
+    if sentence_end is not None and sentence_end.end() <= high:
+        high = sentence_end.end()
+    elif high < len(text):
+        space = text.rfind(' ', end, high)
+        high = space if space >= 0 else high
+
+    return text[low:high].strip()
+
+def load_ticker_universe(path: str) -> Set[str]:
+    """
+    Symbols listed in ``path``: one per line, or the first column of a CSV.
+    Blank lines, ``#`` comments and symbols ``StockMention`` cannot store
+    (share classes such as BRK.B) are skipped.
+    """
+    symbols = set()
+    skipped = 0
+    with open(path, encoding='utf-8') as universe:
+        for line in universe:
+            fields = re.split(r'[\s,;]+', line.split('#', 1)[0].strip(), maxsplit=1)
+            symbol = fields[0].lstrip('$').upper()
+            if not symbol:
+                continue
+            if SYMBOL_PATTERN.fullmatch(symbol):
+                symbols.add(symbol)
+            else:
+                skipped += 1
+    if skipped:
+        logger.info(f"Skipped {skipped} unsupported symbols in {path}")
+    return symbols
+
+def load_ticker_extractor() -> TickerExtractor:
+    """
+    Build the extractor for the universe at NEWS_TICKER_UNIVERSE_PATH.
+
+    Without a universe only cashtags and exchange-prefixed mentions are
+    found.
+    """
+    path = settings.NEWS_TICKER_UNIVERSE_PATH
+    if not path:
+        return TickerExtractor()
+    try:
+        symbols = load_ticker_universe(path)
+    except OSError as e:
+        logger.error(f"Error loading ticker universe from {path}: {str(e)}")
+        return TickerExtractor()
+    logger.info(f"Loaded {len(symbols)} tickers from {path}")
+    return TickerExtractor(symbols)
+
+def get_ticker_extractor() -> TickerExtractor:
+    """Shared ticker extractor for the current process"""
+    from .model_registry import registry
+    return registry.get('ticker_extractor')
@@ -1,51 +1,96 @@
 import re
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Union
 from datetime import datetime
+from urllib.parse import urlsplit
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from .dates import ISO_8601, RFC_2822, DateParser
 
 logger = logging.getLogger(__name__)
 
 class NewsDataValidator:
     """Validator for news data"""
 
-    # Common stock symbol patterns
-    STOCK_SYMBOL_PATTERN = r'\$[A-Z]{1,5}|[A-Z]{1,5}'
-    
-    # Common date formats
+    # Common date formats besides ISO 8601 and RFC 2822 (see DateParser)
     DATE_FORMATS = [
-        '%Y-%m-%d',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%SZ',
-        '%Y-%m-%d %H:%M:%S',
         '%B %d, %Y',
         '%B %d %Y',
         '%d %B %Y',
         '%d/%m/%Y',
         '%m/%d/%Y'
     ]
+    DATE_PARSER = DateParser(DATE_FORMATS)
+
+    # clean_text works on UTF-8 bytes, where tags, ASCII whitespace and the
+    # ASCII characters it drops are single bytes that never occur inside
+    # the encoding of another character
+    HTML_TAG_PATTERN = re.compile(rb'<[^>]+>')
+    ASCII_BYTES = bytes(range(128))
+    ASCII_WHITESPACE_TO_SPACE = bytes.maketrans(b'\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f', b' ' * 9)
+    ASCII_DISALLOWED_BYTES = bytes(
+        code for code in range(128)
+        if not (chr(code).isalnum() or chr(code).isspace() or chr(code) in '_.,!?-')
+    )
+
+    # Basic URL validation
+    URL_PATTERN = re.compile(
+        r'^https?://'  # http:// or https://
+        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
+        r'localhost|'  # localhost
+        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ip
+        r'(?::\d+)?'  # optional port
+        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 
     @classmethod
     def clean_text(cls, text: str) -> str:
-        """Clean and normalize text content"""
+        """
+        Clean and normalize text content.
+
+        Strips HTML tags, collapses whitespace runs to single spaces and then
+        drops characters other than word characters, whitespace and
+        ``.,!?-``. Whitespace is collapsed before characters are dropped, so
+        "a & b" keeps both spaces. Each step is a ``bytes.translate`` or
+        ``replace`` over the whole text instead of a regex tried at every
+        character.
+        """
         if not text:
             return ""
-            
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        
-        # Normalize quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        return text.strip()
+
+        data = text.encode('utf-8', 'surrogatepass')
+        if b'<' in data:
+            data = cls.HTML_TAG_PATTERN.sub(b'', data)
+
+        # Sort the few distinct non-ASCII characters into whitespace, which
+        # joins the runs collapsed below, and characters to drop afterwards
+        dropped = []
+        if not text.isascii():
+            for char in set(data.translate(None, cls.ASCII_BYTES).decode('utf-8', 'surrogatepass')):
+                if char.isspace():
+                    data = data.replace(char.encode('utf-8', 'surrogatepass'), b' ')
+                elif not char.isalnum():
+                    dropped.append(char.encode('utf-8', 'surrogatepass'))
+
+        data = data.translate(cls.ASCII_WHITESPACE_TO_SPACE)
+        while b'  ' in data:
+            data = data.replace(b'  ', b' ')
+
+        data = data.translate(None, cls.ASCII_DISALLOWED_BYTES)
+        for encoded in dropped:
+            data = data.replace(encoded, b'')
+
+        return data.strip().decode()
+
+    @classmethod
+    def clean_many(cls, texts: Iterable[str]) -> List[str]:
+        """Clean a batch of texts, in order; repeated texts are cleaned once"""
+        cleaned = {}
+        results = []
+        for text in texts:
+            if text not in cleaned:
+                cleaned[text] = cls.clean_text(text)
+            results.append(cleaned[text])
+        return results
 
     @classmethod
     def validate_url(cls, url: str) -> str:
@@ -53,33 +98,32 @@ class NewsDataValidator:
         if not url:
             raise ValidationError('URL is required')
             
-        # Basic URL validation
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
-            r'localhost|'  # localhost
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-            
-        if not url_pattern.match(url):
+        if not cls.URL_PATTERN.match(url):
             raise ValidationError('Invalid URL format')
             
         return url
 
     @classmethod
-    def validate_date(cls, date_str: str) -> datetime:
-        """Validate and parse date string"""
+    def validate_date(cls, date_str: Union[str, datetime], source: Optional[str] = None) -> datetime:
+        """
+        Validate and parse a date string into an aware datetime.
+
+        ``source`` (the article's host) lets the parser start from the
+        format that source used last. Datetimes, as on a model's
+        ``published_at``, are returned made aware.
+        """
         if not date_str:
             return timezone.now()
-            
-        for fmt in cls.DATE_FORMATS:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-                
-        raise ValidationError(f'Invalid date format. Supported formats: {", ".join(cls.DATE_FORMATS)}')
+
+        if isinstance(date_str, datetime):
+            return date_str if timezone.is_aware(date_str) else timezone.make_aware(date_str)
+
+        try:
+            return cls.DATE_PARSER.parse(date_str, source)
+        except ValueError:
+            raise ValidationError(
+                f'Invalid date format. Supported formats: {ISO_8601}, {RFC_2822}, {", ".join(cls.DATE_FORMATS)}'
+            )
 
     @classmethod
     def validate_stock_symbol(cls, symbol: str) -> str:
@@ -96,6 +140,31 @@ class NewsDataValidator:
             
         return symbol
 
+    @classmethod
+    def validate_extraction_rules(cls, rules: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate a source's extraction rules (see apps.news.extraction)"""
+        from .extraction import EXTRACTION_FIELDS
+
+        if not rules:
+            return {}
+        if not isinstance(rules, dict):
+            raise ValidationError('Extraction rules must be an object')
+
+        cleaned_rules = {}
+        for field, selector in rules.items():
+            if field == 'remove':
+                selectors = [selector] if isinstance(selector, str) else selector
+                if not isinstance(selectors, list) or not all(isinstance(s, str) and s.strip() for s in selectors):
+                    raise ValidationError('Extraction rule "remove" must be a selector or a list of selectors')
+                cleaned_rules[field] = [s.strip() for s in selectors]
+            elif field in EXTRACTION_FIELDS:
+                if not isinstance(selector, str) or not selector.strip():
+                    raise ValidationError(f'Extraction rule "{field}" must be a selector')
+                cleaned_rules[field] = selector.strip()
+            else:
+                raise ValidationError(f'Unknown extraction rule "{field}"')
+        return cleaned_rules
+
     @classmethod
     def validate_article_data(cls, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean article data"""
@@ -115,7 +184,9 @@ class NewsDataValidator:
             
             # Optional fields
             cleaned_data['author'] = cls.clean_text(data.get('author', ''))
-            cleaned_data['published_at'] = cls.validate_date(data.get('published_at', ''))
+            cleaned_data['published_at'] = cls.validate_date(
+                data.get('published_at', ''), source=urlsplit(cleaned_data['url']).netloc
+            )
             
             # Validate length constraints
             if len(cleaned_data['title']) > 500:
@@ -146,6 +217,8 @@ class NewsDataValidator:
             # Optional fields
             cleaned_data['description'] = cls.clean_text(data.get('description', ''))
             cleaned_data['active'] = bool(data.get('active', True))
+            cleaned_data['feed_url'] = cls.validate_url(data['feed_url']) if data.get('feed_url') else ''
+            cleaned_data['extraction_rules'] = cls.validate_extraction_rules(data.get('extraction_rules'))
             
             return cleaned_data
             
@@ -175,19 +248,6 @@ class NewsDataValidator:
 
     @classmethod
     def extract_stock_mentions(cls, text: str) -> List[str]:
-        """Extract and validate stock symbols from text"""
-        if not text:
-            return []
-            
-        # Find all potential stock symbols
-        matches = re.finditer(cls.STOCK_SYMBOL_PATTERN, text)
-        symbols = set()
-        
-        for match in matches:
-            try:
-                symbol = cls.validate_stock_symbol(match.group())
-                symbols.add(symbol)
-            except ValidationError:
-                continue
-                
-        return list(symbols) 
\ No newline at end of file
+        """Extract stock symbols from text (see apps.news.tickers)"""
+        from .tickers import get_ticker_extractor
+        return get_ticker_extractor().extract(text)
@@ -0,0 +1,491 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# (article_id, score) pairs, best match first; score is None when the
+# backend does not report one
+SearchResult = List[Tuple[int, Optional[float]]]
+
+class BaseVectorIndex:
+    """Interface for article embedding indexes"""
+
+    def add(self, ids: Sequence[int], vectors: Sequence[Any]) -> None:
+        """Insert or replace the vectors for the given article IDs"""
+        raise NotImplementedError
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """Drop the given article IDs from the index"""
+        raise NotImplementedError
+
+    def search(self, vector: Any, k: int = 5) -> SearchResult:
+        """Return the ``k`` nearest article IDs to ``vector``"""
+        raise NotImplementedError
+
+    def save(self) -> None:
+        """Persist pending changes, if the backend keeps its own storage"""
+
+class MilvusVectorIndex(BaseVectorIndex):
+    """
+    Index kept in a Milvus collection with one row per article.
+
+    The collection (``NEWS_VECTOR_INDEX_MILVUS_COLLECTION``) is keyed by
+    article ID and created with an IVF index on first use; fill it with
+    ``rebuild_vector_index``. Vectors are L2-normalised and searched by
+    inner product, so scores are cosine similarities.
+    """
+
+    CONNECTION_ALIAS = 'news-vector-index'
+    # Article IDs per delete expression
+    DELETE_CHUNK = 1000
+
+    def __init__(self, collection_name: Optional[str] = None, dim: Optional[int] = None,
+                 nprobe: Optional[int] = None):
+        from pymilvus import connections
+
+        self.collection_name = collection_name or settings.NEWS_VECTOR_INDEX_MILVUS_COLLECTION
+        self.dim = dim or settings.NEWS_EMBEDDING_DIM
+        self.nprobe = nprobe or settings.NEWS_VECTOR_INDEX_NPROBE
+        connections.connect(alias=self.CONNECTION_ALIAS, host=settings.MILVUS_HOST, port=settings.MILVUS_PORT)
+        self.collection = self._open_collection()
+
+    def _open_collection(self):
+        from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, utility
+
+        if utility.has_collection(self.collection_name, using=self.CONNECTION_ALIAS):
+            collection = Collection(self.collection_name, using=self.CONNECTION_ALIAS)
+        else:
+            schema = CollectionSchema([
+                FieldSchema('id', DataType.INT64, is_primary=True, auto_id=False),
+                FieldSchema('embedding', DataType.FLOAT_VECTOR, dim=self.dim),
+            ], description='News article embeddings')
+            collection = Collection(self.collection_name, schema, using=self.CONNECTION_ALIAS)
+            collection.create_index('embedding', {
+                'index_type': 'IVF_FLAT', 'metric_type': 'IP', 'params': {'nlist': 1024},
+            })
+        collection.load()
+        return collection
+
+    def _matrix(self, ids: Sequence[int], vectors: Sequence[Any]) -> np.ndarray:
+        matrix = _normalise(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors, got {matrix.shape[1]}")
+        return matrix
+
+    def add(self, ids: Sequence[int], vectors: Sequence[Any]) -> None:
+        if not len(ids):
+            return
+        matrix = self._matrix(ids, vectors)
+        self.collection.upsert([[int(article_id) for article_id in ids], matrix.tolist()])
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = [int(article_id) for article_id in ids]
+        for start in range(0, len(ids), self.DELETE_CHUNK):
+            self.collection.delete(f"id in {ids[start:start + self.DELETE_CHUNK]}")
+
+    def rebuild(self, ids: Sequence[int], vectors: Sequence[Any]) -> None:
+        """Replace the whole collection with the given vectors"""
+        from pymilvus import utility
+
+        matrix = self._matrix(ids, vectors)
+        utility.drop_collection(self.collection_name, using=self.CONNECTION_ALIAS)
+        self.collection = self._open_collection()
+        for start in range(0, len(ids), 10000):
+            self.collection.insert([
+                [int(article_id) for article_id in ids[start:start + 10000]],
+                matrix[start:start + 10000].tolist(),
+            ])
+        self.collection.flush()
+
+    def search(self, vector: Any, k: int = 5) -> SearchResult:
+        query = _normalise(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        results = self.collection.search(
+            query.tolist(), 'embedding', {'metric_type': 'IP', 'params': {'nprobe': self.nprobe}}, limit=k
+        )
+        return [(int(hit.id), float(hit.distance)) for hit in results[0]]
+
+    def save(self) -> None:
+        self.collection.flush()
+
+class LocalVectorIndex(BaseVectorIndex):
+    """
+    In-process IVF index over a memory-mapped float32 matrix.
+
+    Vectors live in a compacted *base* segment on disk (memory-mapped
+    read-only, rows sorted by article ID) plus an append-only log of inserts
+    and deletes. Every process replays new log records before searching, so
+    web and worker processes sharing ``path`` see each other's writes without
+    a server. ``compact()`` folds the log into a new base generation and
+    (re)trains the inverted-file clustering once the base is large enough.
+
+    Vectors are L2-normalised, so scores are cosine similarities.
+    """
+
+    # Clustering only pays off once there are enough vectors per list
+    MIN_TRAIN_SIZE = 10000
+    KMEANS_ITERATIONS = 10
+    KMEANS_SAMPLE_PER_LIST = 64
+
+    def __init__(self, path: Optional[str] = None, dim: Optional[int] = None,
+                 nprobe: Optional[int] = None, compact_after: Optional[int] = None):
+        self.path = path or settings.NEWS_VECTOR_INDEX_PATH
+        self.nprobe = nprobe or settings.NEWS_VECTOR_INDEX_NPROBE
+        self.compact_after = compact_after or settings.NEWS_VECTOR_INDEX_COMPACT_AFTER
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._generation = None
+        self.dim = dim
+        self._reset_segments()
+        with self._file_lock():
+            meta = self._read_meta()
+            if meta is None:
+                if dim is None:
+                    raise ValueError('dim is required to create a new vector index')
+                self._write_meta({'dim': dim, 'generation': 0})
+        self._sync()
+
+    # Storage layout
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._file('meta.json')) as meta_file:
+                return json.load(meta_file)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, meta: dict) -> None:
+        tmp_path = self._file('meta.json.tmp')
+        with open(tmp_path, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(tmp_path, self._file('meta.json'))
+
+    @property
+    def _record_dtype(self) -> np.dtype:
+        # Packed log record: op (1 = add, 0 = delete), article id, vector
+        return np.dtype([('op', 'i1'), ('id', '<i8'), ('vector', '<f4', (self.dim,))])
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive cross-process lock for writers and compaction"""
+        with open(self._file('lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reset_segments(self) -> None:
+        self._base = np.zeros((0, self.dim or 0), dtype=np.float32)
+        self._base_ids = np.zeros(0, dtype=np.int64)
+        self._base_alive = np.zeros(0, dtype=bool)
+        self._centroids = None
+        self._list_order = None
+        self._list_offsets = None
+        self._delta_ids: List[int] = []
+        self._delta_blocks: List[np.ndarray] = []
+        self._delta_alive: List[bool] = []
+        self._delta_positions = {}
+        self._delta_matrix = None
+        self._log_offset = 0
+
+    # Synchronisation with other processes
+
+    def _sync(self) -> None:
+        """
+        Load a newer base generation and replay unseen log records.
+
+        Readers take no file lock, so compaction can remove a generation
+        while it is being read. Its files are only removed once meta.json
+        names the next one, so a base counts as loaded only if meta.json
+        still names its generation after the read; otherwise the read is
+        retried with the newer generation.
+        """
+        with self._lock:
+            meta = self._read_meta()
+            self.dim = meta['dim']
+            while meta['generation'] != self._generation:
+                generation = meta['generation']
+                try:
+                    base = self._read_base(generation)
+                except FileNotFoundError:
+                    base = None
+                meta = self._read_meta()
+                if meta['generation'] != generation:
+                    continue
+                if base is None:
+                    raise FileNotFoundError(f"Vector index generation {generation} is incomplete")
+                self._install_base(generation, base)
+            self._replay_log()
+
+    def _load_base(self, generation: int) -> None:
+        self._install_base(generation, self._read_base(generation))
+
+    def _read_base(self, generation: int) -> tuple:
+        """
+        ``(vectors, ids, lists)`` of a generation, None for files it does not
+        have. Raises FileNotFoundError if files vanish while being read.
+        """
+        prefix = self._file(f'base-{generation}')
+        if not os.path.exists(f'{prefix}-vectors.npy'):
+            return None, None, None
+        vectors = np.load(f'{prefix}-vectors.npy', mmap_mode='r')
+        ids = np.load(f'{prefix}-ids.npy')
+        lists = None
+        if os.path.exists(f'{prefix}-lists.npz'):
+            with np.load(f'{prefix}-lists.npz') as lists_file:
+                lists = (lists_file['centroids'], lists_file['order'], lists_file['offsets'])
+        return vectors, ids, lists
+
+    def _install_base(self, generation: int, base: tuple) -> None:
+        self._reset_segments()
+        self._generation = generation
+        vectors, ids, lists = base
+        if vectors is None:
+            return
+        self._base = vectors
+        self._base_ids = ids
+        self._base_alive = np.ones(len(ids), dtype=bool)
+        if lists is not None:
+            self._centroids, self._list_order, self._list_offsets = lists
+
+    def _replay_log(self) -> None:
+        log_path = self._file(f'log-{self._generation}.bin')
+        try:
+            size = os.path.getsize(log_path)
+        except FileNotFoundError:
+            return
+        record_size = self._record_dtype.itemsize
+        # Only whole records; a writer may be mid-append
+        end = size - (size - self._log_offset) % record_size
+        if end <= self._log_offset:
+            return
+
+        with open(log_path, 'rb') as log_file:
+            log_file.seek(self._log_offset)
+            records = np.frombuffer(log_file.read(end - self._log_offset), dtype=self._record_dtype)
+        self._apply(records)
+        self._log_offset = end
+
+    def _apply(self, records: np.ndarray) -> None:
+        """Apply log records; the last record for an ID decides its state"""
+        ids = records['id']
+        unique_ids, reversed_index = np.unique(ids[::-1], return_index=True)
+        last = np.sort(len(ids) - 1 - reversed_index)
+
+        # Every touched ID loses its previous vector
+        if len(self._base_ids):
+            positions = np.searchsorted(self._base_ids, unique_ids)
+            found = positions < len(self._base_ids)
+            found[found] = self._base_ids[positions[found]] == unique_ids[found]
+            self._base_alive[positions[found]] = False
+        for article_id in unique_ids.tolist():
+            delta_position = self._delta_positions.pop(article_id, None)
+            if delta_position is not None:
+                self._delta_alive[delta_position] = False
+
+        added = last[records['op'][last] == 1]
+        if not len(added):
+            return
+        for article_id in ids[added].tolist():
+            self._delta_positions[article_id] = len(self._delta_ids)
+            self._delta_ids.append(article_id)
+            self._delta_alive.append(True)
+        self._delta_blocks.append(np.array(records['vector'][added], dtype=np.float32))
+        self._delta_matrix = None
+
+    def _append(self, records: np.ndarray) -> None:
+        with self._file_lock():
+            # Compaction may have started a new generation since our last sync
+            self._sync()
+            with open(self._file(f'log-{self._generation}.bin'), 'ab') as log_file:
+                log_file.write(records.tobytes())
+            self._sync()
+            if self._log_offset // self._record_dtype.itemsize >= self.compact_after:
+                self._compact_locked()
+
+    # Public API
+
+    def add(self, ids: Sequence[int], vectors: Sequence[Any]) -> None:
+        if not len(ids):
+            return
+        matrix = _normalise(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors, got {matrix.shape[1]}")
+        records = np.zeros(len(ids), dtype=self._record_dtype)
+        records['op'] = 1
+        records['id'] = ids
+        records['vector'] = matrix
+        self._append(records)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        if not ids:
+            return
+        records = np.zeros(len(ids), dtype=self._record_dtype)
+        records['id'] = ids
+        self._append(records)
+
+    def rebuild(self, ids: Sequence[int], vectors: Sequence[Any]) -> None:
+        """Replace the whole index with the given vectors"""
+        matrix = _normalise(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        with self._file_lock():
+            self._sync()
+            self._write_generation(np.asarray(ids, dtype=np.int64), matrix)
+
+    def search(self, vector: Any, k: int = 5) -> SearchResult:
+        self._sync()
+        query = _normalise(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            candidate_ids, scores = self._search_base(query)
+            delta_ids, delta_scores = self._search_delta(query)
+
+        ids = np.concatenate([candidate_ids, delta_ids])
+        scores = np.concatenate([scores, delta_scores])
+        if not len(ids):
+            return []
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def _search_base(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self._base_ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        if self._centroids is None:
+            rows = np.flatnonzero(self._base_alive)
+            scores = self._base @ query
+            return self._base_ids[rows], scores[rows]
+
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.concatenate([
+            self._list_order[self._list_offsets[c]:self._list_offsets[c + 1]] for c in probes
+        ])
+        rows = rows[self._base_alive[rows]]
+        rows.sort()  # sequential reads from the memory map
+        return self._base_ids[rows], self._base[rows] @ query
+
+    def _search_delta(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not self._delta_positions:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if self._delta_matrix is None:
+            self._delta_matrix = np.vstack(self._delta_blocks)
+        alive = np.asarray(self._delta_alive)
+        ids = np.asarray(self._delta_ids, dtype=np.int64)[alive]
+        return ids, (self._delta_matrix @ query)[alive]
+
+    def save(self) -> None:
+        """Fold the log into a new base generation"""
+        self.compact()
+
+    def compact(self) -> None:
+        with self._file_lock():
+            self._sync()
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        with self._lock:
+            base_rows = np.flatnonzero(self._base_alive)
+            ids = [self._base_ids[base_rows]]
+            vectors = [np.asarray(self._base[base_rows], dtype=np.float32).reshape(-1, self.dim)]
+            if self._delta_ids:
+                delta_alive = np.asarray(self._delta_alive, dtype=bool)
+                ids.append(np.asarray(self._delta_ids, dtype=np.int64)[delta_alive])
+                vectors.append(np.vstack(self._delta_blocks)[delta_alive])
+            self._write_generation(np.concatenate(ids), np.vstack(vectors))
+
+    def _write_generation(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Write a new base segment sorted by ID and switch to it"""
+        with self._lock:
+            order = np.argsort(ids, kind='stable')
+            ids = ids[order]
+            vectors = np.ascontiguousarray(vectors[order], dtype=np.float32)
+
+            old_generation = self._generation
+            generation = old_generation + 1
+            prefix = self._file(f'base-{generation}')
+            np.save(f'{prefix}-vectors.npy', vectors)
+            np.save(f'{prefix}-ids.npy', ids)
+            if len(ids) >= self.MIN_TRAIN_SIZE:
+                centroids, list_order, offsets = self._train_lists(vectors)
+                np.savez(f'{prefix}-lists.npz', centroids=centroids, order=list_order, offsets=offsets)
+
+            self._write_meta({'dim': self.dim, 'generation': generation})
+            self._load_base(generation)
+            self._remove_generation(old_generation)
+            logger.info(f"Wrote vector index generation {generation} with {len(ids)} vectors")
+
+    def _remove_generation(self, generation: int) -> None:
+        # Other processes keep reading their open memory maps until they
+        # notice the new generation; unlinking does not invalidate them
+        for name in (f'base-{generation}-vectors.npy', f'base-{generation}-ids.npy',
+                     f'base-{generation}-lists.npz', f'log-{generation}.bin'):
+            try:
+                os.remove(self._file(name))
+            except FileNotFoundError:
+                pass
+
+    def _train_lists(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Spherical k-means over a sample, then assign every vector to a list"""
+        nlist = max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(0)
+        sample_size = min(len(vectors), nlist * self.KMEANS_SAMPLE_PER_LIST)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(self.KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~np.any(sums, axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalise(sums)
+
+        assignment = np.concatenate([
+            np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), 65536)
+        ])
+        list_order = np.argsort(assignment, kind='stable')
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=nlist), out=offsets[1:])
+        return centroids.astype(np.float32), list_order, offsets
+
+    def __len__(self) -> int:
+        self._sync()
+        with self._lock:
+            return int(self._base_alive.sum()) + len(self._delta_positions)
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+VECTOR_INDEX_BACKENDS = {
+    'milvus': MilvusVectorIndex,
+    'local': LocalVectorIndex,
+}
+
+def load_vector_index() -> BaseVectorIndex:
+    """Build the backend named by NEWS_VECTOR_INDEX_BACKEND (a key or dotted path)"""
+    backend = settings.NEWS_VECTOR_INDEX_BACKEND
+    backend_class = VECTOR_INDEX_BACKENDS.get(backend) or import_string(backend)
+    if backend_class is LocalVectorIndex:
+        return LocalVectorIndex(dim=settings.NEWS_EMBEDDING_DIM)
+    return backend_class()
+
+def get_vector_index() -> BaseVectorIndex:
+    """Shared vector index for the current process"""
+    from .model_registry import registry
+    return registry.get('vector_index')
@@ -2,47 +2,58 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.core.cache import cache
 from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time
 from .models import NewsSource, NewsArticle, StockMention, NewsCategory, ArticleCategory
 from .serializers import (
-    NewsSourceSerializer, NewsArticleSerializer, NewsArticleCreateSerializer,
+    NewsSourceConfigSerializer, NewsArticleSerializer, NewsArticleListSerializer, NewsArticleCreateSerializer,
     NewsArticleUpdateSerializer, StockMentionSerializer, StockMentionCreateSerializer,
     NewsCategorySerializer, ArticleCategorySerializer, ArticleCategoryCreateSerializer
 )
+from .search import SEARCH_RANK, ArticleSearchFilter, update_search_index
 from .services import NewsProcessingService
 from apps.api.throttling import NewsIngestionThrottle, ArticleProcessingThrottle
-from apps.api.decorators import cache_response, invalidate_cache
+from apps.api.decorators import CACHE_SCOPE_PUBLIC, cache_response, conditional_response, invalidate_cache
+from apps.api.mixins import OptimizedQuerysetMixin
+from apps.api.pagination import KeysetPagination
+from apps.api.querysets import optimize_queryset
 
 class NewsSourceViewSet(viewsets.ModelViewSet):
     """ViewSet for managing news sources"""
     queryset = NewsSource.objects.all()
-    serializer_class = NewsSourceSerializer
+    serializer_class = NewsSourceConfigSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['active']
     search_fields = ['name', 'description']
     throttle_classes = [NewsIngestionThrottle]
+    cache_scope = CACHE_SCOPE_PUBLIC
 
+    @conditional_response()
     @cache_response(timeout=settings.CACHE_TIMEOUT_LONG)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional_response()
     @cache_response(timeout=settings.CACHE_TIMEOUT_LONG)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/sources/*')
+    @invalidate_cache('news/sources', 'news/articles')
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/sources/*')
+    @invalidate_cache('news/sources', 'news/articles')
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/sources/*')
+    @invalidate_cache('news/sources', 'news/articles')
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
@@ -64,22 +75,28 @@ class NewsSourceViewSet(viewsets.ModelViewSet):
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class NewsArticleViewSet(viewsets.ModelViewSet):
+class NewsArticleViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing news articles"""
     queryset = NewsArticle.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ArticleSearchFilter, filters.OrderingFilter]
     filterset_fields = ['source', 'is_processed']
+    # Used when the search backend does not index articles (icontains)
     search_fields = ['title', 'content', 'author']
     ordering_fields = ['published_at', 'created_at', 'sentiment_score']
     ordering = ['-published_at']
+    pagination_class = KeysetPagination
+    relevance_annotation = SEARCH_RANK
     throttle_classes = [ArticleProcessingThrottle]
+    cache_scope = CACHE_SCOPE_PUBLIC
 
     def get_serializer_class(self):
         if self.action == 'create':
             return NewsArticleCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return NewsArticleUpdateSerializer
+        elif self.action == 'list':
+            return NewsArticleListSerializer
         return NewsArticleSerializer
 
     def get_queryset(self):
@@ -88,12 +105,12 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
         # Filter by stock symbol
         symbol = self.request.query_params.get('symbol', None)
         if symbol:
-            queryset = queryset.filter(stock_mentions__symbol=symbol)
+            queryset = queryset.mentioning(symbol)
         
         # Filter by category
         category = self.request.query_params.get('category', None)
         if category:
-            queryset = queryset.filter(categories__category__name=category)
+            queryset = queryset.in_category(category)
         
         # Filter by sentiment range
         min_sentiment = self.request.query_params.get('min_sentiment', None)
@@ -103,28 +120,38 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
         if max_sentiment is not None:
             queryset = queryset.filter(sentiment_score__lte=float(max_sentiment))
         
-        return queryset.distinct()
+        return queryset
 
+    @conditional_response()
     @cache_response(timeout=settings.CACHE_TIMEOUT)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional_response()
     @cache_response(timeout=settings.CACHE_TIMEOUT)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/articles/*')
+    @invalidate_cache('news/articles')
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/articles/*')
+    @invalidate_cache('news/articles')
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/articles/*')
+    @invalidate_cache('news/articles')
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        update_search_index([serializer.instance.pk])
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        update_search_index([serializer.instance.pk])
+
     @action(detail=True, methods=['post'])
     def process_article(self, request, pk=None):
         """Trigger article processing"""
@@ -146,32 +173,90 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     @cache_response(timeout=settings.CACHE_TIMEOUT)
     def similar_articles(self, request):
-        """Find similar articles using semantic search"""
+        """
+        Find similar articles using semantic search.
+
+        Query parameters: ``article_id`` (required), ``k`` (page size, default
+        5), ``offset``, and the optional filters ``symbol``, ``category``,
+        ``source`` (comma-separated, any of) and ``published_after``/
+        ``published_before`` (ISO dates). Results carry a ``similarity_score``.
+        """
         article_id = request.query_params.get('article_id', None)
         if not article_id:
             return Response({
                 'status': 'error',
                 'message': 'article_id parameter is required'
             }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            k, offset, filters = self._similarity_params(request)
+        except ValueError as e:
+            return Response({
+                'status': 'error',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            article = NewsArticle.objects.get(id=article_id)
-            if not article.embedding_vector:
+            article = NewsArticle.objects.with_embeddings().get(id=article_id)
+            if article.embedding_vector is None:
                 return Response({
                     'status': 'error',
                     'message': 'Article has not been processed yet'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Use Milvus for similarity search
-            from .ml_utils import MLUtils
-            ml_utils = MLUtils()
-            similar_articles = ml_utils.vector_store.similarity_search(
-                article.embedding_vector,
-                k=5
-            )
-            
+            corpus = None
+            if settings.NEWS_SIMILARITY_EXACT:
+                from .similarity import get_similarity_engine
+                corpus = get_similarity_engine().corpus
+
+            if corpus is not None:
+                # Exact search with the filters applied before scoring
+                mask = corpus.mask(exclude_ids=[article.id], **filters)
+                results, total = corpus.search(article.embedding_vector, k=k, offset=offset, mask=mask)
+            else:
+                # Approximate search on the configured vector index (Milvus or
+                # local); filters are applied to an over-fetched candidate list
+                from .vector_index import get_vector_index
+                filtered = any(filters.values())
+                fetch = (offset + k + 1) * (settings.NEWS_SIMILARITY_FILTER_OVERFETCH if filtered else 1)
+                candidates = get_vector_index().search(article.embedding_vector, k=fetch)
+                results = [result for result in candidates if result[0] != article.id]
+                if filtered:
+                    allowed = self._filter_similar(
+                        [similar_id for similar_id, _ in results], filters
+                    )
+                    results = [result for result in results if result[0] in allowed]
+                    # Past the candidates the index returned, more matches may exist
+                    total = len(results) if len(candidates) < fetch else None
+                else:
+                    total = len(results) if len(results) <= offset + k else None
+                results = results[offset:offset + k]
+
+            articles_by_id = optimize_queryset(
+                NewsArticle.objects.all(), self.get_serializer_class()
+            ).in_bulk([similar_id for similar_id, _ in results])
+            similar_articles = []
+            scores = []
+            for similar_id, score in results:
+                if similar_id in articles_by_id:
+                    similar_articles.append(articles_by_id[similar_id])
+                    scores.append(score)
+
             serializer = self.get_serializer(similar_articles, many=True)
-            return Response(serializer.data)
+            data = serializer.data
+            for item, score in zip(data, scores):
+                item['similarity_score'] = score
+
+            has_next = total is None or offset + k < total
+            return Response({
+                'count': total,
+                'next': replace_query_param(request.build_absolute_uri(), 'offset', offset + k) if has_next else None,
+                'previous': (
+                    replace_query_param(request.build_absolute_uri(), 'offset', max(offset - k, 0))
+                    if offset else None
+                ),
+                'results': data,
+            })
             
         except NewsArticle.DoesNotExist:
             return Response({
@@ -184,15 +269,79 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _filter_similar(self, article_ids, filters):
+        """The IDs in ``article_ids`` that pass the similar_articles filters"""
+        queryset = NewsArticle.objects.filter(id__in=article_ids)
+        if filters['symbols']:
+            queryset = queryset.filter(Exists(
+                StockMention.objects.filter(article=OuterRef('pk'), symbol__in=filters['symbols'])
+            ))
+        if filters['categories']:
+            queryset = queryset.filter(Exists(
+                ArticleCategory.objects.filter(article=OuterRef('pk'), category__name__in=filters['categories'])
+            ))
+        if filters['sources']:
+            queryset = queryset.filter(source_id__in=filters['sources'])
+        if filters['published_after'] is not None:
+            queryset = queryset.filter(published_at__gte=filters['published_after'])
+        if filters['published_before'] is not None:
+            queryset = queryset.filter(published_at__lte=filters['published_before'])
+        return set(queryset.values_list('id', flat=True))
+
+    def _similarity_params(self, request):
+        """Page size, offset and filters for similar_articles; raises ValueError"""
+        params = request.query_params
+        try:
+            k = int(params.get('k', 5))
+            offset = int(params.get('offset', 0))
+        except ValueError:
+            raise ValueError('k and offset must be integers')
+        if not 1 <= k <= settings.NEWS_SIMILARITY_MAX_K:
+            raise ValueError(f"k must be between 1 and {settings.NEWS_SIMILARITY_MAX_K}")
+        if offset < 0:
+            raise ValueError('offset must not be negative')
+
+        def split(name):
+            return [value.strip() for value in params.get(name, '').split(',') if value.strip()]
+
+        try:
+            sources = [int(source) for source in split('source')]
+        except ValueError:
+            raise ValueError('source must be a comma-separated list of source IDs')
+
+        filters = {
+            'symbols': [symbol.upper() for symbol in split('symbol')],
+            'categories': split('category'),
+            'sources': sources,
+            'published_after': None,
+            'published_before': None,
+        }
+        for name in ('published_after', 'published_before'):
+            value = params.get(name)
+            if not value:
+                continue
+            parsed = parse_datetime(value)
+            if parsed is None:
+                day = parse_date(value)
+                if day is None:
+                    raise ValueError(f"{name} must be an ISO date or datetime")
+                parsed = datetime.combine(day, time.max if name == 'published_before' else time.min)
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            filters[name] = parsed
+        return k, offset, filters
+
 class StockMentionViewSet(viewsets.ModelViewSet):
     """ViewSet for managing stock mentions"""
     queryset = StockMention.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['article']
+    filterset_fields = ['article', 'symbol']
     search_fields = ['symbol']
     ordering_fields = ['created_at', 'sentiment_score']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
+    cache_scope = CACHE_SCOPE_PUBLIC
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -220,15 +369,15 @@ class StockMentionViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/stock-mentions/*')
+    @invalidate_cache('news/stock-mentions', 'news/articles')
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/stock-mentions/*')
+    @invalidate_cache('news/stock-mentions', 'news/articles')
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/stock-mentions/*')
+    @invalidate_cache('news/stock-mentions', 'news/articles')
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
@@ -239,28 +388,31 @@ class NewsCategoryViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     search_fields = ['name', 'description']
+    cache_scope = CACHE_SCOPE_PUBLIC
 
+    @conditional_response()
     @cache_response(timeout=settings.CACHE_TIMEOUT_LONG)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional_response()
     @cache_response(timeout=settings.CACHE_TIMEOUT_LONG)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/categories/*')
+    @invalidate_cache('news/categories', 'news/article-categories', 'news/articles')
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/categories/*')
+    @invalidate_cache('news/categories', 'news/article-categories', 'news/articles')
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/categories/*')
+    @invalidate_cache('news/categories', 'news/article-categories', 'news/articles')
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
-class ArticleCategoryViewSet(viewsets.ModelViewSet):
+class ArticleCategoryViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing article-category relationships"""
     queryset = ArticleCategory.objects.all()
     permission_classes = [IsAuthenticated]
@@ -268,6 +420,7 @@ class ArticleCategoryViewSet(viewsets.ModelViewSet):
     filterset_fields = ['article', 'category']
     ordering_fields = ['confidence_score', 'created_at']
     ordering = ['-confidence_score']
+    cache_scope = CACHE_SCOPE_PUBLIC
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -282,14 +435,14 @@ class ArticleCategoryViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/article-categories/*')
+    @invalidate_cache('news/article-categories', 'news/articles')
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/article-categories/*')
+    @invalidate_cache('news/article-categories', 'news/articles')
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @invalidate_cache('GET:news/article-categories/*')
+    @invalidate_cache('news/article-categories', 'news/articles')
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs) 
\ No newline at end of file
@@ -1,10 +1,14 @@
+import logging
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+logger = logging.getLogger(__name__)
+
 # Create the Celery app
 app = Celery('stocknews')
 
@@ -31,6 +35,21 @@ app.conf.beat_schedule = {
     },
 }
 
+@worker_process_init.connect
+def warm_ml_models(**kwargs):
+    """Load the NEWS_ML_WARM_MODELS once in each worker process before it takes tasks"""
+    from django.conf import settings
+    if not settings.NEWS_ML_WARM_ON_WORKER_START:
+        return
+
+    from apps.news.model_registry import registry
+    for name in settings.NEWS_ML_WARM_MODELS:
+        # A model that fails here is retried on first use; the worker still starts
+        try:
+            registry.warm([name])
+        except Exception as e:
+            logger.error(f"Error warming model {name!r} at worker start: {str(e)}")
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}') 
\ No newline at end of file
@@ -142,6 +142,10 @@ REST_FRAMEWORK = {
     }
 }
 
+# Totals on cursor-paginated lists (?count=true) are planner estimates at or
+# above this many rows; below it they are counted exactly
+API_EXACT_COUNT_THRESHOLD = env.int('API_EXACT_COUNT_THRESHOLD', default=10000)
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -170,6 +174,77 @@ CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[
 MILVUS_HOST = env('MILVUS_HOST', default='localhost')
 MILVUS_PORT = env.int('MILVUS_PORT', default=19530)
 
+# ML model settings
+# Use deterministic offline stand-ins instead of real model weights (tests, CI)
+NEWS_ML_STUB_MODELS = env.bool('NEWS_ML_STUB_MODELS', default=False)
+NEWS_ML_WARM_ON_WORKER_START = env.bool('NEWS_ML_WARM_ON_WORKER_START', default=True)
+# Registry entries loaded at worker start; the rest load on first use
+NEWS_ML_WARM_MODELS = env.list('NEWS_ML_WARM_MODELS', default=['ml_utils'])
+# Texts per model call; texts are length-sorted so batches pad little
+NEWS_ML_BATCH_SIZE = env.int('NEWS_ML_BATCH_SIZE', default=16)
+
+# Vector index settings
+# 'milvus', 'local' (in-process IVF index on disk) or a dotted path to a backend class
+NEWS_VECTOR_INDEX_BACKEND = env('NEWS_VECTOR_INDEX_BACKEND', default='milvus')
+NEWS_VECTOR_INDEX_PATH = env('NEWS_VECTOR_INDEX_PATH', default=os.path.join(BASE_DIR, 'var', 'vector_index'))
+NEWS_VECTOR_INDEX_NPROBE = env.int('NEWS_VECTOR_INDEX_NPROBE', default=16)
+# Collection the 'milvus' backend keeps article embeddings in
+NEWS_VECTOR_INDEX_MILVUS_COLLECTION = env('NEWS_VECTOR_INDEX_MILVUS_COLLECTION', default='news_article_embeddings')
+# Fold the insert/delete log into the base segment after this many records
+NEWS_VECTOR_INDEX_COMPACT_AFTER = env.int('NEWS_VECTOR_INDEX_COMPACT_AFTER', default=50000)
+NEWS_EMBEDDING_DIM = env.int('NEWS_EMBEDDING_DIM', default=384)
+# Answer similar_articles with exact in-process search instead of the vector
+# index. Every process then holds all embeddings, mentions and category
+# links in memory, so it is meant for small and medium corpora: above
+# NEWS_SIMILARITY_EXACT_MAX_ARTICLES embedded articles the vector index is
+# used anyway, with filters applied to an over-fetched candidate list
+NEWS_SIMILARITY_EXACT = env.bool('NEWS_SIMILARITY_EXACT', default=False)
+NEWS_SIMILARITY_EXACT_MAX_ARTICLES = env.int('NEWS_SIMILARITY_EXACT_MAX_ARTICLES', default=200000)
+NEWS_SIMILARITY_FILTER_OVERFETCH = env.int('NEWS_SIMILARITY_FILTER_OVERFETCH', default=10)
+NEWS_SIMILARITY_REFRESH_SECONDS = env.float('NEWS_SIMILARITY_REFRESH_SECONDS', default=60.0)
+NEWS_SIMILARITY_MAX_K = env.int('NEWS_SIMILARITY_MAX_K', default=100)
+
+# Search settings
+# 'auto' (full-text on PostgreSQL, icontains elsewhere), 'postgres', 'icontains'
+# or a dotted path to a backend class
+NEWS_SEARCH_BACKEND = env('NEWS_SEARCH_BACKEND', default='auto')
+# PostgreSQL text search configuration used for stemming and stop words
+NEWS_SEARCH_CONFIG = env('NEWS_SEARCH_CONFIG', default='english')
+
+# Ticker extraction settings
+# Symbols mentioned without a $ or exchange prefix must be listed here; blank
+# finds only those marked mentions
+NEWS_TICKER_UNIVERSE_PATH = env(
+    'NEWS_TICKER_UNIVERSE_PATH', default=os.path.join(BASE_DIR, 'apps', 'news', 'data', 'tickers.txt')
+)
+# Characters kept either side of a mention in StockMention.context
+NEWS_MENTION_CONTEXT_CHARS = env.int('NEWS_MENTION_CONTEXT_CHARS', default=200)
+
+# Article extraction settings
+# 'lxml' (boilerplate removal, per-source selectors), 'soup' (BeautifulSoup
+# html.parser, every <p> on the page) or a dotted path to a backend class
+NEWS_EXTRACTION_BACKEND = env('NEWS_EXTRACTION_BACKEND', default='lxml')
+
+# News ingestion settings
+NEWS_FETCH_TIMEOUT = env.int('NEWS_FETCH_TIMEOUT', default=10)
+NEWS_FETCH_MAX_CONCURRENCY = env.int('NEWS_FETCH_MAX_CONCURRENCY', default=32)
+NEWS_FETCH_PER_HOST_CONCURRENCY = env.int('NEWS_FETCH_PER_HOST_CONCURRENCY', default=4)
+NEWS_INGEST_BATCH_SIZE = env.int('NEWS_INGEST_BATCH_SIZE', default=100)
+# Feed discovery: newest entries taken per run, child sitemaps followed from
+# a sitemap index, and URLs per known-article lookup query
+NEWS_DISCOVERY_MAX_URLS = env.int('NEWS_DISCOVERY_MAX_URLS', default=200)
+NEWS_DISCOVERY_MAX_SITEMAPS = env.int('NEWS_DISCOVERY_MAX_SITEMAPS', default=3)
+NEWS_DISCOVERY_LOOKUP_CHUNK = env.int('NEWS_DISCOVERY_LOOKUP_CHUNK', default=500)
+# Runs an article URL that fails to fetch or save is retried in before it
+# is given up and stops holding back the feed's validators
+NEWS_DISCOVERY_MAX_RETRIES = env.int('NEWS_DISCOVERY_MAX_RETRIES', default=3)
+# Articles per processing task, and how long a partial chunk may wait
+NEWS_DISPATCH_BATCH_SIZE = env.int('NEWS_DISPATCH_BATCH_SIZE', default=32)
+NEWS_DISPATCH_MAX_WAIT = env.float('NEWS_DISPATCH_MAX_WAIT', default=5.0)
+NEWS_PROCESS_RETRY_DELAY = env.int('NEWS_PROCESS_RETRY_DELAY', default=60)
+# Ingest each source in its own Celery sub-task instead of one long task
+NEWS_INGEST_FAN_OUT = env.bool('NEWS_INGEST_FAN_OUT', default=True)
+
 # Redis settings
 REDIS_URL = env('REDIS_URL', default='redis://localhost:6379/0')
 
@@ -224,4 +299,17 @@ CACHE_KEY_PREFIX = 'stocknews'
 # Cache timeouts (in seconds)
 CACHE_TIMEOUT = 300  # 5 minutes
 CACHE_TIMEOUT_LONG = 3600  # 1 hour
-CACHE_TIMEOUT_VERY_LONG = 86400  # 24 hours 
\ No newline at end of file
+CACHE_TIMEOUT_VERY_LONG = 86400  # 24 hours
+
+# Per-process LRU of rendered responses in front of Redis (0 disables it)
+CACHE_LOCAL_MAX_BYTES = env.int('CACHE_LOCAL_MAX_BYTES', default=32 * 1024 * 1024)
+# How long a process trusts the namespace versions it has seen before
+# asking Redis again; bounds how stale another process's writes can look
+CACHE_VERSION_CHECK_INTERVAL = env.float('CACHE_VERSION_CHECK_INTERVAL', default=1.0)
+# Stampede protection: the last part of an entry's lifetime in which one
+# request refreshes it early, how long stale copies stay servable, and the
+# single-flight lock's lifetime and waiting time
+CACHE_REFRESH_AHEAD_RATIO = env.float('CACHE_REFRESH_AHEAD_RATIO', default=0.1)
+CACHE_STALE_TTL = env.int('CACHE_STALE_TTL', default=60)
+CACHE_LOCK_TIMEOUT = env.int('CACHE_LOCK_TIMEOUT', default=30)
+CACHE_LOCK_WAIT = env.float('CACHE_LOCK_WAIT', default=2.0) 
\ No newline at end of file
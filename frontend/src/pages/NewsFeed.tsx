@@ -49,7 +49,7 @@ const NewsFeed: React.FC = () => {
   const filteredArticles = articles
     .filter((article) => {
       const matchesSearch = article.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        article.content.toLowerCase().includes(searchTerm.toLowerCase());
+        (article.summary ?? '').toLowerCase().includes(searchTerm.toLowerCase());
       const matchesCategory = !selectedCategory ||
         article.categories.some(cat => cat.category.id === selectedCategory);
       return matchesSearch && matchesCategory;
@@ -3,7 +3,9 @@ import api from './config';
 export interface NewsArticle {
   id: number;
   title: string;
-  content: string;
+  // Only present on list responses when requested with expand=content
+  content?: string;
+  summary?: string;
   url: string;
   source: string;
   published_at: string;
@@ -45,7 +47,10 @@ export interface NewsResponse {
 
 const newsService = {
   getArticles: async (filters: NewsFilters = {}): Promise<NewsResponse> => {
-    const response = await api.get<NewsResponse>('/news/articles', { params: filters });
+    // The list endpoint is compact by default; ask for the relations the feed shows
+    const response = await api.get<NewsResponse>('/news/articles', {
+      params: { expand: 'stock_mentions,categories', ...filters },
+    });
     return response.data;
   },
 